@@ -0,0 +1,137 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Microbenchmark of the JSON codecs: CPU time spent decoding typical API
+payloads with ``requests.Response.json()``, as the client used to, and from
+bytes with each installed codec of :py:mod:`ovh.codec`. Request bodies
+encoding is compared with ``json.dumps``, whose output the signature depends on.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_codec.py [--calls 2000]
+"""
+
+import argparse
+import json
+import time
+
+import requests
+
+from ovh.codec import _CODECS, _installed
+
+PAYLOADS = {
+    "object (/me)": {
+        "nichandle": "xx1234-ovh",
+        "email": "john.doe@example.com",
+        "firstname": "John",
+        "name": "Doe",
+        "country": "FR",
+        "currency": {"code": "EUR", "symbol": "EURO"},
+        "customerCode": "1234-5678-90",
+        "state": "complete",
+        "kycValidated": True,
+    },
+    "10k IDs": list(range(10**8, 10**8 + 10000)),
+    "1k records": [
+        {
+            "id": 5000000 + i,
+            "zone": "example.com",
+            "fieldType": "A",
+            "subDomain": "host-%d" % i,
+            "target": "10.0.%d.%d" % (i // 256, i % 256),
+            "ttl": 3600,
+        }
+        for i in range(1000)
+    ],
+    "500 bills": [
+        {
+            "billId": "FR%08d" % i,
+            "date": "2024-01-%02dT00:00:00+01:00" % (i % 28 + 1),
+            "priceWithTax": {"currencyCode": "EUR", "text": "%d.99 €" % i, "value": i + 0.99},
+            "url": "https://www.ovh.com/cgi-bin/order/facture.pdf?reference=FR%08d" % i,
+        }
+        for i in range(500)
+    ],
+}
+
+REQUEST_BODY = {"description": "ovh-é", "rules": [{"method": "GET", "path": "/me/*"}] * 10, "ttl": 3600.5}
+
+
+def cpu_per_call(function, calls):
+    """CPU time per call of ``function``, in microseconds, best of 3 runs"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.process_time()
+        for _ in range(calls):
+            function()
+        best = min(best, time.process_time() - start)
+    return best / calls * 1e6
+
+
+def requests_json(raw, content_type):
+    response = requests.Response()
+    response._content = raw
+    response.headers["Content-Type"] = content_type
+    return response.json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="number of calls per run")
+    args = parser.parse_args()
+
+    codecs = [codec_class() for codec_class in _CODECS if _installed(codec_class)]
+    columns = ["Response.json()", "(charset)"] + [codec.name for codec in codecs]
+
+    print("decoding, CPU time per call (us)")
+    print("%-14s %9s" % ("payload", "size") + "".join(" %15s" % column for column in columns))
+    for name, payload in PAYLOADS.items():
+        raw = json.dumps(payload).encode("utf-8")
+        functions = [
+            requests_json(raw, "application/json"),
+            requests_json(raw, "application/json; charset=utf-8"),
+        ]
+        for codec in codecs:
+            assert codec.loads(raw) == payload
+            functions.append(lambda codec=codec: codec.loads(raw))
+        print(
+            "%-14s %9d" % (name, len(raw))
+            + "".join(" %15.1f" % cpu_per_call(function, max(args.calls // 10, 10)) for function in functions)
+        )
+
+    print()
+    print("encoding, CPU time per call (us)")
+    reference = json.dumps(REQUEST_BODY, separators=(",", ":"))
+    dumps_cpu = cpu_per_call(lambda: json.dumps(REQUEST_BODY, separators=(",", ":")), args.calls)
+    print("%-14s %9.2f" % ("json.dumps", dumps_cpu))
+    for codec in codecs:
+        assert codec.dumps(REQUEST_BODY) == reference
+        print("%-14s %9.2f" % (codec.name, cpu_per_call(lambda: codec.dumps(REQUEST_BODY), args.calls)))
+
+
+if __name__ == "__main__":
+    main()
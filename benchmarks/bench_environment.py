@@ -0,0 +1,138 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of the environment lookups: CPU time spent by the calling thread
+per call, and files opened per call, when ``requests`` reads the proxies, the
+CA bundle and ``.netrc`` on every call, and when the client reads them once.
+
+The calls go to a local keep-alive HTTP server, with proxy variables set and
+a ``.netrc`` file, as on a typical workstation.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_environment.py [--calls 5000]
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import ovh
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send the headers and the body at once, flushed after each request
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'{"nichandle":"xx1234-ovh","state":"complete"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OpenCounter:
+    """Number of files opened by the calling thread, through an audit hook"""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.count = 0
+        sys.addaudithook(self.hook)
+
+    def hook(self, event, args):
+        if event == "open" and threading.get_ident() == self.thread:
+            self.count += 1
+
+
+def measure(function, calls, counter):
+    """
+    CPU time of the calling thread per call of ``function``, in
+    microseconds, best of 3 runs, and files opened per call
+    """
+    best = float("inf")
+    opened = counter.count
+    for _ in range(3):
+        start = time.thread_time()
+        for _ in range(calls):
+            function()
+        best = min(best, time.thread_time() - start)
+    return best / calls * 1e6, (counter.count - opened) / (3 * calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000, help="number of calls per run")
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    netrc = os.path.join(directory.name, ".netrc")
+    with open(netrc, "w") as f:
+        f.write("machine github.com login user password token\n")
+    os.environ.update(
+        {
+            "NETRC": netrc,
+            "HTTP_PROXY": "http://proxy.example.com:3128",
+            "HTTPS_PROXY": "http://proxy.example.com:3128",
+            "NO_PROXY": "localhost,127.0.0.1,.internal.example.com",
+        }
+    )
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    counter = OpenCounter()
+
+    print("%-20s %14s %14s" % ("trust_env", "CPU/call (us)", "opens/call"))
+    try:
+        for trust_env in (True, "once"):
+            client = ovh.Client(
+                "http://%s:%d/1.0" % server.server_address,
+                application_key="TDPKJdwZwAQPwKX2",
+                application_secret="9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk",
+                consumer_key="5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY",
+                trust_env=trust_env,
+            )
+            client._time_delta = 0
+            cpu, opens = measure(lambda: client.get("/me"), args.calls, counter)
+            print("%-20s %14.1f %14.2f" % (trust_env, cpu, opens))
+    finally:
+        server.shutdown()
+        server.server_close()
+        directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
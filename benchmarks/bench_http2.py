@@ -0,0 +1,130 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of the HTTP/2 transport: many threads sharing one fresh client send
+signed calls to a local stand-in of the API (see ``h2_server.py``), either
+over HTTP/1.1 connection pools, or multiplexed over HTTP/2 connections with
+:py:class:`ovh.http2.HTTP2Adapter`. Reports the latency of the calls, the
+throughput and the number of connections opened.
+
+HTTP/2 framing is pure Python on both ends: on a single core, where the server
+competes with the client for the CPU, the throughput mostly measures CPU time.
+
+Usage, with the ``ovh[http2]`` package installed and ``openssl`` available::
+
+    python benchmarks/bench_http2.py [--threads 200] [--calls 10] [--latency 0.02]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+import ovh
+from ovh.http2 import HTTP2Adapter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from h2_server import H2Server  # noqa: E402
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run(server, client, threads, calls):
+    """Latencies of ``threads * calls`` calls, in seconds, and total duration"""
+
+    def worker(i):
+        latencies = []
+        for j in range(calls):
+            start = time.perf_counter()
+            client.get("/dedicated/server/ns%d.ip-1-2-3.eu/task/%d" % (i, j))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    server.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = [latency for result in executor.map(worker, range(threads)) for latency in result]
+    return latencies, time.perf_counter() - start
+
+
+def make_client(server, **kwargs):
+    client = ovh.Client(
+        server.url + "/1.0",
+        application_key="TDPKJdwZwAQPwKX2",
+        application_secret="9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk",
+        consumer_key="5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY",
+        **kwargs,
+    )
+    client._time_delta = 0
+    # the CA bundle of the environment would take precedence
+    client._session.trust_env = False
+    client._session.verify = server.cafile
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=200, help="number of concurrent threads")
+    parser.add_argument("--calls", type=int, default=10, help="number of calls per thread")
+    parser.add_argument("--latency", type=float, default=0.02, help="latency of the server, in seconds")
+    parser.add_argument("--connect-latency", type=float, default=0.06, help="cost of a new connection, in seconds")
+    parser.add_argument("--max-streams", type=int, default=100, help="concurrent streams per HTTP/2 connection")
+    args = parser.parse_args()
+
+    with H2Server(latency=args.latency, connect_latency=args.connect_latency) as server:
+        transports = [
+            ("HTTP/1.1, default pool", make_client(server)),
+            ("HTTP/1.1, pool of %d" % args.threads, make_client(server, pool_maxsize=args.threads)),
+            ("HTTP/2", make_client(server, adapter=HTTP2Adapter(max_streams=args.max_streams, verify=server.cafile))),
+        ]
+
+        print(
+            "%d threads x %d calls, server latency %.0f ms, connection cost %.0f ms"
+            % (args.threads, args.calls, args.latency * 1000, args.connect_latency * 1000)
+        )
+        print("%-24s %9s %9s %9s %12s" % ("transport", "p50 (ms)", "p99 (ms)", "calls/s", "connections"))
+        for name, client in transports:
+            latencies, duration = run(server, client, args.threads, args.calls)
+            print(
+                "%-24s %9.1f %9.1f %9.0f %12d"
+                % (
+                    name,
+                    percentile(latencies, 0.5) * 1000,
+                    percentile(latencies, 0.99) * 1000,
+                    len(latencies) / duration,
+                    server.connections,
+                )
+            )
+            client._session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+End-to-end load benchmark of :py:class:`ovh.Client` against the local API
+stand-in of :py:mod:`ovh.testing`, run in a separate process. It reports the
+throughput, the p50 and p99 latencies and the CPU time of the client per
+call, at several levels of load:
+
+- closed loop: a number of threads, each sending its next call as soon as
+  the previous one is answered
+- open loop: calls arriving at a fixed mean rate, following a Poisson
+  process, whatever the response times. Latencies are measured from the
+  arrival of each call, so that the time spent waiting for a free worker
+  counts.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_load.py [--concurrency 1,8,32] [--rates 100,400] [--duration 5]
+        [--latency 20] [--distribution exponential] [--error 503:0.01] [--transport urllib3]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import ovh
+from ovh.exceptions import APIError, HTTPError
+from ovh.testing import APPLICATION_KEY, APPLICATION_SECRET, CONSUMER_KEY
+
+
+class Recorder:
+    """Latencies and failures of the calls, from many threads"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def call(self, client, route, start):
+        try:
+            client.get(route)
+            failed = False
+        except (APIError, HTTPError):
+            failed = True
+        latency = time.perf_counter() - start
+        with self._lock:
+            self.latencies.append(latency)
+            self.errors += failed
+
+
+def start_server(args):
+    """Start the API stand-in in a subprocess, and return it with its URL"""
+    command = [sys.executable, "-m", "ovh.testing", "--port", "0", "--latency", str(args.latency)]
+    command += ["--distribution", args.distribution, "--seed", "42"]
+    for error in args.error:
+        command += ["--error", error]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if not line.startswith("Serving on "):
+        server.kill()
+        raise RuntimeError("The API stand-in did not start")
+    return server, line.split()[-1]
+
+
+def make_client(url, args, pool_maxsize):
+    client = ovh.Client(
+        url + "/1.0",
+        APPLICATION_KEY,
+        APPLICATION_SECRET,
+        CONSUMER_KEY,
+        transport=args.transport,
+        pool_maxsize=pool_maxsize,
+    )
+    client.get(args.route)
+    return client
+
+
+def closed_loop(client, route, threads, duration):
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            recorder.call(client, route, time.perf_counter())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return recorder
+
+
+def open_loop(client, route, rate, duration, max_workers):
+    recorder = Recorder()
+    arrivals = random.Random(42)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        start = next_arrival = time.perf_counter()
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(recorder.call, client, route, next_arrival)
+            next_arrival += arrivals.expovariate(rate)
+    return recorder
+
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+def report(label, recorder, wall, cpu):
+    latencies = sorted(recorder.latencies)
+    calls = len(latencies)
+    print(
+        "%-18s %8d %7d %10.0f %10.1f %10.1f %12.0f"
+        % (
+            label,
+            calls,
+            recorder.errors,
+            calls / wall,
+            percentile(latencies, 0.5) * 1e3,
+            percentile(latencies, 0.99) * 1e3,
+            cpu / calls * 1e6,
+        )
+    )
+
+
+def measure(function):
+    """Run ``function``, and return its result, wall time and CPU time of this process"""
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    result = function()
+    return result, time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32", help="closed loop thread counts, comma-separated")
+    parser.add_argument("--rates", default="100,400", help="open loop call rates per second, comma-separated")
+    parser.add_argument("--max-workers", type=int, default=64, help="open loop maximum calls in flight")
+    parser.add_argument("--duration", type=float, default=5, help="duration of each run, in seconds")
+    parser.add_argument("--route", default="/me", help="route called")
+    parser.add_argument("--latency", type=float, default=20, help="mean server latency, in milliseconds")
+    parser.add_argument("--distribution", choices=["fixed", "exponential"], default="exponential")
+    parser.add_argument("--error", action="append", default=[], help="injected error, such as 503:0.01")
+    parser.add_argument("--transport", choices=["requests", "urllib3"], default="requests")
+    args = parser.parse_args()
+    concurrency = [int(level) for level in args.concurrency.split(",") if level]
+    rates = [float(rate) for rate in args.rates.split(",") if rate]
+
+    server, url = start_server(args)
+    print(
+        "server latency %s %g ms, errors %s, transport %s, %gs per run"
+        % (args.distribution, args.latency, ",".join(args.error) or "none", args.transport, args.duration)
+    )
+    print(
+        "%-18s %8s %7s %10s %10s %10s %12s"
+        % ("load", "calls", "errors", "calls/s", "p50 (ms)", "p99 (ms)", "CPU/call (us)")
+    )
+    try:
+        for threads in concurrency:
+            client = make_client(url, args, threads)
+            recorder, wall, cpu = measure(lambda: closed_loop(client, args.route, threads, args.duration))
+            report("closed, %d threads" % threads, recorder, wall, cpu)
+        for rate in rates:
+            client = make_client(url, args, args.max_workers)
+            recorder, wall, cpu = measure(lambda: open_loop(client, args.route, rate, args.duration, args.max_workers))
+            report("open, %g/s" % rate, recorder, wall, cpu)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
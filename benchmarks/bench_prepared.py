@@ -0,0 +1,93 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Microbenchmark of prepared calls: CPU time spent per call by
+:py:func:`ovh.Client.call` and by the equivalent prepared call, with the
+network replaced by a canned response.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_prepared.py [--calls 20000]
+"""
+
+import argparse
+import time
+
+import ovh
+
+
+class CannedResponse:
+    status_code = 200
+    headers = {}
+    content = b"{}"
+
+
+def canned_request(method, url, **kwargs):
+    return CannedResponse()
+
+
+def cpu_per_call(function, calls):
+    """CPU time per call of ``function``, in microseconds, best of 3 runs"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.process_time()
+        for _ in range(calls):
+            function()
+        best = min(best, time.process_time() - start)
+    return best / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="number of calls per run")
+    args = parser.parse_args()
+
+    client = ovh.Client(
+        "ovh-eu",
+        application_key="TDPKJdwZwAQPwKX2",
+        application_secret="9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk",
+        consumer_key="5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY",
+    )
+    client._time_delta = 0
+    client._session.request = canned_request
+
+    body = {"description": "benchmark", "rules": [{"method": "GET", "path": "/me/*"}] * 10}
+    print("%-34s %10s %10s %8s" % ("call", "call (us)", "prep. (us)", "saving"))
+    for method, path, data in [
+        ("GET", "/dedicated/server/ns1234.ip-1-2-3.eu/task/42", None),
+        ("POST", "/me/api/application/1234/rules", body),
+    ]:
+        call_cpu = cpu_per_call(lambda: client.call(method, path, data), args.calls)
+        prepared_cpu = cpu_per_call(client.prepare(method, path, data), args.calls)
+        print(
+            "%-34s %10.2f %10.2f %7.0f%%"
+            % (method + " " + path[:29], call_cpu, prepared_cpu, (1 - prepared_cpu / call_cpu) * 100)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Memory benchmark of streamed responses: peak memory allocated while reading a
+large JSON array with :py:func:`ovh.Client.get`, which buffers the whole body,
+and with :py:func:`ovh.Client.iter_get`, which decodes it while it arrives.
+The network is replaced by a fake response, generating its body on the fly.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_streaming.py [--items 200000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import ovh
+
+
+def record(i):
+    return {"id": i, "fieldType": "A", "subDomain": "host-%d" % i, "target": "10.0.%d.%d" % (i // 256 % 256, i % 256)}
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, items):
+        self.items = items
+
+    def iter_content(self, chunk_size):
+        # generated lazily, as read from the connection
+        buffer = b"["
+        for i in range(self.items):
+            buffer += (b"," if i else b"") + json.dumps(record(i)).encode()
+            if len(buffer) >= chunk_size:
+                yield buffer
+                buffer = b""
+        yield buffer + b"]"
+
+    @property
+    def content(self):
+        # buffered, as downloaded by requests
+        return b"".join(self.iter_content(64 * 1024))
+
+    def close(self):
+        pass
+
+
+def measure(function):
+    """Peak memory allocated by ``function``, in MiB, and its duration, in s"""
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+
+    # tracing slows allocations down: measure the duration of another run
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200000, help="number of items of the JSON array")
+    args = parser.parse_args()
+
+    client = ovh.Client(
+        "ovh-eu", application_key="TDPKJdwZwAQPwKX2", application_secret="9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+    )
+    client._session.request = lambda method, url, **kwargs: FakeResponse(args.items)
+    size = sum(len(chunk) for chunk in FakeResponse(args.items).iter_content(64 * 1024))
+
+    def count(items):
+        return sum(1 for _ in items)
+
+    print("body: %d items, %.1f MiB" % (args.items, size / 1024 / 1024))
+    print("%-10s %10s %10s" % ("mode", "peak (MiB)", "time (s)"))
+    for mode, function in [
+        ("get", lambda: count(client.get("/domain/zone/example.com/record", _need_auth=False))),
+        ("iter_get", lambda: count(client.iter_get("/domain/zone/example.com/record", _need_auth=False))),
+    ]:
+        print("%-10s %10.1f %10.2f" % ((mode,) + measure(function)))
+
+
+if __name__ == "__main__":
+    main()
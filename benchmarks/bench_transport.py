@@ -0,0 +1,122 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of the transports: CPU time spent by the calling thread per call,
+and calls per second, with the ``requests`` and the ``urllib3`` transports,
+against a local keep-alive HTTP server.
+
+Usage, with the ``ovh`` package installed::
+
+    python benchmarks/bench_transport.py [--calls 5000]
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+
+import ovh
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send the headers and the body at once, flushed after each request
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'{"nichandle":"xx1234-ovh","state":"complete"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_client(server, transport, oauth2):
+    endpoint = "http://%s:%d/1.0" % server.server_address
+    if oauth2:
+        # OAuth2 clients get their token URL from an OVHcloud endpoint
+        client = ovh.Client("ovh-eu", client_id="oauth2_id", client_secret="oauth2_secret", transport=transport)
+        client._oauth2._token = {"access_token": "MTQ0NjJkZmQ5OTM2NDE1ZTZjNGZmZjI3", "token_type": "Bearer"}
+        client._endpoint = endpoint
+    else:
+        client = ovh.Client(
+            endpoint,
+            application_key="TDPKJdwZwAQPwKX2",
+            application_secret="9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk",
+            consumer_key="5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY",
+            transport=transport,
+        )
+        client._time_delta = 0
+    return client
+
+
+def measure(function, calls):
+    """
+    CPU time of the calling thread per call of ``function``, in
+    microseconds, and calls per second, best of 3 runs
+    """
+    best_cpu, best_wall = float("inf"), float("inf")
+    for _ in range(3):
+        start_cpu, start_wall = time.thread_time(), time.perf_counter()
+        for _ in range(calls):
+            function()
+        best_cpu = min(best_cpu, time.thread_time() - start_cpu)
+        best_wall = min(best_wall, time.perf_counter() - start_wall)
+    return best_cpu / calls * 1e6, calls / best_wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000, help="number of calls per run")
+    args = parser.parse_args()
+
+    # OAuth2 tokens are only sent over https, which the local server does not speak
+    os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print("%-28s %14s %10s" % ("transport", "CPU/call (us)", "calls/s"))
+    try:
+        for oauth2 in (False, True):
+            for transport in ("requests", "urllib3"):
+                client = make_client(server, transport, oauth2)
+                cpu, rate = measure(lambda: client.get("/me"), args.calls)
+                label = "%s, %s" % (transport, "OAuth2" if oauth2 else "signed")
+                print("%-28s %14.1f %10.0f" % (label, cpu, rate))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
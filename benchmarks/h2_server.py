@@ -0,0 +1,201 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Local stand-in of the API for the transport benchmarks: it answers every
+request with a small JSON body after a fixed latency, over TLS, speaking
+HTTP/2 or HTTP/1.1 depending on what the client negotiates (ALPN), and counts
+the connections it accepts. The cost of opening a connection over a real
+network, a few round trips for the TCP and TLS handshakes, is emulated by a
+delay before the first response of each connection.
+
+A self-signed certificate for 127.0.0.1 is generated with the ``openssl``
+command. Usage, from another script::
+
+    with H2Server(latency=0.02) as server:
+        print(server.url, server.cafile)
+        ...
+        print(server.connections)
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+
+
+def self_signed_certificate(directory):
+    """Generate a certificate for 127.0.0.1, and return its paths"""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", keyfile, "-out", certfile,
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+    return certfile, keyfile
+
+
+class H2Server:
+    """
+    Server running in a background thread, with its own event loop.
+
+    :param float latency: delay before each response, in seconds
+    :param float connect_latency: extra delay before the first response of
+        each connection, in seconds
+    :param int max_streams: maximum number of concurrent streams per HTTP/2
+        connection advertised to clients
+    :param tuple protocols: ALPN protocols offered, by order of preference
+    """
+
+    def __init__(self, latency=0.02, connect_latency=0.06, max_streams=100, protocols=("h2", "http/1.1")):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.max_streams = max_streams
+        self.protocols = protocols
+        self.connections = 0
+        self.requests = 0
+        self._directory = tempfile.TemporaryDirectory()
+        self.cafile, keyfile = self_signed_certificate(self._directory.name)
+
+        self._context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self._context.load_cert_chain(self.cafile, keyfile)
+        self._context.set_alpn_protocols(list(protocols))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server = None
+
+    def __enter__(self):
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=self._context, backlog=1024), self._loop
+        ).result()
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = "https://127.0.0.1:%d" % port
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._directory.cleanup()
+
+    async def _stop(self):
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def reset(self):
+        self.connections = self.requests = 0
+
+    def _body(self, method, path):
+        self.requests += 1
+        return json.dumps({"method": method, "path": path}).encode()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        await asyncio.sleep(self.connect_latency)
+        try:
+            if writer.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_http1(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http1(self, reader, writer):
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            method, path, _ = lines[0].split(" ", 2)
+            headers = dict(line.lower().split(": ", 1) for line in lines[1:] if line)
+            await reader.readexactly(int(headers.get("content-length", 0)))
+
+            await asyncio.sleep(self.latency)
+            body = self._body(method, path)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, reader, writer):
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        connection.initiate_connection()
+        connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: self.max_streams})
+        writer.write(connection.data_to_send())
+
+        requests = {}
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = dict(event.headers)
+                elif isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers = requests.pop(event.stream_id)
+                    asyncio.ensure_future(self._respond_h2(connection, writer, event.stream_id, headers))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(connection.data_to_send())
+            await writer.drain()
+
+    async def _respond_h2(self, connection, writer, stream_id, headers):
+        await asyncio.sleep(self.latency)
+        body = self._body(headers[":method"], headers[":path"])
+        try:
+            headers = [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(body)))]
+            connection.send_headers(stream_id, headers)
+            connection.send_data(stream_id, body, end_stream=True)
+        except h2.exceptions.StreamClosedError:
+            return
+        writer.write(connection.data_to_send())
+
+
+if __name__ == "__main__":
+    with H2Server() as server:
+        print("listening on %s, CA bundle %s" % (server.url, server.cafile))
+        threading.Event().wait()
@@ -62,8 +62,12 @@ for service_type in service_types:
     service_list = client.get("/%s" % service_type)
 
     # If we found you have this one or more of this product, we get these information
-    for service in service_list:
-        service_infos = client.get("/%s/%s/serviceInfos" % (service_type, service))
+    targets = ["/%s/%s/serviceInfos" % (service_type, service) for service in service_list]
+    for service, service_infos in zip(service_list, client.get_many(targets)):
+        if isinstance(service_infos, ovh.APIError):
+            print("Failed to get information of %s %s: %s" % (service_type, service, service_infos))
+            continue
+
         service_expiration_date = datetime.datetime.strptime(service_infos["expiration"], "%Y-%m-%d")
 
         # If the expiration date is before (now + delay) date, we add it into our listing
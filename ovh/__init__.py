@@ -43,3 +43,12 @@ from .exceptions import (
     ResourceConflictError,
     ResourceNotFoundError,
 )
+
+
+def __getattr__(name):
+    # AsyncClient is imported on first use only, along with aiohttp
+    if name == "AsyncClient":
+        from .async_client import AsyncClient
+
+        return AsyncClient
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,65 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+SQLite connections of the stores backed by a database file, shared by the
+response cache and the rate limiter.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class ThreadConnections:
+    """
+    Connections to an SQLite database file, one per thread, in autocommit mode
+    and with write-ahead logging. Calling it returns the connection of the
+    current thread. Connections are never shared with a forked child process.
+    """
+
+    def __init__(self, path, timeout, pragmas=()):
+        """
+        :param str path: path of the database file, created if needed
+        :param float timeout: how long to wait for a lock held by another
+            process, in seconds
+        :param pragmas: extra ``PRAGMA`` statements run on each new connection,
+            such as ``"synchronous=NORMAL"``
+        """
+        self.path = path
+        self.timeout = timeout
+        self.pragmas = ("journal_mode=WAL",) + tuple(pragmas)
+        self._local = threading.local()
+
+    def __call__(self):
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            for pragma in self.pragmas:
+                db.execute("PRAGMA " + pragma)
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
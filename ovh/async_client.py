@@ -0,0 +1,559 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides an :py:mod:`asyncio` flavor of :py:class:`ovh.Client`,
+built on top of ``aiohttp``. Install it with ``pip install ovh[async]``.
+"""
+
+import asyncio
+import itertools
+import time
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from ._fork import register_after_fork
+from .client import (
+    BATCH_SEPARATOR,
+    BATCH_SIZE,
+    DATE_MAX_AGE,
+    MAX_URL_LENGTH,
+    MAX_WORKERS,
+    TIMEOUT,
+    BaseClient,
+    _parse_date_delta,
+)
+from .exceptions import APIError, HTTPError, InvalidResponse
+from .oauth2 import AsyncOAuth2
+
+#: Default maximum number of simultaneous connections of an AsyncClient
+POOL_MAXSIZE = 100
+
+
+class AsyncClient(BaseClient):
+    """
+    Asynchronous OVH Client. It exposes the same API as :py:class:`ovh.Client`,
+    except that :py:func:`AsyncClient.get`, :py:func:`AsyncClient.post`,
+    :py:func:`AsyncClient.put`, :py:func:`AsyncClient.delete`,
+    :py:func:`AsyncClient.get_many`, :py:func:`AsyncClient.get_batch`,
+    :py:func:`AsyncClient.call` and :py:func:`AsyncClient.raw_call` are
+    coroutines, and :py:func:`AsyncClient.get_as_completed` and
+    :py:func:`AsyncClient.iter_pages` asynchronous generators. All the
+    requests share a pool of at most ``pool_maxsize`` connections, and
+    :py:attr:`AsyncClient.time_delta` is awaitable. Responses are not
+    streamed, and calls can't be prepared: there is no ``iter_get()`` nor
+    ``prepare()``.
+
+    Example usage:
+
+    .. code:: python
+
+        import asyncio
+        from ovh import AsyncClient
+
+        async def main():
+            async with AsyncClient("ovh-eu") as client:
+                services = await client.get("/dedicated/server")
+                infos = await asyncio.gather(
+                    *(client.get("/dedicated/server/%s/serviceInfos" % s) for s in services)
+                )
+
+        asyncio.run(main())
+
+    """
+
+    def __init__(
+        self,
+        endpoint=None,
+        application_key=None,
+        application_secret=None,
+        consumer_key=None,
+        timeout=TIMEOUT,
+        config_file=None,
+        client_id=None,
+        client_secret=None,
+        pool_maxsize=POOL_MAXSIZE,
+        rate_limiter=None,
+        time_delta_cache=None,
+        json_codec=None,
+    ):
+        """
+        Creates a new AsyncClient. See :py:func:`ovh.Client.__init__` for the
+        meaning of the common parameters.
+
+        The underlying ``aiohttp`` session is created on first use, from within
+        the running event loop.
+
+        :param int pool_maxsize: maximum number of simultaneous connections
+        :param RateLimiter rate_limiter: if set, wait for a token of this rate
+            limiter before each call, without blocking the event loop. Its
+            store should be a fast, local one. See :py:mod:`ovh.ratelimit`.
+        :param TimeDeltaCache time_delta_cache: on-disk cache of the time
+            delta, shared with other processes. See :py:mod:`ovh.timesync`.
+        :param json_codec: name of the codec decoding response bodies, or a
+            codec instance. See :py:mod:`ovh.codec`.
+        :raises ImportError: if ``aiohttp`` is not installed
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncClient requires aiohttp, install it with 'pip install ovh[async]'")
+
+        super().__init__(
+            endpoint=endpoint,
+            application_key=application_key,
+            application_secret=application_secret,
+            consumer_key=consumer_key,
+            timeout=timeout,
+            config_file=config_file,
+            client_id=client_id,
+            client_secret=client_secret,
+            rate_limiter=rate_limiter,
+            time_delta_cache=time_delta_cache,
+            json_codec=json_codec,
+        )
+        self._pool_maxsize = pool_maxsize
+
+        self._init_process_state()
+        register_after_fork(self)
+
+    def _new_oauth2(self, token_url):
+        return AsyncOAuth2(client_id=self._client_id, client_secret=self._client_secret, token_url=token_url)
+
+    def _init_process_state(self):
+        """
+        Forget the state bound to the event loop of another process: the
+        session and the lock loading the time delta are created again, from
+        within the running loop, on first use.
+        """
+        self._session = None
+        self._time_delta_lock = None
+
+    def _after_fork(self):
+        self._init_process_state()
+        if self._oauth2 is not None:
+            self._oauth2._after_fork()
+
+    def __getstate__(self):
+        """
+        Compact pickle form of the client, see :py:func:`ovh.Client.__getstate__`.
+        """
+        return {
+            "endpoint": self._endpoint,
+            "application_key": self._application_key,
+            "application_secret": self._application_secret,
+            "consumer_key": self._consumer_key,
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
+            "oauth2": self._oauth2,
+            "time_delta": self._time_delta,
+            "timeout": self._timeout,
+            "pool_maxsize": self._pool_maxsize,
+            "json_codec": self._json_codec,
+        }
+
+    def __setstate__(self, state):
+        self._endpoint = state["endpoint"]
+        self._application_key = state["application_key"]
+        self._application_secret = state["application_secret"]
+        self._consumer_key = state["consumer_key"]
+        self._client_id = state["client_id"]
+        self._client_secret = state["client_secret"]
+        self._oauth2 = state["oauth2"]
+        self._time_delta = state["time_delta"]
+        self._last_date = None
+        self._timeout = state["timeout"]
+        self._pool_maxsize = state["pool_maxsize"]
+        self._json_codec = state["json_codec"]
+        self._rate_limiter = self._time_delta_cache = None
+
+        self._init_process_state()
+        register_after_fork(self)
+
+    @property
+    def session(self):
+        """
+        ``aiohttp.ClientSession`` shared by all the requests of this client.
+        """
+        if self._session is None or self._session.closed:
+            if isinstance(self._timeout, tuple):
+                connect, read = self._timeout
+            else:
+                connect = read = self._timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_maxsize),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            )
+        return self._session
+
+    async def close(self):
+        """
+        Close the underlying session and its connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # high level API
+
+    @property
+    def time_delta(self):
+        """
+        Awaitable time distance between local and server time in seconds. See
+        :py:attr:`ovh.Client.time_delta`.
+
+        It is loaded only once, even when many coroutines await it at the same
+        time:
+
+        .. code:: python
+
+            delta = await client.time_delta
+
+        :rtype: int
+        """
+        return self._load_time_delta()
+
+    async def _load_time_delta(self):
+        if self._time_delta is not None:
+            return self._time_delta
+
+        # the lock must be created from within the running loop
+        if self._time_delta_lock is None:
+            self._time_delta_lock = asyncio.Lock()
+
+        async with self._time_delta_lock:
+            if self._time_delta is None:
+                self._time_delta = self._date_time_delta(DATE_MAX_AGE)
+            if self._time_delta is None and self._time_delta_cache is not None:
+                self._time_delta = self._time_delta_cache.get(self._endpoint)
+            if self._time_delta is None:
+                self._time_delta = await self._query_time_delta()
+        return self._time_delta
+
+    async def _query_time_delta(self):
+        server_time = await self.get("/auth/time", _need_auth=False)
+        time_delta = server_time - int(time.time())
+        if self._time_delta_cache is not None:
+            self._time_delta_cache.set(self._endpoint, time_delta)
+        return time_delta
+
+    async def request_consumerkey(self, access_rules, redirect_url=None, allowedIPs=None):
+        """
+        Coroutine version of :py:func:`ovh.Client.request_consumerkey`.
+        """
+        res = await self.post(
+            "/auth/credential",
+            _need_auth=False,
+            accessRules=access_rules,
+            redirection=redirect_url,
+            allowedIPs=allowedIPs,
+        )
+        self._consumer_key = res["consumerKey"]
+        return res
+
+    # API shortcuts
+
+    async def get(self, _target, _need_auth=True, **kwargs):
+        """
+        'GET' :py:func:`AsyncClient.call` wrapper. See :py:func:`ovh.Client.get`.
+        """
+        _target = self._append_query_string(_target, kwargs)
+        return await self.call("GET", _target, None, _need_auth)
+
+    async def put(self, _target, _need_auth=True, **kwargs):
+        """
+        'PUT' :py:func:`AsyncClient.call` wrapper. See :py:func:`ovh.Client.put`.
+        """
+        kwargs = self._canonicalize_kwargs(kwargs)
+        if not kwargs:
+            kwargs = None
+        return await self.call("PUT", _target, kwargs, _need_auth)
+
+    async def post(self, _target, _need_auth=True, **kwargs):
+        """
+        'POST' :py:func:`AsyncClient.call` wrapper. See :py:func:`ovh.Client.post`.
+        """
+        kwargs = self._canonicalize_kwargs(kwargs)
+        if not kwargs:
+            kwargs = None
+        return await self.call("POST", _target, kwargs, _need_auth)
+
+    async def delete(self, _target, _need_auth=True, **kwargs):
+        """
+        'DELETE' :py:func:`AsyncClient.call` wrapper. See :py:func:`ovh.Client.delete`.
+        """
+        _target = self._append_query_string(_target, kwargs)
+        return await self.call("DELETE", _target, None, _need_auth)
+
+    async def get_many(self, targets, max_workers=MAX_WORKERS, _need_auth=True):
+        """
+        Coroutine version of :py:func:`ovh.Client.get_many`. At most
+        ``max_workers`` calls are in flight, on the connections of this client.
+
+        :returns: list of results or exceptions, in the order of ``targets``
+        """
+        results = {}
+        async for index, _, result in self._get_concurrently(targets, max_workers, _need_auth):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    async def get_as_completed(self, targets, max_workers=MAX_WORKERS, _need_auth=True):
+        """
+        Asynchronous generator version of :py:func:`ovh.Client.get_as_completed`:
+
+        .. code:: python
+
+            async for target, result in client.get_as_completed(targets):
+                print(target, result)
+
+        :returns: asynchronous generator of ``(target, result)`` tuples, in
+            completion order
+        """
+        async for _, target, result in self._get_concurrently(targets, max_workers, _need_auth):
+            yield target, result
+
+    async def _get_concurrently(self, targets, max_workers, need_auth):
+        """
+        Run 'GET' calls for ``targets`` as tasks, keeping at most
+        ``max_workers`` calls in flight. The calls left are cancelled if the
+        caller stops iterating.
+
+        :returns: asynchronous generator of ``(index, target, result)`` in
+            completion order
+        """
+        targets = enumerate(targets)
+        pending = {}
+        try:
+            while True:
+                for index, target in itertools.islice(targets, max_workers - len(pending)):
+                    pending[asyncio.ensure_future(self._get_or_error(target, need_auth))] = (index, target)
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, target = pending.pop(future)
+                    yield index, target, future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _get_or_error(self, target, need_auth):
+        try:
+            return await self.get(target, _need_auth=need_auth)
+        except APIError as error:
+            return error
+
+    # pagination helpers
+
+    async def iter_pages(self, _target, page_size=None, _need_auth=True, **kwargs):
+        """
+        Asynchronous generator version of :py:func:`ovh.Client.iter_pages`.
+        The next page is fetched while the caller processes the items of the
+        current one:
+
+        .. code:: python
+
+            async for resource in client.iter_pages('/v2/iam/resource', page_size=500):
+                print(resource['urn'])
+
+        :returns: asynchronous generator of items
+        """
+        _target = self._append_query_string(_target, kwargs)
+
+        async def fetch(cursor):
+            headers = {}
+            if page_size is not None:
+                headers["X-Pagination-Size"] = str(page_size)
+            if cursor is not None:
+                headers["X-Pagination-Cursor"] = cursor
+            items, response = await self._call("GET", _target, None, _need_auth, headers)
+            return items, response.headers.get("X-Pagination-Cursor-Next")
+
+        page = asyncio.ensure_future(fetch(None))
+        try:
+            while page is not None:
+                items, cursor = await page
+                page = asyncio.ensure_future(fetch(cursor)) if cursor else None
+                for item in items:
+                    yield item
+        finally:
+            # do not fetch a page that will not be consumed
+            if page is not None:
+                page.cancel()
+
+    # batch helpers
+
+    async def get_batch(self, _target, ids, _need_auth=True, batch_size=BATCH_SIZE, max_url_length=MAX_URL_LENGTH):
+        """
+        Coroutine version of :py:func:`ovh.Client.get_batch`.
+
+        :returns: dict mapping each identifier to its value, or to an
+            :py:class:`APIError` if it could not be fetched, see
+            :py:func:`ovh.Client.get_batch`
+        :rtype: dict
+        """
+        ids = list(ids)
+        results = {}
+        for chunk in self._batch_chunks(_target, ids, batch_size, max_url_length):
+            keys = {str(object_id): object_id for object_id in chunk}
+            try:
+                items = await self.call(
+                    "GET",
+                    _target.format(BATCH_SEPARATOR.join(keys)),
+                    None,
+                    _need_auth,
+                    headers={"X-Ovh-Batch": BATCH_SEPARATOR},
+                )
+            except APIError as error:
+                results.update((object_id, error) for object_id in chunk)
+                continue
+            self._read_batch(keys, chunk, items, results)
+
+        return {object_id: results[object_id] for object_id in ids}
+
+    # low level helpers
+
+    async def call(self, method, path, data=None, need_auth=True, headers=None):
+        """
+        Low level call helper. See :py:func:`ovh.Client.call`.
+
+        :param str method: HTTP verb. Usually one of GET, POST, PUT, DELETE
+        :param str path: api entrypoint to call, relative to endpoint base path
+        :param data: any json serializable data to send as request's body
+        :param boolean need_auth: if False, bypass signature
+        :param dict headers: extra headers to send, see :py:func:`Client.raw_call`
+        :raises HTTPError: when underlying request failed for network reason
+        :raises InvalidResponse: when API response could not be decoded
+        """
+        return (await self._call(method, path, data, need_auth, headers))[0]
+
+    async def _call(self, method, path, data=None, need_auth=True, headers=None):
+        """
+        Same as :py:func:`AsyncClient.call`, but also return the response
+        object so that callers may inspect its headers.
+
+        :returns: tuple of the decoded response and the response object
+        """
+        status, json_result, result = await self._decoded_call(method, path, data, need_auth, headers)
+
+        # the local clock drifted: sync the time delta again and sign the call
+        # again, once
+        if self._is_timestamp_error(status, json_result, need_auth):
+            time_delta = _parse_date_delta(result.headers.get("Date"), time.time())
+            if time_delta is None:
+                time_delta = await self._query_time_delta()
+            elif self._time_delta_cache is not None:
+                self._time_delta_cache.set(self._endpoint, time_delta)
+            self._time_delta = time_delta
+            status, json_result, result = await self._decoded_call(method, path, data, need_auth, headers)
+
+        return self._check_status(status, json_result, result), result
+
+    async def _decoded_call(self, method, path, data, need_auth, headers):
+        """
+        Send a request and decode its response.
+
+        :returns: tuple of the status, the decoded response and the response
+            object
+        """
+        # attempt request
+        try:
+            result = await self.raw_call(method=method, path=path, data=data, need_auth=need_auth, headers=headers)
+            body = await result.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            raise HTTPError("Low HTTP request failed error", error)
+
+        status = result.status
+
+        # attempt to decode and return the response. 204 and 304 have no body
+        try:
+            if status not in (204, 304):
+                json_result = self._json_codec.loads(body)
+            else:
+                json_result = None
+        except ValueError as error:
+            raise InvalidResponse("Failed to decode API response", error)
+
+        self._observe_date(result)
+        return status, json_result, result
+
+    async def raw_call(self, method, path, data=None, need_auth=True, headers=None):
+        """
+        Lowest level call helper. See :py:func:`ovh.Client.raw_call`.
+        Will return a fully read ``aiohttp.ClientResponse`` object or let any
+        ``aiohttp`` exception pass through.
+
+        :param str method: HTTP verb. Usually one of GET, POST, PUT, DELETE
+        :param str path: api entrypoint to call, relative to endpoint base path
+        :param data: any json serializable data to send as request's body
+        :param boolean need_auth: if False, bypass signature
+        :param dict headers: A dict containing the headers that should be sent to
+                             the OVH API.
+        """
+        body = ""
+        target = self._get_target(path)
+        session = self.session
+
+        if headers is None:
+            headers = {}
+
+        # include payload
+        if data is not None:
+            headers["Content-type"] = "application/json"
+            body = self._json_codec.dumps(data)
+
+        # wait for a token before signing, so that the timestamp stays accurate
+        if self._rate_limiter is not None:
+            key = self._rate_limit_key()
+            delay = self._rate_limiter.try_acquire(key)
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self._rate_limiter.try_acquire(key)
+
+        # sign request. Never sign 'time' or will recurse infinitely
+        if need_auth and self._oauth2:
+            target, headers, body = await self._oauth2.add_token(session, method, target, headers, body)
+        else:
+            if need_auth:
+                self._check_credentials()
+                self._sign(headers, method, target, body, await self.time_delta)
+            headers["X-Ovh-Application"] = self._application_key
+
+        # reading the whole body hands the connection back to the pool, while
+        # keeping the payload available to further ``read()`` calls
+        response = await session.request(method, target, headers=headers, data=body)
+        await response.read()
+        if self._rate_limiter is not None and response.status == 429:
+            self._rate_limiter.throttled(self._rate_limit_key(), response)
+        return response
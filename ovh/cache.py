@@ -0,0 +1,764 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides an optional cache of 'GET' responses for
+:py:class:`ovh.Client`:
+
+.. code:: python
+
+    import ovh
+    from ovh.cache import ResponseCache
+
+    cache = ResponseCache(ttl=30, ttls={'/me': 300, '/dedicated/server/*/serviceInfos': 3600})
+    client = ovh.Client(cache=cache)
+
+    client.get('/me')  # sent to the API
+    client.get('/me')  # served from the cache
+    print(cache.stats)  # Counter({'misses': 1, 'hits': 1})
+
+When the API returns ``ETag`` or ``Last-Modified`` validators, they are kept
+along with the cached response. Once its time to live has expired, the response
+is revalidated with a conditional request: if the API answers ``304 Not
+Modified``, the cached value is returned again, without transferring nor
+decoding the response body.
+
+Hot routes may be given a stale-while-revalidate window, during which an
+expired response is still returned at once, while a background worker of the
+client refreshes it. Callers only wait for the API once the window is over:
+
+.. code:: python
+
+    cache = ResponseCache(ttl=30, stale_ttls={'/dedicated/server/*': 300})
+
+Permanent errors may be cached as well, for a short while: calls to routes
+known to be missing then raise the same exception again, without reaching the
+API. It is disabled by default:
+
+.. code:: python
+
+    cache = ResponseCache(negative_ttl=10, negative_statuses=(404, 460))
+
+Cached responses are kept in a :py:class:`CacheStore`. The default
+:py:class:`MemoryStore` is private to the process, while a
+:py:class:`SQLiteStore` is shared by all the processes of a host, and survives
+their restarts. :py:class:`RemoteStore` plugs a networked key-value store, such
+as Redis, to share the cache between hosts:
+
+.. code:: python
+
+    cache = ResponseCache(store=SQLiteStore('/var/cache/myapp/ovh.sqlite', compression='zstd'))
+
+Only authenticated 'GET' calls are cached. Any 'POST', 'PUT' or 'DELETE' call
+invalidates the cached responses of the routes it may have changed: the route
+itself, its sub-routes and its parent routes.
+
+.. warning:: Cached values are shared between callers and must be treated as
+   read-only.
+"""
+
+from collections import Counter, OrderedDict
+import fnmatch
+import json
+import threading
+import time
+import zlib
+
+from . import exceptions
+from ._fork import register_after_fork
+from ._sqlite import ThreadConnections
+from .exceptions import APIError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+#: Default time to live of cached responses, in seconds
+DEFAULT_TTL = 60
+
+#: Default maximum size of cached responses bodies, in bytes
+MAX_BYTES = 64 * 1024 * 1024
+
+#: Default HTTP statuses of the errors cached when negative caching is enabled
+NEGATIVE_STATUSES = (404,)
+
+#: Returned by :py:func:`ResponseCache.get` when a key is not cached
+MISS = object()
+
+
+class CacheEntry:
+    """
+    Cached response, along with its validators. Times are UNIX timestamps, so
+    that entries can be shared between processes.
+    """
+
+    __slots__ = ("value", "expires_at", "stale_until", "size", "etag", "last_modified")
+
+    def __init__(self, value, expires_at, size, etag=None, last_modified=None, stale_until=None):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = expires_at if stale_until is None else stale_until
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self):
+        """Whether the entry may be used without revalidation"""
+        return self.expires_at > time.time()
+
+    def is_stale(self):
+        """Whether the entry expired, but may still be used while it is refreshed"""
+        now = time.time()
+        return self.expires_at <= now < self.stale_until
+
+    def is_error(self):
+        """Whether the entry caches an error, rather than a value"""
+        return isinstance(self.value, APIError)
+
+    def result(self):
+        """
+        Cached value, or raise a copy of the cached error.
+
+        :raises APIError: when the entry caches an error
+        """
+        if self.is_error():
+            # raise a new instance, so that tracebacks do not pile up in the cached one
+            raise self.value.__class__(*self.value.args, response=self.value.response)
+        return self.value
+
+    def can_revalidate(self):
+        """Whether the entry has validators for a conditional request"""
+        return bool(self.etag or self.last_modified)
+
+    def is_dead(self):
+        """Whether the entry is of no use anymore"""
+        return not self.is_fresh() and not self.is_stale() and not self.can_revalidate()
+
+    def dumps(self):
+        """
+        Serialize the entry to JSON. Cached errors lose their response object.
+
+        :rtype: bytes
+        """
+        data = {
+            "expires_at": self.expires_at,
+            "stale_until": self.stale_until,
+            "size": self.size,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+        if self.is_error():
+            data["error"] = {"type": self.value.__class__.__name__, "args": self.value.args}
+        else:
+            data["value"] = self.value
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def loads(cls, raw):
+        """
+        Load an entry serialized with :py:func:`CacheEntry.dumps`.
+
+        :param bytes raw: serialized entry
+        :rtype: CacheEntry
+        """
+        data = json.loads(raw)
+        if "error" in data:
+            error_class = getattr(exceptions, data["error"]["type"], APIError)
+            value = error_class(*data["error"]["args"])
+        else:
+            value = data["value"]
+        return cls(
+            value,
+            data["expires_at"],
+            data["size"],
+            data["etag"],
+            data["last_modified"],
+            data["stale_until"],
+        )
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of decoded API responses, with time to live.
+
+    Keys are ``(identity, target)`` tuples, where ``identity`` identifies the
+    credentials used to sign the call and ``target`` is its full URL, query
+    string included.
+
+    Entries are kept in a :py:class:`CacheStore`, in memory by default.
+    Expired entries are kept during their stale-while-revalidate window, or as
+    long as they hold validators, so that they can be revalidated.
+
+    :py:attr:`ResponseCache.stats` counts ``hits``, ``stale_hits``, ``misses``,
+    ``revalidations`` (``304 Not Modified`` answers), ``refreshes`` (in the
+    background), ``negative_hits`` (cached errors), ``evictions`` and
+    ``invalidations``.
+    """
+
+    def __init__(
+        self,
+        ttl=DEFAULT_TTL,
+        ttls=None,
+        max_bytes=MAX_BYTES,
+        stale_ttl=0,
+        stale_ttls=None,
+        negative_ttl=0,
+        negative_statuses=NEGATIVE_STATUSES,
+        store=None,
+    ):
+        """
+        :param int ttl: default time to live of cached responses, in seconds
+        :param dict ttls: per-route time to live, overriding ``ttl``. Keys are
+            paths, as given to :py:func:`ovh.Client.get`, possibly with shell
+            style wildcards (``/dedicated/server/*``). The first matching
+            pattern applies. A time to live of ``0`` disables caching.
+        :param int max_bytes: maximum total size of cached response bodies,
+            when using the default :py:class:`MemoryStore`
+        :param int stale_ttl: default duration of the stale-while-revalidate
+            window following the expiration of a response, in seconds. ``0``,
+            the default, disables it.
+        :param dict stale_ttls: per-route stale-while-revalidate window,
+            overriding ``stale_ttl``, with the same syntax as ``ttls``
+        :param int negative_ttl: time to live of cached errors, in seconds.
+            ``0``, the default, disables negative caching.
+        :param tuple negative_statuses: HTTP statuses of the errors to cache,
+            such as ``404`` (:py:class:`ovh.exceptions.ResourceNotFoundError`)
+            or ``460`` (:py:class:`ovh.exceptions.ResourceExpiredError`)
+        :param CacheStore store: where to keep cached responses. Defaults to a
+            :py:class:`MemoryStore` of ``max_bytes``.
+        """
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.stale_ttl = stale_ttl
+        self.stale_ttls = stale_ttls or {}
+        self.negative_ttl = negative_ttl
+        self.negative_statuses = negative_statuses
+        self.store = store if store is not None else MemoryStore(max_bytes)
+        self.stats = Counter()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Forget the refreshes in flight in the parent process, which never end in the child"""
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.store)
+
+    @property
+    def bytes(self):
+        """Total size of cached response bodies, in bytes"""
+        return self.store.bytes
+
+    def ttl_for(self, path):
+        """
+        Time to live of the responses of ``path``.
+
+        :param str path: api entrypoint, relative to endpoint base path
+        :rtype: int
+        """
+        return _match(self.ttls, path, self.ttl)
+
+    def stale_ttl_for(self, path):
+        """
+        Duration of the stale-while-revalidate window of the responses of
+        ``path``.
+
+        :param str path: api entrypoint, relative to endpoint base path
+        :rtype: int
+        """
+        return _match(self.stale_ttls, path, self.stale_ttl)
+
+    def negative_ttl_for(self, error):
+        """
+        Time to live of ``error``, ``0`` if it must not be cached.
+
+        :param APIError error: error raised by a call
+        :rtype: int
+        """
+        if error.response is None or error.response.status_code not in self.negative_statuses:
+            return 0
+        return self.negative_ttl
+
+    def get(self, key):
+        """
+        Look ``key`` up.
+
+        :returns: cached value, or :py:data:`MISS`
+        :raises APIError: when an error is cached for ``key``
+        """
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh():
+            return MISS
+        return entry.result()
+
+    def get_entry(self, key):
+        """
+        Look ``key`` up, including stale entries and expired entries that can
+        be revalidated. Other expired entries are dropped.
+
+        :returns: :py:class:`CacheEntry`, or ``None``
+        """
+        entry = self.store.get(key)
+        if entry is not None and entry.is_dead():
+            self.store.delete(key)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+            elif entry.is_fresh():
+                self.stats["negative_hits" if entry.is_error() else "hits"] += 1
+            elif entry.is_stale():
+                self.stats["stale_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        return entry
+
+    def set(self, key, value, size, ttl, etag=None, last_modified=None, stale_ttl=0):
+        """
+        Cache ``value`` under ``key`` for ``ttl`` seconds, evicting least
+        recently used entries as needed.
+
+        :param tuple key: ``(identity, target)`` tuple
+        :param value: decoded response
+        :param int size: size of the response body, in bytes
+        :param int ttl: time to live, in seconds
+        :param str etag: ``ETag`` header of the response
+        :param str last_modified: ``Last-Modified`` header of the response
+        :param int stale_ttl: duration of the stale-while-revalidate window
+        """
+        if ttl <= 0:
+            return
+
+        expires_at = time.time() + ttl
+        evicted = self.store.set(key, CacheEntry(value, expires_at, size, etag, last_modified, expires_at + stale_ttl))
+        if evicted:
+            with self._lock:
+                self.stats["evictions"] += evicted
+
+    def revalidated(self, key, entry, ttl, stale_ttl=0):
+        """
+        Extend the life of ``entry`` by ``ttl`` seconds, after the API
+        confirmed it has not been modified.
+
+        :param tuple key: ``(identity, target)`` tuple
+        :param CacheEntry entry: entry returned by :py:func:`ResponseCache.get_entry`
+        :param int ttl: time to live, in seconds
+        :param int stale_ttl: duration of the stale-while-revalidate window
+        """
+        entry.expires_at = time.time() + ttl
+        entry.stale_until = entry.expires_at + stale_ttl
+        self.store.set(key, entry)
+        with self._lock:
+            self.stats["revalidations"] += 1
+
+    def start_refresh(self, key):
+        """
+        Claim the background refresh of ``key``. At most one refresh of a given
+        key is in flight at any time.
+
+        :returns: ``True`` if the caller must refresh ``key`` then call
+            :py:func:`ResponseCache.end_refresh`, ``False`` if another refresh
+            is already in flight.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key):
+        """Release a refresh claimed with :py:func:`ResponseCache.start_refresh`"""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, target):
+        """
+        Drop the cached responses of ``target``, of its sub-routes and of its
+        parent routes, whatever their query string.
+
+        :param str target: full URL of a route
+        """
+        invalidated = self.store.invalidate(_route(target))
+        if invalidated:
+            with self._lock:
+                self.stats["invalidations"] += invalidated
+
+    def clear(self):
+        """Drop all the cached responses"""
+        self.store.clear()
+
+
+class CacheStore:
+    """
+    Interface of the storage of a :py:class:`ResponseCache`. Implementations
+    must be thread-safe.
+    """
+
+    def __len__(self):
+        raise NotImplementedError()
+
+    @property
+    def bytes(self):
+        """Total size of stored response bodies, in bytes"""
+        raise NotImplementedError()
+
+    def get(self, key):
+        """
+        :param tuple key: ``(identity, target)`` tuple
+        :returns: stored :py:class:`CacheEntry`, or ``None``
+        """
+        raise NotImplementedError()
+
+    def set(self, key, entry):
+        """
+        Store ``entry`` under ``key``, replacing any previous entry.
+
+        :param tuple key: ``(identity, target)`` tuple
+        :param CacheEntry entry: entry to store
+        :returns: number of entries evicted to make room for it
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+    def delete(self, key):
+        """
+        :param tuple key: ``(identity, target)`` tuple
+        """
+        raise NotImplementedError()
+
+    def invalidate(self, route):
+        """
+        Delete the entries whose target, without its query string, is
+        ``route``, one of its sub-routes or one of its parents.
+
+        :param str route: full URL of a route, without query string nor
+            trailing slash
+        :returns: number of deleted entries
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        """Delete all the entries"""
+        raise NotImplementedError()
+
+
+class MemoryStore(CacheStore):
+    """
+    In-memory LRU store, private to the process. Its size is bounded by the
+    total size of the response bodies it holds: the least recently used entries
+    are evicted first.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        """
+        :param int max_bytes: maximum total size of stored response bodies
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Release the lock, possibly held by a thread of the parent process"""
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if entry.size > self.max_bytes:
+                return evicted
+
+            self._entries[key] = entry
+            self._bytes += entry.size
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        return evicted
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, route):
+        with self._lock:
+            keys = [key for key in self._entries if _related(_route(key[1]), route)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key).size
+
+
+class SQLiteStore(CacheStore):
+    """
+    Store backed by an SQLite database file. It can safely be shared by all the
+    threads and processes of a host, and survives their restarts so that they
+    start with a warm cache.
+
+    Its size is bounded by the total size of the response bodies it holds: the
+    least recently used entries are evicted first. Stored values may be
+    compressed with ``zlib`` or, if the ``zstandard`` package is installed,
+    ``zstd``.
+    """
+
+    #: Minimal delay between two updates of the last use time of an entry, to
+    #: avoid turning every cache hit into a database write
+    TOUCH_DELAY = 1
+
+    def __init__(self, path, max_bytes=MAX_BYTES, compression=None, timeout=5):
+        """
+        :param str path: path of the database file, created if needed
+        :param int max_bytes: maximum total size of stored response bodies
+        :param str compression: ``None``, ``"zlib"`` or ``"zstd"``
+        :param float timeout: how long to wait for a lock held by another
+            process, in seconds
+        :raises ImportError: if ``compression`` is ``"zstd"`` and
+            ``zstandard`` is not installed
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._compress, self._decompress = _codec(compression)
+        self._connection = ThreadConnections(path, timeout, ("synchronous=NORMAL",))
+
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " route TEXT NOT NULL,"
+                " entry BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def bytes(self):
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        db = self._connection()
+        row = db.execute("SELECT entry, last_used FROM entries WHERE key = ?", (_key(key),)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if row[1] < now - self.TOUCH_DELAY:
+            db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, _key(key)))
+        return CacheEntry.loads(self._decompress(row[0]))
+
+    def set(self, key, entry):
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            return 0
+
+        db = self._connection()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, route, entry, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (_key(key), _route(key[1]), self._compress(entry.dumps()), entry.size, time.time()),
+            )
+
+            # evict least recently used entries, in a single pass
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            evicted = []
+            for evicted_key, size in db.execute("SELECT key, size FROM entries ORDER BY last_used"):
+                evicted.append((evicted_key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            db.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        return len(evicted)
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (_key(key),))
+
+    def invalidate(self, route):
+        cursor = self._connection().execute(
+            "DELETE FROM entries"
+            " WHERE route = :route"
+            " OR substr(route, 1, length(:route) + 1) = :route || '/'"
+            " OR substr(:route, 1, length(route) + 1) = route || '/'",
+            {"route": route},
+        )
+        return cursor.rowcount
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+
+class RemoteStore(CacheStore):
+    """
+    Store backed by a networked key-value store, to share a cache between
+    hosts. ``client`` must provide the following subset of the ``redis-py``
+    API, so that a ``redis.Redis`` instance can be used as is:
+
+    - ``get(name)``, returning ``bytes`` or ``None``
+    - ``set(name, value, ex=None)``, ``ex`` being a time to live in seconds
+    - ``delete(*names)``
+    - ``scan_iter(match=None)``, iterating over the matching names
+
+    Entries expire on the remote side at the end of their life. The size of
+    the store is not bounded on the client side: configure an eviction policy
+    on the remote store instead. Invalidation scans all the keys of the cache,
+    so it is best suited to read-mostly workloads.
+    """
+
+    def __init__(self, client, prefix="ovh:", compression=None):
+        """
+        :param client: remote store client, see above
+        :param str prefix: prefix of the remote keys, without spaces
+        :param str compression: ``None``, ``"zlib"`` or ``"zstd"``
+        """
+        self.client = client
+        self.prefix = prefix
+        self._compress, self._decompress = _codec(compression)
+
+    def __len__(self):
+        return sum(1 for _ in self._names())
+
+    @property
+    def bytes(self):
+        return sum(entry.size for entry in map(self._get_raw, self._names()) if entry is not None)
+
+    def _names(self):
+        """Names of all the remote keys of this cache"""
+        for name in self.client.scan_iter(match=self.prefix + "*"):
+            yield name.decode("utf-8") if isinstance(name, bytes) else name
+
+    def _name(self, key):
+        return self.prefix + _key(key)
+
+    def _get_raw(self, name):
+        raw = self.client.get(name)
+        return None if raw is None else CacheEntry.loads(self._decompress(raw))
+
+    def get(self, key):
+        return self._get_raw(self._name(key))
+
+    def set(self, key, entry):
+        # keep entries as long as they can be revalidated
+        if entry.can_revalidate():
+            ex = None
+        else:
+            ex = max(1, int(entry.stale_until - time.time()) + 1)
+        self.client.set(self._name(key), self._compress(entry.dumps()), ex=ex)
+        return 0
+
+    def delete(self, key):
+        self.client.delete(self._name(key))
+
+    def invalidate(self, route):
+        names = [name for name in self._names() if _related(_route(_unkey(name)[1]), route)]
+        if names:
+            self.client.delete(*names)
+        return len(names)
+
+    def clear(self):
+        names = list(self._names())
+        if names:
+            self.client.delete(*names)
+
+
+def _codec(compression):
+    """Compression and decompression functions for ``compression``"""
+    if compression is None:
+        return bytes, bytes
+    if compression == "zlib":
+        return zlib.compress, zlib.decompress
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd compression requires zstandard, install it with 'pip install ovh[zstd]'")
+        return zstandard.compress, zstandard.decompress
+    raise ValueError("Unknown compression %r, valid values: None, 'zlib', 'zstd'" % compression)
+
+
+def _key(key):
+    """Serialize an ``(identity, target)`` key"""
+    return " ".join(key)
+
+
+def _unkey(name):
+    """Load an ``(identity, target)`` key serialized with :py:func:`_key`"""
+    return tuple(name.split(" ", 1))
+
+
+def _route(target):
+    """Route of ``target``: its URL without query string nor trailing slash"""
+    return target.split("?", 1)[0].rstrip("/")
+
+
+def _match(patterns, path, default):
+    """Value of the first of ``patterns`` matching ``path``, ignoring its query string"""
+    path = path.split("?", 1)[0]
+    for pattern, value in patterns.items():
+        if fnmatch.fnmatchcase(path, pattern):
+            return value
+    return default
+
+
+def _related(a, b):
+    """Whether one of the URLs ``a`` and ``b`` is the other one or one of its sub-routes"""
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
@@ -33,16 +33,24 @@ It handles requesting credential, signing queries...
  https://help.ovhcloud.com/csm/en-gb-api-getting-started-ovhcloud-api?id=kb_article_view&sysparm_article=KB0042784
 """
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import email.utils
 import hashlib
-import json
+import itertools
 import keyword
+import threading
 import time
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urljoin
 
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from requests.utils import select_proxy
 
 from . import config
+from ._fork import register_after_fork
+from .codec import get_codec
+from .compression import Compression
 from .consumer_key import ConsumerKeyRequest
 from .exceptions import (
     APIError,
@@ -62,6 +70,12 @@ from .exceptions import (
     ResourceNotFoundError,
 )
 from .oauth2 import OAuth2
+from .prepared import PreparedCall
+from .ratelimit import PER_CONSUMER
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .streaming import CHUNK_SIZE, MAX_SIZE, iter_json_array
+from .transport import TRANSPORTS, RequestsTransport, Transport, Urllib3Transport, resolve_environment
 
 # Mapping between OVH API region names and corresponding endpoints
 ENDPOINTS = {
@@ -77,6 +91,51 @@ ENDPOINTS = {
 # Default timeout for each request. 180 seconds connect, 180 seconds read.
 TIMEOUT = 180
 
+# Default number of per host connection pools, and of connections kept open in
+# each of them. These are the defaults of requests.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+# Default number of concurrent requests issued by the fan-out helpers. It
+# matches the default size of the connection pool.
+MAX_WORKERS = 10
+
+# Number of workers refreshing stale cache entries in the background
+REFRESH_WORKERS = 2
+
+# Separator of the identifiers of batch calls, announced in X-Ovh-Batch header
+BATCH_SEPARATOR = ","
+
+# Maximum number of identifiers requested at once by batch calls
+BATCH_SIZE = 100
+
+# Maximum length of a batch call URL, to stay clear of server side limits
+MAX_URL_LENGTH = 2048
+
+# Maximum age, in seconds, of a time delta estimated from the Date header of a
+# response, for it to be used instead of querying '/auth/time'
+DATE_MAX_AGE = 300
+
+# Error code of the calls rejected because of their timestamp
+QUERY_TIME_OUT = "QUERY_TIME_OUT"
+
+# Exceptions of the 403 errors, by error code
+FORBIDDEN_ERRORS = {
+    "NOT_GRANTED_CALL": NotGrantedCall,
+    "NOT_CREDENTIAL": NotCredential,
+    "INVALID_KEY": InvalidKey,
+    "INVALID_CREDENTIAL": InvalidCredential,
+    "FORBIDDEN": Forbidden,
+}
+
+# Exceptions of the other errors, by status
+STATUS_ERRORS = {
+    404: ResourceNotFoundError,
+    400: BadParametersError,
+    409: ResourceConflictError,
+    460: ResourceExpiredError,
+}
+
 # OAuth2 token provider URLs
 OAUTH2_TOKEN_URLS = {
     "ovh-eu": "https://www.ovh.com/auth/oauth2/token",
@@ -84,8 +143,446 @@ OAUTH2_TOKEN_URLS = {
     "ovh-us": "https://us.ovhcloud.com/auth/oauth2/token",
 }
 
+# OAuth2 token path of the servers given by URL
+OAUTH2_TOKEN_PATH = "/auth/oauth2/token"
+
+
+def _parse_date_delta(date, received_at):
+    """
+    Estimate the time delta from the ``Date`` header of a response.
+
+    :param str date: header value, possibly ``None``
+    :param float received_at: local time when the response was received
+    :returns: time delta, or ``None`` if the header is missing or invalid
+    :rtype: int
+    """
+    try:
+        server_time = email.utils.parsedate_to_datetime(date).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return int(server_time) - int(received_at)
+
+
+def _keep_authorization(request):
+    """Authentication of the sessions of OAuth2 clients, leaving requests untouched"""
+    return request
+
 
-class Client:
+class BaseClient:
+    """
+    Configuration, request signing and error mapping shared by
+    :py:class:`Client` and :py:class:`ovh.async_client.AsyncClient`, which
+    send the requests.
+    """
+
+    def __init__(
+        self,
+        endpoint=None,
+        application_key=None,
+        application_secret=None,
+        consumer_key=None,
+        timeout=TIMEOUT,
+        config_file=None,
+        client_id=None,
+        client_secret=None,
+        rate_limiter=None,
+        configuration=None,
+        time_delta_cache=None,
+        json_codec=None,
+    ):
+        """
+        Load the endpoint and the credentials, and check them. See
+        :py:func:`Client.__init__` for the parameters.
+        """
+        if configuration is None:
+            configuration = config.ConfigurationManager()
+
+        # Load a custom config file if requested
+        if config_file is not None:
+            configuration.read(config_file)
+
+        # load endpoint
+        if endpoint is None:
+            endpoint = configuration.get("default", "endpoint")
+
+        # a full URL reaches another server, such as a local stand-in of the API,
+        # which also provides the OAuth2 tokens
+        if isinstance(endpoint, str) and endpoint.startswith(("http://", "https://")):
+            self._endpoint = endpoint.rstrip("/")
+            # the URL of a region gets its tokens from the authentication server of the region
+            region = next((name for name, url in ENDPOINTS.items() if url == self._endpoint), None)
+            if region is not None:
+                token_url = OAUTH2_TOKEN_URLS.get(region)
+            else:
+                token_url = urljoin(self._endpoint, OAUTH2_TOKEN_PATH)
+        else:
+            try:
+                self._endpoint = ENDPOINTS[endpoint]
+            except KeyError:
+                raise InvalidRegion("Unknown endpoint %s. Valid endpoints: %s", endpoint, ENDPOINTS.keys())
+            token_url = OAUTH2_TOKEN_URLS.get(endpoint)
+
+        # load keys
+        if application_key is None:
+            application_key = configuration.get(endpoint, "application_key")
+        self._application_key = application_key
+
+        if application_secret is None:
+            application_secret = configuration.get(endpoint, "application_secret")
+        self._application_secret = application_secret
+
+        if consumer_key is None:
+            consumer_key = configuration.get(endpoint, "consumer_key")
+        self._consumer_key = consumer_key
+
+        # load OAuth2 data
+        if client_id is None:
+            client_id = configuration.get(endpoint, "client_id")
+        self._client_id = client_id
+
+        if client_secret is None:
+            client_secret = configuration.get(endpoint, "client_secret")
+        self._client_secret = client_secret
+
+        # configuration validation
+        if bool(self._client_id) is not bool(self._client_secret):
+            raise InvalidConfiguration("Invalid OAuth2 config, both client_id and client_secret must be given")
+
+        if bool(self._application_key) is not bool(self._application_secret):
+            raise InvalidConfiguration(
+                "Invalid authentication config, both application_key and application_secret must be given"
+            )
+
+        if self._client_id is not None and self._application_key is not None:
+            raise InvalidConfiguration(
+                "Can't use both application_key/application_secret and OAuth2 client_id/client_secret"
+            )
+        if self._client_id is None and self._application_key is None:
+            raise InvalidConfiguration(
+                "Missing authentication information, you need to provide at least an application_key/application_secret"
+                " or a client_id/client_secret"
+            )
+        if self._client_id and token_url is None:
+            raise InvalidConfiguration(
+                "OAuth2 authentication is not compatible with endpoint "
+                + endpoint
+                + " (it can only be used with ovh-eu, ovh-ca and ovh-us)"
+            )
+
+        # when in OAuth2 mode, instantiate the oauthlib client
+        self._oauth2 = self._new_oauth2(token_url) if self._client_id else None
+
+        # lazy load time delta, possibly estimated from the last Date header
+        self._time_delta = None
+        self._last_date = None
+
+        # Override default timeout
+        self._timeout = timeout
+
+        # optional client-side rate limiting
+        self._rate_limiter = rate_limiter
+
+        # optional on-disk cache of the time delta
+        self._time_delta_cache = time_delta_cache
+
+        if json_codec is None or isinstance(json_codec, str):
+            json_codec = get_codec(json_codec)
+        self._json_codec = json_codec
+
+    def _new_oauth2(self, token_url):
+        """
+        Build the OAuth2 flow of this client.
+
+        :param str token_url: URL the tokens are fetched from
+        """
+        raise NotImplementedError
+
+    def new_consumer_key_request(self):
+        """
+        Create a new consumer key request. This is the recommended way to create
+        a new consumer key request.
+
+        Full example:
+
+        >>> import ovh
+        >>> client = ovh.Client("ovh-eu")
+        >>> ck = client.new_consumer_key_request()
+        >>> ck.add_rules(ovh.API_READ_ONLY, "/me")
+        >>> ck.add_recursive_rules(ovh.API_READ_WRITE, "/sms")
+        >>> ck.request()
+        {
+            'state': 'pendingValidation',
+            'consumerKey': 'TnpZAd5pYNqxk4RhlPiSRfJ4WrkmII2i',
+            'validationUrl': 'https://eu.api.ovh.com/auth/?credentialToken=now2OOAVO4Wp6t7bemyN9DMWIobhGjFNZSHmixtVJM4S7mzjkN2L5VBfG96Iy1i0'
+        }
+        """  # noqa:E501
+        return ConsumerKeyRequest(self)
+
+    # time delta helpers
+
+    def _observe_date(self, response):
+        """
+        Remember the ``Date`` header of a response, and when it was received.
+        It is only parsed when needed, by :py:func:`BaseClient._date_time_delta`.
+        """
+        date = response.headers.get("Date")
+        if isinstance(date, str):
+            self._last_date = (date, time.time())
+
+    def _date_time_delta(self, max_age):
+        """
+        Estimate the time delta from the last ``Date`` header received.
+
+        :param float max_age: maximum age of the header, in seconds
+        :returns: time delta, or ``None`` without a recent enough header
+        :rtype: int
+        """
+        last_date = self._last_date
+        if last_date is None or time.time() - last_date[1] > max_age:
+            return None
+        return _parse_date_delta(*last_date)
+
+    def _is_timestamp_error(self, status, json_result, need_auth):
+        """Whether a signed call was rejected because of its timestamp"""
+        return (
+            status == 400
+            and need_auth
+            and self._oauth2 is None
+            and isinstance(json_result, dict)
+            and json_result.get("errorCode") == QUERY_TIME_OUT
+        )
+
+    # request helpers
+
+    def _canonicalize_kwargs(self, kwargs):
+        """
+        If an API needs an argument colliding with a Python reserved keyword, it
+        can be prefixed with an underscore. For example, ``from`` argument of
+        ``POST /email/domain/{domain}/redirection`` may be replaced by ``_from``
+
+        :param dict kwargs: input kwargs
+        :return dict: filtered kawrgs
+        """
+        arguments = {}
+
+        for k, v in kwargs.items():
+            if k[0] == "_" and k[1:] in keyword.kwlist:
+                k = k[1:]
+            arguments[k] = v
+
+        return arguments
+
+    def _prepare_query_string(self, kwargs):
+        """
+        Boolean needs to be send as lowercase 'false' or 'true' in querystring.
+        This function prepares arguments for querystring and encodes them.
+
+        :param dict kwargs: input kwargs
+        :return string: prepared querystring
+        """
+        arguments = {}
+
+        for k, v in kwargs.items():
+            if isinstance(v, bool):
+                v = str(v).lower()
+            elif v is None:
+                v = "null"
+            arguments[k] = v
+
+        return urlencode(arguments)
+
+    def _append_query_string(self, target, kwargs):
+        """
+        Append ``kwargs`` to ``target`` as a query string, taking care of any
+        query string already present in ``target``.
+
+        :param str target: API method to call
+        :param dict kwargs: input kwargs
+        :return string: target with query string
+        """
+        if kwargs:
+            kwargs = self._canonicalize_kwargs(kwargs)
+            query_string = self._prepare_query_string(kwargs)
+            if query_string != "":
+                if "?" in target:
+                    target = "%s&%s" % (target, query_string)
+                else:
+                    target = "%s?%s" % (target, query_string)
+        return target
+
+    def _get_target(self, path):
+        """
+        _get_target returns the URL to target given an endpoint and a path.
+        If the path starts with `/v1` or `/v2`, then remove the trailing `/1.0` from the endpoint.
+
+        :param str path: path to use prefix from
+        :returns: target with one of /1.0 and /v1|2 path segment
+        :rtype: str
+        """
+        endpoint = self._endpoint
+        if endpoint.endswith("/1.0") and path.startswith(("/v1", "/v2")):
+            endpoint = endpoint[:-4]
+        return endpoint + path
+
+    def _batch_chunks(self, target, ids, batch_size, max_url_length):
+        """
+        Split ``ids`` into chunks that honor both ``batch_size`` and
+        ``max_url_length``. An identifier too long to fit in the URL limit
+        is still sent, alone.
+
+        :returns: generator of lists of identifiers
+        """
+        base_length = len(self._get_target(target.format("")))
+        chunk, length = [], base_length
+        for object_id in ids:
+            id_length = len(str(object_id)) + len(BATCH_SEPARATOR)
+            if chunk and (len(chunk) >= batch_size or length + id_length > max_url_length):
+                yield chunk
+                chunk, length = [], base_length
+            chunk.append(object_id)
+            length += id_length
+        if chunk:
+            yield chunk
+
+    def _read_batch(self, keys, chunk, items, results):
+        """
+        Store the value, or the error, of each identifier of ``chunk`` into
+        ``results``, from the ``items`` of a batch response. Each item carries
+        the ``key`` of an identifier and its ``value``, or an ``error`` message
+        along with the ``status`` and the ``errorCode`` of a single call
+        failing the same way:
+
+        .. code:: json
+
+            [
+                {"key": "ns1.example.com", "value": {"state": "ok"}, "error": ""},
+                {"key": "gone.example.com", "value": null, "error": "This object does not exist", "status": 404}
+            ]
+
+        :param dict keys: identifiers of ``chunk``, by their string form
+        """
+        for item in items:
+            object_id = keys.get(str(item.get("key")))
+            if item.get("error"):
+                # items report their own status, like a single call would
+                error_code = item.get("errorCode")
+                status = item.get("status", 403 if error_code in FORBIDDEN_ERRORS else None)
+                error = {"message": item["error"], "errorCode": error_code}
+                results[object_id] = self._api_error(status, error, None)
+            else:
+                results[object_id] = item.get("value")
+
+        # an identifier may be silently omitted from the response, which does
+        # not tell whether it exists
+        for object_id in chunk:
+            if object_id not in results:
+                results[object_id] = InvalidResponse("Missing from batch response: %s" % object_id)
+
+    def _auth_identity(self):
+        """
+        Opaque identifier of the credentials used to sign requests, so that
+        cached data is never shared between different credentials.
+
+        :rtype: str
+        """
+        if self._oauth2:
+            credentials = [self._client_id]
+        else:
+            credentials = [self._application_key or "", self._consumer_key or ""]
+        return hashlib.sha1("+".join(credentials).encode("utf-8")).hexdigest()
+
+    def _rate_limit_key(self):
+        """
+        Key of the rate limiter bucket used by this client: a hash of the
+        application key (or OAuth2 client id), and of the consumer key when
+        limiting per consumer key.
+
+        :rtype: str
+        """
+        if self._rate_limiter.per == PER_CONSUMER:
+            return self._auth_identity()
+        credential = self._client_id if self._oauth2 else self._application_key
+        return hashlib.sha1((credential or "").encode("utf-8")).hexdigest()
+
+    def _check_credentials(self):
+        """
+        Make sure application secret and consumer key are available for
+        request signing.
+
+        :raises InvalidKey: if either of them is missing
+        """
+        if not self._application_secret:
+            raise InvalidKey("Invalid ApplicationSecret '%s'" % self._application_secret)
+
+        if not self._consumer_key:
+            raise InvalidKey("Invalid ConsumerKey '%s'" % self._consumer_key)
+
+    def _sign(self, headers, method, target, body, time_delta):
+        """
+        Inject authentication headers in ``headers``.
+
+        Request signature is a sha1 hash on following fields, joined by '+'
+         - application_secret
+         - consumer_key
+         - METHOD
+         - full request url
+         - body
+         - server current time (takes time delta into account)
+
+        :param dict headers: headers of the request, updated in place
+        :param str method: HTTP verb
+        :param str target: full request url
+        :param str body: serialized request body
+        :param int time_delta: time distance between local and server time
+        """
+        now = str(int(time.time()) + time_delta)
+        signature = hashlib.sha1()
+        signature.update(
+            "+".join([self._application_secret, self._consumer_key, method.upper(), target, body, now]).encode("utf-8")
+        )
+
+        headers["X-Ovh-Consumer"] = self._consumer_key
+        headers["X-Ovh-Timestamp"] = now
+        headers["X-Ovh-Signature"] = "$1$" + signature.hexdigest()
+
+    # response helpers
+
+    def _check_status(self, status, json_result, response):
+        """
+        Map an API response status to its return value or exception.
+
+        :param int status: HTTP status code of the response
+        :param json_result: decoded response body
+        :param response: raw response object, attached to raised exceptions
+        :raises APIError: when the status denotes an error
+        :returns: ``json_result`` when the status denotes a success
+        """
+        # 304 only answers conditional requests, the caller already has the value
+        if status >= 100 and status < 300 or status == 304:
+            return json_result
+        raise self._api_error(status, json_result, response)
+
+    def _api_error(self, status, json_result, response):
+        """
+        Build the exception matching an API error.
+
+        :param int status: HTTP status code of the error
+        :param dict json_result: decoded error, with its ``message`` and
+            ``errorCode``
+        :param response: raw response object, attached to the exception
+        :rtype: APIError
+        """
+        if status == 403 and json_result.get("errorCode") in FORBIDDEN_ERRORS:
+            return FORBIDDEN_ERRORS[json_result["errorCode"]](json_result.get("message"), response=response)
+        elif status in STATUS_ERRORS:
+            return STATUS_ERRORS[status](json_result.get("message"), response=response)
+        elif status == 0:
+            return NetworkError()
+        else:
+            return APIError(json_result.get("message"), response=response)
+
+
+class Client(BaseClient):
     """
     Low level OVH Client. It abstracts all the authentication and request
     signing logic along with some nice tools helping with key generation.
@@ -127,6 +624,21 @@ class Client:
         config_file=None,
         client_id=None,
         client_secret=None,
+        cache=None,
+        coalesce=False,
+        retry=None,
+        rate_limiter=None,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=False,
+        configuration=None,
+        adapter=None,
+        time_delta_cache=None,
+        json_codec=None,
+        compression=None,
+        http2=False,
+        transport=None,
+        trust_env=True,
     ):
         """
         Creates a new Client. No credential check is done at this point.
@@ -153,7 +665,17 @@ class Client:
         latter approach you need at least requests v2.4.0. Default value is
         180 seconds for connection and 180 seconds for read.
 
-        :param str endpoint: API endpoint to use. Valid values in ``ENDPOINTS``
+        A client may be shared between threads. Size its connection pool after
+        the number of threads: ``pool_maxsize`` connections are kept open, and
+        extra connections are discarded after use unless ``pool_block`` is
+        set, in which case threads wait for a pooled connection instead.
+
+        :param str endpoint: API endpoint to use. Valid values in
+            ``ENDPOINTS``, or the full URL of the API, such as
+            ``http://127.0.0.1:8080/1.0`` for a local stand-in of the API, see
+            :py:mod:`ovh.testing`. Its OAuth2 tokens are then fetched from
+            :py:data:`OAUTH2_TOKEN_PATH` on the same server, unless it is the
+            URL of one of ``ENDPOINTS``.
         :param str application_key: Application key as provided by OVHcloud
         :param str application_secret: Application secret key as provided by OVHcloud
         :param str consumer_key: uniquely identifies
@@ -161,89 +683,268 @@ class Client:
         :param str client_secret: OAuth2 client secret
         :param tuple timeout: Connection and read timeout for each request
         :param float timeout: Same timeout for both connection and read
+        :param ResponseCache cache: cache of 'GET' responses, see
+            :py:mod:`ovh.cache`. It may be shared between clients.
+        :param coalesce: if ``True``, or a :py:class:`SingleFlight` instance,
+            identical concurrent 'GET' calls share a single request. See
+            :py:mod:`ovh.singleflight`.
+        :param retry: if ``True``, or a :py:class:`RetryPolicy` instance, retry
+            failed calls. See :py:mod:`ovh.retry`.
+        :param RateLimiter rate_limiter: if set, wait for a token of this rate
+            limiter before each call. See :py:mod:`ovh.ratelimit`.
+        :param int pool_connections: number of per host connection pools
+        :param int pool_maxsize: maximum number of connections kept open per
+            host
+        :param bool pool_block: whether to wait for a connection when all the
+            connections of the pool are in use, rather than opening a new one
+        :param ConfigurationManager configuration: already loaded configuration
+            to look missing parameters up in, a new one by default
+        :param HTTPAdapter adapter: transport adapter shared with other
+            clients, replacing the connection pool settings above. See
+            :py:class:`ovh.pool.ClientPool`.
+        :param TimeDeltaCache time_delta_cache: on-disk cache of the time
+            delta, shared with other processes. See :py:mod:`ovh.timesync`.
+        :param json_codec: name of the codec decoding response bodies, or a
+            :py:class:`JSONCodec` instance. Defaults to the fastest one
+            installed. See :py:mod:`ovh.codec`.
+        :param compression: if ``True``, or a :py:class:`Compression` instance,
+            explicitly negotiate the encoding of the responses, optionally
+            compress large request bodies, and count the bytes transferred.
+            See :py:mod:`ovh.compression`.
+        :param bool http2: if True, multiplex concurrent requests over a few
+            HTTP/2 connections, falling back to HTTP/1.1 for hosts that do not
+            support it. See :py:mod:`ovh.http2`.
+        :param transport: ``"requests"``, the default, ``"urllib3"``, or a
+            :py:class:`Transport` instance sending the requests. The pool,
+            ``adapter`` and ``http2`` settings only apply to ``requests``, and
+            a shared instance is not carried by pickle. See
+            :py:mod:`ovh.transport`.
+        :param trust_env: if True, ``requests`` reads the proxies, the CA
+            bundle and the ``.netrc`` credentials from the environment on
+            every call. ``"once"`` reads them when the client is built, or
+            when :py:func:`Client.reload_environment` is called, and False
+            ignores the environment. HTTP/2 connections only use the proxies
+            and the CA bundle read with ``"once"``.
         :raises InvalidRegion: if ``endpoint`` can't be found in ``ENDPOINTS``.
+        :raises ImportError: if the library of ``json_codec``, or the HTTP/2
+            dependencies when ``http2`` is set, are not installed
+        :raises ValueError: if ``transport`` is not a known transport, or
+            ``trust_env`` not a valid setting
         """
 
-        configuration = config.ConfigurationManager()
-
-        # Load a custom config file if requested
-        if config_file is not None:
-            configuration.read(config_file)
-
-        # load endpoint
-        if endpoint is None:
-            endpoint = configuration.get("default", "endpoint")
-
-        try:
-            self._endpoint = ENDPOINTS[endpoint]
-        except KeyError:
-            raise InvalidRegion("Unknown endpoint %s. Valid endpoints: %s", endpoint, ENDPOINTS.keys())
-
-        # load keys
-        if application_key is None:
-            application_key = configuration.get(endpoint, "application_key")
-        self._application_key = application_key
-
-        if application_secret is None:
-            application_secret = configuration.get(endpoint, "application_secret")
-        self._application_secret = application_secret
-
-        if consumer_key is None:
-            consumer_key = configuration.get(endpoint, "consumer_key")
-        self._consumer_key = consumer_key
+        super().__init__(
+            endpoint=endpoint,
+            application_key=application_key,
+            application_secret=application_secret,
+            consumer_key=consumer_key,
+            timeout=timeout,
+            config_file=config_file,
+            client_id=client_id,
+            client_secret=client_secret,
+            rate_limiter=rate_limiter,
+            configuration=configuration,
+            time_delta_cache=time_delta_cache,
+            json_codec=json_codec,
+        )
 
-        # load OAuth2 data
-        if client_id is None:
-            client_id = configuration.get(endpoint, "client_id")
-        self._client_id = client_id
+        # connection pool settings of the sessions
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._http2 = http2
+        self._adapter = adapter
+
+        # transport sending the signed requests, built per process unless shared
+        if isinstance(transport, Transport):
+            self._transport_name, self._shared_transport = None, transport
+        elif transport is None or transport in TRANSPORTS:
+            self._transport_name, self._shared_transport = transport or "requests", None
+        else:
+            raise ValueError("Unknown transport %r, valid transports: %s" % (transport, ", ".join(TRANSPORTS)))
+
+        # settings read from the environment, either by requests on every
+        # call, or once
+        if trust_env not in (True, False, "once"):
+            raise ValueError("Invalid trust_env %r, valid values: True, False, 'once'" % (trust_env,))
+        self._trust_env = trust_env
+        self._environment = resolve_environment(self._endpoint) if trust_env == "once" else None
+
+        # optional cache of 'GET' responses, with lazily started workers
+        # refreshing stale entries
+        self._cache = cache
+
+        # optional coalescing of identical concurrent 'GET' calls
+        if coalesce is True:
+            coalesce = SingleFlight()
+        self._single_flight = coalesce or None
+
+        # optional retry of failed calls
+        if retry is True:
+            retry = RetryPolicy()
+        self._retry = retry or None
+
+        # optional compression settings and accounting of the bytes transferred
+        if compression is True:
+            compression = Compression()
+        self._compression = compression or None
+
+        self._init_process_state()
+        register_after_fork(self)
+
+    def _new_oauth2(self, token_url):
+        # the token is fetched through the connection pool settings of this client
+        return OAuth2(
+            client_id=self._client_id,
+            client_secret=self._client_secret,
+            token_url=token_url,
+            adapter_factory=self._new_adapter,
+        )
 
-        if client_secret is None:
-            client_secret = configuration.get(endpoint, "client_secret")
-        self._client_secret = client_secret
+    def _init_process_state(self):
+        """
+        Create the state that can't be shared with another process: the session
+        with its pooled connections, the locks and the worker threads.
+        """
+        # use a requests session to reuse HTTPS connections between requests
+        self._session = self._new_session()
+        self._transport = self._new_transport()
 
-        # configuration validation
-        if bool(self._client_id) is not bool(self._client_secret):
-            raise InvalidConfiguration("Invalid OAuth2 config, both client_id and client_secret must be given")
+        # load the time delta only once, even when shared between threads
+        self._time_delta_lock = threading.Lock()
 
-        if bool(self._application_key) is not bool(self._application_secret):
-            raise InvalidConfiguration(
-                "Invalid authentication config, both application_key and application_secret must be given"
-            )
+        self._refresh_workers = None
+        self._refresh_lock = threading.Lock()
 
-        if self._client_id is not None and self._application_key is not None:
-            raise InvalidConfiguration(
-                "Can't use both application_key/application_secret and OAuth2 client_id/client_secret"
-            )
-        if self._client_id is None and self._application_key is None:
-            raise InvalidConfiguration(
-                "Missing authentication information, you need to provide at least an application_key/application_secret"
-                " or a client_id/client_secret"
-            )
-        if self._client_id and endpoint not in OAUTH2_TOKEN_URLS:
-            raise InvalidConfiguration(
-                "OAuth2 authentication is not compatible with endpoint "
-                + endpoint
-                + " (it can only be used with ovh-eu, ovh-ca and ovh-us)"
-            )
+    def _after_fork(self):
+        """
+        Called in the child process after a fork, so that it does not share
+        connections, nor locks held by threads of the parent process.
+        """
+        self._init_process_state()
+        # the transport given to this client is kept, and reset in place
+        if self._shared_transport is not None:
+            self._shared_transport.after_fork()
+        if self._oauth2 is not None:
+            self._oauth2._after_fork()
+
+    def __getstate__(self):
+        """
+        Compact pickle form of the client. It carries the credentials, the time
+        delta and any valid OAuth2 token, so that unpickled clients start warm.
+        The cache, coalescing, retry, rate limiting and compression options, as
+        well as a shared adapter or transport, are not carried.
+        """
+        return {
+            "endpoint": self._endpoint,
+            "application_key": self._application_key,
+            "application_secret": self._application_secret,
+            "consumer_key": self._consumer_key,
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
+            "oauth2": self._oauth2,
+            "time_delta": self._time_delta,
+            "timeout": self._timeout,
+            "pool": (self._pool_connections, self._pool_maxsize, self._pool_block, self._http2),
+            "json_codec": self._json_codec,
+            "transport": self._transport_name,
+            "trust_env": self._trust_env,
+        }
 
-        # when in OAuth2 mode, instantiate the oauthlib client
-        if self._client_id:
-            self._oauth2 = OAuth2(
-                client_id=self._client_id,
-                client_secret=self._client_secret,
-                token_url=OAUTH2_TOKEN_URLS[endpoint],
+    def __setstate__(self, state):
+        self._endpoint = state["endpoint"]
+        self._application_key = state["application_key"]
+        self._application_secret = state["application_secret"]
+        self._consumer_key = state["consumer_key"]
+        self._client_id = state["client_id"]
+        self._client_secret = state["client_secret"]
+        self._oauth2 = state["oauth2"]
+        self._time_delta = state["time_delta"]
+        self._last_date = None
+        self._timeout = state["timeout"]
+        self._pool_connections, self._pool_maxsize, self._pool_block, self._http2 = state["pool"]
+        self._json_codec = state["json_codec"]
+        self._adapter = self._shared_transport = None
+        self._transport_name = state["transport"]
+        # the environment of this process may differ
+        self._trust_env = state["trust_env"]
+        self._environment = resolve_environment(self._endpoint) if self._trust_env == "once" else None
+        self._cache = self._single_flight = self._retry = self._rate_limiter = None
+        self._time_delta_cache = self._compression = None
+
+        self._init_process_state()
+        register_after_fork(self)
+
+    def _new_session(self):
+        """
+        Build the HTTP session used to reuse connections between requests.
+        """
+        session = Session()
+        session.mount("https://", self._new_adapter())
+        session.mount("http://", self._new_adapter())
+        if self._trust_env is not True:
+            session.trust_env = False
+        if self._environment is not None:
+            session.proxies = dict(self._environment.proxies)
+            session.verify = self._environment.verify
+            session.auth = self._environment.auth
+        # the Authorization header carries the OAuth2 token, the .netrc
+        # credentials must not replace it
+        if self._oauth2 is not None:
+            session.auth = _keep_authorization
+        return session
+
+    def _new_adapter(self):
+        """
+        Build a transport adapter with the connection pool settings of this
+        client, unless it shares one with other clients.
+        """
+        if self._adapter is not None:
+            return self._adapter
+        if self._http2:
+            # httpx and its HTTP/2 dependencies are only imported when needed
+            from .http2 import HTTP2Adapter
+
+            if self._environment is None:
+                return HTTP2Adapter()
+            return HTTP2Adapter(
+                verify=self._environment.verify, proxy=select_proxy(self._endpoint, self._environment.proxies)
             )
-        else:
-            self._oauth2 = None
-
-        # lazy load time delta
-        self._time_delta = None
+        return HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+        )
 
-        # use a requests session to reuse HTTPS connections between requests
-        self._session = Session()
+    def _new_transport(self):
+        """
+        Build the transport sending the requests, unless it is shared with
+        other clients.
+        """
+        if self._shared_transport is not None:
+            return self._shared_transport
+        if self._transport_name == "urllib3":
+            if self._environment is None:
+                return Urllib3Transport(self._pool_connections, self._pool_maxsize, self._pool_block)
+            return Urllib3Transport(
+                self._pool_connections,
+                self._pool_maxsize,
+                self._pool_block,
+                verify=self._environment.verify,
+                proxy=select_proxy(self._endpoint, self._environment.proxies),
+            )
+        return RequestsTransport(self._session)
 
-        # Override default timeout
-        self._timeout = timeout
+    def reload_environment(self):
+        """
+        Read the proxies, the CA bundle and the ``.netrc`` credentials from the
+        environment again, for a client built with ``trust_env="once"``. New
+        connections are opened with them.
+        """
+        if self._trust_env != "once":
+            return
+        self._environment = resolve_environment(self._endpoint)
+        self._session = self._new_session()
+        self._transport = self._new_transport()
 
     # high level API
 
@@ -253,10 +954,14 @@ class Client:
         Request signatures are valid only for a short amount of time to mitigate
         risk of attack replay scenarii which requires to use a common time
         reference. This function queries endpoint's time and computes the delta.
-        This entrypoint does not require authentication.
+        This entrypoint does not require authentication. When a response was
+        received in the last :py:data:`DATE_MAX_AGE` seconds, the delta is
+        estimated from its ``Date`` header instead. Otherwise, it is read from
+        the on-disk cache given as ``time_delta_cache``, if any.
 
         This method is *lazy*. It will only load it once even though it is used
-        for each request.
+        for each request, and by many threads at once. It is loaded again when
+        the API rejects a call because of its timestamp.
 
         .. note:: You should not need to use this property directly
 
@@ -264,30 +969,37 @@ class Client:
         :rtype: int
         """
         if self._time_delta is None:
-            server_time = self.get("/auth/time", _need_auth=False)
-            self._time_delta = server_time - int(time.time())
+            with self._time_delta_lock:
+                if self._time_delta is None:
+                    self._time_delta = self._date_time_delta(DATE_MAX_AGE)
+                if self._time_delta is None and self._time_delta_cache is not None:
+                    self._time_delta = self._time_delta_cache.get(self._endpoint)
+                if self._time_delta is None:
+                    self._time_delta = self._query_time_delta()
         return self._time_delta
 
-    def new_consumer_key_request(self):
-        """
-        Create a new consumer key request. This is the recommended way to create
-        a new consumer key request.
+    def _query_time_delta(self):
+        """Query the time delta from the API, and save it to the on-disk cache"""
+        server_time = self.get("/auth/time", _need_auth=False)
+        time_delta = server_time - int(time.time())
+        if self._time_delta_cache is not None:
+            self._time_delta_cache.set(self._endpoint, time_delta)
+        return time_delta
 
-        Full example:
+    def _resync_time_delta(self, response):
+        """
+        Load the time delta again, after a call was rejected because of its
+        timestamp. The ``Date`` header of the rejection is used when available.
+        The on-disk cache, if any, is updated too.
 
-        >>> import ovh
-        >>> client = ovh.Client("ovh-eu")
-        >>> ck = client.new_consumer_key_request()
-        >>> ck.add_rules(ovh.API_READ_ONLY, "/me")
-        >>> ck.add_recursive_rules(ovh.API_READ_WRITE, "/sms")
-        >>> ck.request()
-        {
-            'state': 'pendingValidation',
-            'consumerKey': 'TnpZAd5pYNqxk4RhlPiSRfJ4WrkmII2i',
-            'validationUrl': 'https://eu.api.ovh.com/auth/?credentialToken=now2OOAVO4Wp6t7bemyN9DMWIobhGjFNZSHmixtVJM4S7mzjkN2L5VBfG96Iy1i0'
-        }
-        """  # noqa:E501
-        return ConsumerKeyRequest(self)
+        :param response: the rejection
+        """
+        time_delta = _parse_date_delta(response.headers.get("Date"), time.time())
+        if time_delta is None:
+            time_delta = self._query_time_delta()
+        elif self._time_delta_cache is not None:
+            self._time_delta_cache.set(self._endpoint, time_delta)
+        self._time_delta = time_delta
 
     def request_consumerkey(self, access_rules, redirect_url=None, allowedIPs=None):
         """
@@ -340,7 +1052,6 @@ class Client:
             # Print nice welcome message
             print("Welcome", client.get('/me')['firstname'])
 
-
         :param list access_rules: Mapping specifying requested privileges.
         :param str redirect_url: Where to redirect end user upon validation (optional).
         :param list allowedIPs: CIDRs that will be allowed to use these credentials (optional).
@@ -360,43 +1071,6 @@ class Client:
 
     # API shortcuts
 
-    def _canonicalize_kwargs(self, kwargs):
-        """
-        If an API needs an argument colliding with a Python reserved keyword, it
-        can be prefixed with an underscore. For example, ``from`` argument of
-        ``POST /email/domain/{domain}/redirection`` may be replaced by ``_from``
-
-        :param dict kwargs: input kwargs
-        :return dict: filtered kawrgs
-        """
-        arguments = {}
-
-        for k, v in kwargs.items():
-            if k[0] == "_" and k[1:] in keyword.kwlist:
-                k = k[1:]
-            arguments[k] = v
-
-        return arguments
-
-    def _prepare_query_string(self, kwargs):
-        """
-        Boolean needs to be send as lowercase 'false' or 'true' in querystring.
-        This function prepares arguments for querystring and encodes them.
-
-        :param dict kwargs: input kwargs
-        :return string: prepared querystring
-        """
-        arguments = {}
-
-        for k, v in kwargs.items():
-            if isinstance(v, bool):
-                v = str(v).lower()
-            elif v is None:
-                v = "null"
-            arguments[k] = v
-
-        return urlencode(arguments)
-
     def get(self, _target, _need_auth=True, **kwargs):
         """
         'GET' :py:func:`Client.call` wrapper.
@@ -409,15 +1083,7 @@ class Client:
         :param string _need_auth: If True, send authentication headers. This is
             the default
         """
-        if kwargs:
-            kwargs = self._canonicalize_kwargs(kwargs)
-            query_string = self._prepare_query_string(kwargs)
-            if query_string != "":
-                if "?" in _target:
-                    _target = "%s&%s" % (_target, query_string)
-                else:
-                    _target = "%s?%s" % (_target, query_string)
-
+        _target = self._append_query_string(_target, kwargs)
         return self.call("GET", _target, None, _need_auth)
 
     def put(self, _target, _need_auth=True, **kwargs):
@@ -466,20 +1132,254 @@ class Client:
         :param string _need_auth: If True, send authentication headers. This is
             the default
         """
-        if kwargs:
-            kwargs = self._canonicalize_kwargs(kwargs)
-            query_string = self._prepare_query_string(kwargs)
-            if query_string != "":
-                if "?" in _target:
-                    _target = "%s&%s" % (_target, query_string)
-                else:
-                    _target = "%s?%s" % (_target, query_string)
-
+        _target = self._append_query_string(_target, kwargs)
         return self.call("DELETE", _target, None, _need_auth)
 
+    # concurrent helpers
+
+    def get_many(self, targets, max_workers=MAX_WORKERS, _need_auth=True):
+        """
+        Concurrently 'GET' each of ``targets`` and return the results in the
+        same order. Calls share this client's connection pool.
+
+        A call failing with an :py:class:`APIError` does not abort the whole
+        batch: the exception is returned in place of the result instead.
+
+        .. code:: python
+
+            ids = client.get('/dedicated/server')
+            infos = client.get_many(['/dedicated/server/%s/serviceInfos' % id for id in ids])
+            for id, info in zip(ids, infos):
+                if isinstance(info, ovh.APIError):
+                    print("Failed to get", id, ":", info)
+
+        :param list targets: API methods to call
+        :param int max_workers: maximum number of requests in flight
+        :param string _need_auth: If True, send authentication headers. This is
+            the default
+        :returns: list of results or exceptions, in the order of ``targets``
+        """
+        results = {}
+        for index, _, result in self._get_concurrently(targets, max_workers, _need_auth):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    def get_as_completed(self, targets, max_workers=MAX_WORKERS, _need_auth=True):
+        """
+        Streaming flavor of :py:func:`Client.get_many`: yield ``(target,
+        result)`` tuples as soon as each call completes, so that results can be
+        processed while slower calls are still running.
+
+        ``targets`` is consumed lazily and at most ``max_workers`` calls are in
+        flight at any time, which keeps memory usage flat even for very large
+        or unbounded iterables.
+
+        :param iterable targets: API methods to call
+        :param int max_workers: maximum number of requests in flight
+        :param string _need_auth: If True, send authentication headers. This is
+            the default
+        :returns: generator of ``(target, result)`` tuples, in completion order.
+            ``result`` is the raised :py:class:`APIError` if the call failed.
+        """
+        for _, target, result in self._get_concurrently(targets, max_workers, _need_auth):
+            yield target, result
+
+    def _get_concurrently(self, targets, max_workers, need_auth):
+        """
+        Run 'GET' calls for ``targets`` in a pool of ``max_workers`` threads,
+        keeping at most ``max_workers`` calls in flight.
+
+        :returns: generator of ``(index, target, result)`` in completion order
+        """
+        # load lazy authentication data once, rather than from every worker
+        if need_auth:
+            if self._oauth2:
+                self._oauth2.session
+            elif self._application_secret and self._consumer_key:
+                self.time_delta
+
+        targets = enumerate(targets)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            while True:
+                for index, target in itertools.islice(targets, max_workers - len(pending)):
+                    pending[executor.submit(self._get_or_error, target, need_auth)] = (index, target)
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, target = pending.pop(future)
+                    yield index, target, future.result()
+
+    def _get_or_error(self, target, need_auth):
+        try:
+            return self.get(target, _need_auth=need_auth)
+        except APIError as error:
+            return error
+
+    # pagination helpers
+
+    def iter_pages(self, _target, page_size=None, _need_auth=True, **kwargs):
+        """
+        Lazily iterate over all the items of a paginated ``/v2`` route, following
+        the ``X-Pagination-Cursor-Next`` response header from page to page.
+
+        While the caller processes the items of a page, the next page is
+        fetched in the background. At most two pages are held in memory.
+
+        .. code:: python
+
+            for resource in client.iter_pages('/v2/iam/resource', page_size=500):
+                print(resource['urn'])
+
+        Query string parameters can be set either directly in ``_target`` or as
+        keyword arguments, like :py:func:`Client.get`.
+
+        :param string _target: API method to call
+        :param int page_size: number of items per page, sent as the
+            ``X-Pagination-Size`` header. Defaults to the API default.
+        :param string _need_auth: If True, send authentication headers. This is
+            the default
+        :returns: generator of items
+        """
+        _target = self._append_query_string(_target, kwargs)
+
+        def fetch(cursor):
+            headers = {}
+            if page_size is not None:
+                headers["X-Pagination-Size"] = str(page_size)
+            if cursor is not None:
+                headers["X-Pagination-Cursor"] = cursor
+            items, response = self._call("GET", _target, None, _need_auth, headers)
+            return items, response.headers.get("X-Pagination-Cursor-Next")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = executor.submit(fetch, None)
+            try:
+                while page is not None:
+                    items, cursor = page.result()
+                    page = executor.submit(fetch, cursor) if cursor else None
+                    for item in items:
+                        yield item
+            finally:
+                # do not fetch a page that will not be consumed
+                if page is not None:
+                    page.cancel()
+
+    # streaming helpers
+
+    def iter_get(self, _target, _need_auth=True, max_size=MAX_SIZE, chunk_size=CHUNK_SIZE, **kwargs):
+        """
+        Lazily iterate over the items of a route returning a JSON array, such as
+        the full list of the records of a large DNS zone. The response body is
+        decoded while it is downloaded, so that it is never fully held in
+        memory:
+
+        .. code:: python
+
+            for record_id in client.iter_get('/domain/zone/example.com/record'):
+                print(record_id)
+
+        Error responses raise the same exceptions as :py:func:`Client.get`,
+        when the iteration starts. Responses are neither cached nor coalesced.
+
+        Query string parameters can be set either directly in ``_target`` or as
+        keyword arguments, like :py:func:`Client.get`.
+
+        :param string _target: API method to call
+        :param string _need_auth: If True, send authentication headers. This is
+            the default
+        :param int max_size: maximum size of the response body, in bytes.
+            ``None`` disables the guard. Defaults to 1 GiB.
+        :param int chunk_size: size of the chunks read from the connection
+        :raises InvalidResponse: if the response is not a JSON array, or its
+            body exceeds ``max_size``
+        :returns: generator of items
+        """
+        _target = self._append_query_string(_target, kwargs)
+
+        def send():
+            return self.raw_call("GET", _target, None, _need_auth, stream=True)
+
+        _, response = self._send("GET", _need_auth, send, stream=True)
+        decoded_bytes = 0
+
+        def chunks():
+            nonlocal decoded_bytes
+            for chunk in response.iter_content(chunk_size):
+                decoded_bytes += len(chunk)
+                yield chunk
+
+        try:
+            # fail early rather than after having downloaded max_size bytes
+            content_length = response.headers.get("Content-Length")
+            if max_size is not None and content_length and int(content_length) > max_size:
+                raise InvalidResponse("Response body exceeds %d bytes" % max_size)
+            if response.status_code in (204, 304):
+                return
+            yield from iter_json_array(chunks(), max_size)
+        except RequestException as error:
+            raise HTTPError("Low HTTP request failed error", error)
+        finally:
+            response.close()
+            if self._compression is not None:
+                self._compression.record(response, decoded_bytes)
+
+    # batch helpers
+
+    def get_batch(self, _target, ids, _need_auth=True, batch_size=BATCH_SIZE, max_url_length=MAX_URL_LENGTH):
+        """
+        Fetch many objects of the same kind using the API batch mode, where a
+        single 'GET' call returns several objects at once.
+
+        ``_target`` is a route with a ``{}`` placeholder for the object
+        identifier. Identifiers are sent comma-separated along with the
+        ``X-Ovh-Batch`` header, in chunks of at most ``batch_size`` identifiers
+        whose URL stays under ``max_url_length`` characters.
+
+        .. code:: python
+
+            servers = client.get_batch('/dedicated/server/{}', client.get('/dedicated/server'))
+            for name, server in servers.items():
+                if isinstance(server, ovh.APIError):
+                    print("Failed to get", name, ":", server)
+
+        :param string _target: API method to call, with a ``{}`` placeholder
+        :param list ids: identifiers of the objects to fetch
+        :param string _need_auth: If True, send authentication headers. This is
+            the default
+        :param int batch_size: maximum number of identifiers per call
+        :param int max_url_length: maximum length of the URL of each call
+        :returns: dict mapping each identifier to its value, or to an
+            :py:class:`APIError` if it could not be fetched. Its class is the
+            one a single call failing the same way raises, such as
+            :py:class:`ResourceNotFoundError`, or :py:class:`InvalidResponse`
+            for an identifier missing from the response.
+        :rtype: dict
+        """
+        ids = list(ids)
+        results = {}
+        for chunk in self._batch_chunks(_target, ids, batch_size, max_url_length):
+            keys = {str(object_id): object_id for object_id in chunk}
+            try:
+                items = self.call(
+                    "GET",
+                    _target.format(BATCH_SEPARATOR.join(keys)),
+                    None,
+                    _need_auth,
+                    headers={"X-Ovh-Batch": BATCH_SEPARATOR},
+                )
+            except APIError as error:
+                results.update((object_id, error) for object_id in chunk)
+                continue
+            self._read_batch(keys, chunk, items, results)
+
+        return {object_id: results[object_id] for object_id in ids}
+
     # low level helpers
 
-    def call(self, method, path, data=None, need_auth=True):
+    def call(self, method, path, data=None, need_auth=True, headers=None):
         """
         Low level call helper. If ``consumer_key`` is not ``None``, inject
         authentication headers and sign the request.
@@ -496,67 +1396,261 @@ class Client:
         :param str path: api entrypoint to call, relative to endpoint base path
         :param data: any json serializable data to send as request's body
         :param boolean need_auth: if False, bypass signature
+        :param dict headers: extra headers to send, see :py:func:`Client.raw_call`
         :raises HTTPError: when underlying request failed for network reason
         :raises InvalidResponse: when API response could not be decoded
         """
-        # attempt request
+        if self._single_flight is not None and method.upper() == "GET" and not headers:
+            key = ("GET", self._auth_identity() if need_auth else None, self._get_target(path))
+            return self._single_flight.do(key, self._cached_call, method, path, data, need_auth, headers)
+        return self._cached_call(method, path, data, need_auth, headers)
+
+    def prepare(self, method, path, data=None, need_auth=True, headers=None):
+        """
+        Prepare a call sent over and over. The target URL, the serialized body,
+        the headers and the hash of the constant part of the signature are
+        computed once, so each execution only signs the timestamp:
+
+        .. code:: python
+
+            get_me = client.prepare("GET", "/me")
+            for _ in range(10):
+                print(get_me())
+
+        Prepared calls do not go through the cache nor the coalescing of
+        identical calls.
+
+        :param str method: HTTP verb. Usually one of GET, POST, PUT, DELETE
+        :param str path: api entrypoint to call, relative to endpoint base
+            path, query string included
+        :param data: any json serializable data to send as request's body
+        :param boolean need_auth: if False, bypass signature
+        :param dict headers: extra headers to send, see :py:func:`Client.raw_call`
+        :raises InvalidKey: if the call is signed and the application secret
+            or the consumer key is missing
+        :rtype: PreparedCall
+        """
+        return PreparedCall(self, method, path, data, need_auth, headers)
+
+    def _cached_call(self, method, path, data, need_auth, headers):
+        """
+        :py:func:`Client.call` flavor going through ``self._cache``, if any:
+        serve authenticated 'GET' calls from the cache when possible, and
+        invalidate cached routes on any other call.
+        """
+        if self._cache is None:
+            return self._call(method, path, data, need_auth, headers)[0]
+
+        target = self._get_target(path)
+
+        if method.upper() != "GET":
+            try:
+                return self._call(method, path, data, need_auth, headers)[0]
+            finally:
+                self._cache.invalidate(target)
+
+        # unauthenticated calls such as /auth/time must never be cached
+        if not need_auth or headers:
+            return self._call(method, path, data, need_auth, headers)[0]
+
+        key = (self._auth_identity(), target)
+        entry = self._cache.get_entry(key)
+        if entry is not None and entry.is_fresh():
+            return entry.result()
+
+        # serve stale entries at once, and refresh them in the background
+        if entry is not None and entry.is_stale():
+            if self._cache.start_refresh(key):
+                self._refresh_executor().submit(self._refresh_cached, key, path, entry)
+            return entry.value
+
+        return self._fetch_cached(key, path, entry)
+
+    def _fetch_cached(self, key, path, entry):
+        """
+        Fetch ``path`` and store the response in the cache under ``key``. An
+        expired ``entry`` is revalidated with a conditional request. Errors are
+        cached when negative caching applies to them.
+
+        :returns: decoded response
+        """
+        headers = {}
+        if entry is not None and not entry.is_error():
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
         try:
-            result = self.raw_call(method=method, path=path, data=data, need_auth=need_auth)
-        except RequestException as error:
-            raise HTTPError("Low HTTP request failed error", error)
+            value, response = self._call("GET", path, None, True, headers)
+        except APIError as error:
+            negative_ttl = self._cache.negative_ttl_for(error)
+            if negative_ttl:
+                self._cache.set(key, error, len(error.response.content or b""), negative_ttl)
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            self._cache.revalidated(key, entry, self._cache.ttl_for(path), self._cache.stale_ttl_for(path))
+            return entry.value
+
+        self._cache.set(
+            key,
+            value,
+            len(response.content),
+            self._cache.ttl_for(path),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            stale_ttl=self._cache.stale_ttl_for(path),
+        )
+        return value
+
+    def _refresh_cached(self, key, path, entry):
+        """
+        Background refresh of a stale cache entry. Failures are ignored: the
+        stale entry keeps being served until the end of its stale window, then
+        callers fetch it themselves and get the error.
+        """
+        try:
+            self._fetch_cached(key, path, entry)
+        except APIError:
+            pass
+        finally:
+            self._cache.end_refresh(key)
+
+    def _refresh_executor(self):
+        """
+        Lazily start the workers refreshing stale cache entries. They share
+        this client's session.
+        """
+        with self._refresh_lock:
+            if self._refresh_workers is None:
+                self._refresh_workers = ThreadPoolExecutor(
+                    max_workers=REFRESH_WORKERS, thread_name_prefix="ovh-cache-refresh"
+                )
+            return self._refresh_workers
+
+    def _rate_limited(self, response):
+        """
+        Pause the rate limiter bucket of this client if ``response`` was
+        throttled.
+
+        :returns: ``response``
+        """
+        if self._rate_limiter is not None and response.status_code == 429:
+            self._rate_limiter.throttled(self._rate_limit_key(), response)
+        return response
+
+    def _call(self, method, path, data=None, need_auth=True, headers=None):
+        """
+        Same as :py:func:`Client.call`, but also return the response object so
+        that callers may inspect its headers.
+
+        :returns: tuple of the decoded response and the response object
+        """
+
+        def send():
+            # raw_call adds authentication headers to the dict it is given
+            return self.raw_call(
+                method=method,
+                path=path,
+                data=data,
+                need_auth=need_auth,
+                headers=dict(headers) if headers else None,
+            )
+
+        return self._send(method, need_auth, send)
+
+    def _send(self, method, need_auth, send, stream=False):
+        """
+        Send a request, retried according to ``self._retry``, then decode and
+        check its response.
+
+        :param str method: HTTP verb
+        :param boolean need_auth: whether the request is signed
+        :param send: signs and sends the request each time it is called, as
+            :py:func:`Client.raw_call` does
+        :param boolean stream: if True, successful responses are not decoded,
+            their body is left to be read from the response object
+        :returns: tuple of the decoded response and the response object
+        """
+        status, json_result, result = self._decoded_call(method, send, stream)
+
+        # the local clock drifted: sync the time delta again and sign the call
+        # again, once. The rejected call was not processed, even if not
+        # idempotent.
+        if self._is_timestamp_error(status, json_result, need_auth):
+            self._resync_time_delta(result)
+            status, json_result, result = self._decoded_call(method, send, stream)
+
+        return self._check_status(status, json_result, result), result
+
+    def _decoded_call(self, method, send, stream=False):
+        """
+        Send a request, retried according to ``self._retry``, and decode its
+        response. When ``stream`` is True, only error responses are decoded.
+
+        :raises HTTPError: when underlying request failed for network reason
+        :raises InvalidResponse: when API response could not be decoded
+        :returns: tuple of the status, the decoded response and the response
+            object
+        """
+        # attempt request
+        if self._retry is None:
+            try:
+                result = send()
+            except RequestException as error:
+                raise HTTPError("Low HTTP request failed error", error)
+        else:
+            result = self._retried_send(method, send)
 
         status = result.status_code
+        streamed = stream and 200 <= status < 300
 
-        # attempt to decode and return the response
+        # attempt to decode and return the response. 204 and 304 have no body
         try:
-            if status != 204:
-                json_result = result.json()
+            if streamed:
+                json_result = None
+            elif status not in (204, 304):
+                json_result = self._json_codec.loads(result.content)
             else:
                 json_result = None
         except ValueError as error:
             raise InvalidResponse("Failed to decode API response", error)
 
-        # error check
-        if status >= 100 and status < 300:
-            return json_result
-        elif status == 403 and json_result.get("errorCode") == "NOT_GRANTED_CALL":
-            raise NotGrantedCall(json_result.get("message"), response=result)
-        elif status == 403 and json_result.get("errorCode") == "NOT_CREDENTIAL":
-            raise NotCredential(json_result.get("message"), response=result)
-        elif status == 403 and json_result.get("errorCode") == "INVALID_KEY":
-            raise InvalidKey(json_result.get("message"), response=result)
-        elif status == 403 and json_result.get("errorCode") == "INVALID_CREDENTIAL":
-            raise InvalidCredential(json_result.get("message"), response=result)
-        elif status == 403 and json_result.get("errorCode") == "FORBIDDEN":
-            raise Forbidden(json_result.get("message"), response=result)
-        elif status == 404:
-            raise ResourceNotFoundError(json_result.get("message"), response=result)
-        elif status == 400:
-            raise BadParametersError(json_result.get("message"), response=result)
-        elif status == 409:
-            raise ResourceConflictError(json_result.get("message"), response=result)
-        elif status == 460:
-            raise ResourceExpiredError(json_result.get("message"), response=result)
-        elif status == 0:
-            raise NetworkError()
-        else:
-            raise APIError(json_result.get("message"), response=result)
+        # streamed bodies are accounted for once read
+        if self._compression is not None and not streamed:
+            self._compression.record(result, len(result.content))
 
-    def _get_target(self, path):
-        """
-        _get_target returns the URL to target given an endpoint and a path.
-        If the path starts with `/v1` or `/v2`, then remove the trailing `/1.0` from the endpoint.
+        self._observe_date(result)
+        return status, json_result, result
 
-        :param str path: path to use prefix from
-        :returns: target with one of /1.0 and /v1|2 path segment
-        :rtype: str
+    def _retried_send(self, method, send):
         """
-        endpoint = self._endpoint
-        if endpoint.endswith("/1.0") and path.startswith(("/v1", "/v2")):
-            endpoint = endpoint[:-4]
-        return endpoint + path
+        Send a request, retried according to ``self._retry``. Each attempt is
+        signed again, with a fresh timestamp.
 
-    def raw_call(self, method, path, data=None, need_auth=True, headers=None):
+        :raises HTTPError: when the last attempt failed for network reason
+        :returns: response of the last attempt
+        """
+        self._retry.first_attempt()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = send()
+            except RequestException as error:
+                delay = self._retry.delay(method, attempt)
+                if delay is None:
+                    raise HTTPError("Low HTTP request failed error", error)
+            else:
+                delay = self._retry.delay(method, attempt, result) if result.status_code >= 300 else None
+                if delay is None:
+                    return result
+                # release the connection of a streamed response
+                result.close()
+            time.sleep(delay)
+
+    def raw_call(self, method, path, data=None, need_auth=True, headers=None, stream=False):
         """
         Lowest level call helper. If ``consumer_key`` is not ``None``, inject
         authentication headers and sign the request.
@@ -579,6 +1673,8 @@ class Client:
                              the OVH API. ``raw_call`` will override the
                              OVH API authentication headers, as well as
                              the Content-Type header.
+        :param boolean stream: if True, the response body is not downloaded
+                               until it is read from the response object
         """
         body = ""
         target = self._get_target(path)
@@ -589,30 +1685,40 @@ class Client:
         # include payload
         if data is not None:
             headers["Content-type"] = "application/json"
-            body = json.dumps(data, separators=(",", ":"))  # Separators to prevent adding useless spaces
+            body = self._json_codec.dumps(data)
 
-        # sign request. Never sign 'time' or will recurse infinitely
-        if need_auth:
-            if self._oauth2:
-                return self._oauth2.session.request(method, target, headers=headers, data=body, timeout=self._timeout)
+        # wait for a token before signing, so that the timestamp stays accurate
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(self._rate_limit_key())
 
-            if not self._application_secret:
-                raise InvalidKey("Invalid ApplicationSecret '%s'" % self._application_secret)
+        # sign request. Never sign 'time' or will recurse infinitely
+        if need_auth and self._oauth2:
+            target, headers, body = self._oauth2.add_token(method, target, headers, body)
+        else:
+            if need_auth:
+                self._check_credentials()
+                self._sign(headers, method, target, body, self.time_delta)
+            headers["X-Ovh-Application"] = self._application_key
 
-            if not self._consumer_key:
-                raise InvalidKey("Invalid ConsumerKey '%s'" % self._consumer_key)
+        # the signature covers the uncompressed body
+        if self._compression is not None:
+            body = self._compression.compress(headers, body)
 
-            now = str(int(time.time()) + self.time_delta)
-            signature = hashlib.sha1()
-            signature.update(
-                "+".join([self._application_secret, self._consumer_key, method.upper(), target, body, now]).encode(
-                    "utf-8"
-                )
-            )
+        return self._transport_send(method, target, headers, body, stream)
 
-            headers["X-Ovh-Consumer"] = self._consumer_key
-            headers["X-Ovh-Timestamp"] = now
-            headers["X-Ovh-Signature"] = "$1$" + signature.hexdigest()
+    def _transport_send(self, method, target, headers, body, stream=False):
+        """
+        Send a signed request through the transport of this client. With
+        compression, the body is downloaded through a counter of the bytes
+        received.
 
-        headers["X-Ovh-Application"] = self._application_key
-        return self._session.request(method, target, headers=headers, data=body, timeout=self._timeout)
+        :returns: the ``requests.Response`` object
+        """
+        if self._compression is None:
+            return self._rate_limited(self._transport.send(method, target, headers, body, self._timeout, stream))
+
+        response = self._transport.send(method, target, headers, body, self._timeout, True)
+        self._compression.watch(response)
+        if not stream:
+            response.content
+        return self._rate_limited(response)
@@ -0,0 +1,184 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides the JSON codecs of :py:class:`ovh.Client`. Response
+bodies are decoded straight from bytes, with ``orjson``, ``simdjson`` or
+``ujson`` when one of them is installed (``pip install ovh[orjson]``), and the
+standard library otherwise:
+
+.. code:: python
+
+    import ovh
+    from ovh.codec import get_codec
+
+    client = ovh.Client(json_codec="orjson")
+    print(get_codec().name)  # best installed codec, used by default
+
+Whatever the codec, results are identical to the ones of the standard
+library. Request bodies are always encoded by the standard library, with
+compact separators: they are part of the request signature, and none of the
+faster libraries reproduces its output byte for byte (escaping of non-ASCII
+characters, formatting of float exponents).
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+# Integers of 20 digits or more may not fit in 64 bits, which the faster
+# libraries either reject or silently decode as floats. They are spotted as
+# runs of zeros once digits are mapped to zeros and anything else to spaces,
+# which is much faster than a regular expression.
+_DIGITS = bytes.maketrans(bytes(range(256)), b" " * 48 + b"0" * 10 + b" " * 198)
+_BIG_NUMBER = b"0" * 20
+
+
+class JSONCodec:
+    """
+    Standard library codec, the reference of all the others.
+    """
+
+    #: name of the codec, as given to :py:func:`get_codec`
+    name = "json"
+    #: module and distribution of the library of the codec
+    module = package = "json"
+
+    def __init__(self):
+        # built once rather than by each json.dumps call
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def dumps(self, data):
+        """
+        Serialize ``data`` the way request bodies are signed: as
+        ``json.dumps(data, separators=(",", ":"))`` does.
+
+        :rtype: str
+        """
+        return self._encoder.encode(data)
+
+    def loads(self, raw):
+        """
+        Decode a UTF-8 encoded response body.
+
+        :param bytes raw: response body
+        :raises ValueError: if it is not valid JSON
+        """
+        return json.loads(raw)
+
+
+class _FastCodec(JSONCodec):
+    """
+    Codec decoding with a faster library. Bodies it cannot decode exactly like
+    the standard library are left to it: large integers, and the values it
+    rejects, such as ``NaN``.
+    """
+
+    def loads(self, raw):
+        if _BIG_NUMBER not in raw.translate(_DIGITS):
+            try:
+                return self._loads(raw)
+            except ValueError:
+                pass
+        return json.loads(raw)
+
+    def _loads(self, raw):
+        raise NotImplementedError
+
+
+class OrjsonCodec(_FastCodec):
+    """Codec decoding with ``orjson``"""
+
+    name = "orjson"
+    module, package = "orjson", "orjson"
+
+    def _loads(self, raw):
+        return orjson.loads(raw)
+
+
+class SimdjsonCodec(_FastCodec):
+    """Codec decoding with ``pysimdjson``"""
+
+    name = "simdjson"
+    module, package = "simdjson", "pysimdjson"
+
+    def __init__(self):
+        super().__init__()
+        # parsers are not thread-safe, the module level function is
+        self._loads = simdjson.loads
+
+
+class UjsonCodec(_FastCodec):
+    """Codec decoding with ``ujson``"""
+
+    name = "ujson"
+    module, package = "ujson", "ujson"
+
+    def _loads(self, raw):
+        return ujson.loads(raw)
+
+
+_CODECS = [OrjsonCodec, SimdjsonCodec, UjsonCodec, JSONCodec]
+
+
+def _installed(codec_class):
+    """Whether the library of ``codec_class`` was imported"""
+    return globals()[codec_class.module] is not None
+
+
+def get_codec(name=None):
+    """
+    Get a codec by name, or the fastest one installed.
+
+    :param str name: one of ``"orjson"``, ``"simdjson"``, ``"ujson"`` or
+        ``"json"``. Defaults to the first of them that is installed.
+    :raises ImportError: if the library of the codec is not installed
+    :raises ValueError: if the name is not a known codec
+    :rtype: JSONCodec
+    """
+    if name is None:
+        return next(codec_class for codec_class in _CODECS if _installed(codec_class))()
+    for codec_class in _CODECS:
+        if codec_class.name == name:
+            if not _installed(codec_class):
+                raise ImportError(
+                    "%s codec requires %s, install it with 'pip install %s'" % (name, name, codec_class.package)
+                )
+            return codec_class()
+    raise ValueError("Unknown JSON codec %r, valid values: None, 'orjson', 'simdjson', 'ujson', 'json'" % name)
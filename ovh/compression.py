@@ -0,0 +1,234 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides the compression settings of :py:class:`ovh.Client`:
+the encodings of the responses it accepts, the compression of large request
+bodies, and the accounting of the bytes transferred.
+
+.. code:: python
+
+    import ovh
+    from ovh.compression import Compression
+
+    compression = Compression(request_min_size=64 * 1024)
+    client = ovh.Client(compression=compression)
+
+    client.get('/me/bill')
+    # Counter({'responses': 1, 'wire_bytes': 10832, 'decoded_bytes': 98304})
+    print(compression.stats)
+
+Responses are decompressed by ``urllib3`` while they are read, chunk by chunk:
+compressed bodies are never held in memory. It decodes ``gzip``, and ``br``
+and ``zstd`` when the ``brotli`` and ``backports.zstd`` packages are
+installed, or Python 3.14+ for the latter.
+"""
+
+from collections import Counter, namedtuple
+import gzip
+from http.client import HTTPResponse
+from io import BytesIO
+import threading
+import weakref
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+#: Encodings accepted for responses, by order of preference
+ENCODINGS = ("zstd", "br", "gzip")
+
+#: Compression level of the request bodies
+REQUEST_LEVEL = 6
+
+#: Bytes transferred by a call, as given to the ``on_transfer`` callback of
+#: :py:class:`Compression`. ``wire_bytes`` are the bytes of the response body
+#: as received, chunked framing included, ``decoded_bytes`` once decompressed. ``request_wire_bytes``
+#: is the size of the request body as sent.
+Transfer = namedtuple(
+    "Transfer", ["method", "url", "status", "encoding", "wire_bytes", "decoded_bytes", "request_wire_bytes"]
+)
+
+
+def supported_encodings():
+    """
+    Encodings of :py:data:`ENCODINGS` that can be decoded in this environment.
+
+    :rtype: tuple
+    """
+    decodable = ACCEPT_ENCODING.split(",")
+    return tuple(encoding for encoding in ENCODINGS if encoding in decodable)
+
+
+class _CountingReader:
+    """
+    Socket file of an HTTP/1.1 response, counting the bytes of the body read
+    from it, whatever the framing of the body.
+    """
+
+    def __init__(self, fp):
+        self._fp = fp
+        self.bytes_read = 0
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def read(self, *args):
+        data = self._fp.read(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def read1(self, *args):
+        data = self._fp.read1(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self._fp.readline(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        size = self._fp.readinto(buffer)
+        self.bytes_read += size or 0
+        return size
+
+    def readinto1(self, buffer):
+        size = self._fp.readinto1(buffer)
+        self.bytes_read += size or 0
+        return size
+
+
+class Compression:
+    """
+    Compression settings of the requests of a client.
+
+    :py:attr:`Compression.stats` counts the ``responses``, their
+    ``wire_bytes`` and ``decoded_bytes``, the ``request_wire_bytes`` sent, and
+    the ``compressed_requests``.
+    """
+
+    def __init__(self, encodings=None, request_min_size=None, request_level=REQUEST_LEVEL, on_transfer=None):
+        """
+        :param encodings: accepted encodings of the responses, by order of
+            preference. Defaults to the supported ones of
+            :py:data:`ENCODINGS`. An empty list asks for uncompressed responses.
+        :param int request_min_size: minimum size, in bytes, of the request
+            bodies to compress with ``gzip``. Disabled by default: the API
+            must support compressed request bodies.
+        :param int request_level: ``gzip`` compression level of the request
+            bodies, from 1 (fastest) to 9 (smallest)
+        :param on_transfer: called with a :py:class:`Transfer` after each call
+        :raises ValueError: if one of ``encodings`` can't be decoded
+        """
+        if encodings is None:
+            encodings = supported_encodings()
+        unsupported = set(encodings) - set(supported_encodings())
+        if unsupported:
+            raise ValueError(
+                "Unsupported encodings %s, supported encodings: %s"
+                % (", ".join(sorted(unsupported)), ", ".join(supported_encodings()))
+            )
+        self.encodings = tuple(encodings)
+        self.accept_encoding = ", ".join(self.encodings) or "identity"
+        self.request_min_size = request_min_size
+        self.request_level = request_level
+        self.on_transfer = on_transfer
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._readers = weakref.WeakKeyDictionary()
+
+    def compress(self, headers, body):
+        """
+        Set the ``Accept-Encoding`` header of a request, and compress its body
+        if it is large enough. The signature of the request must already be
+        computed: it covers the uncompressed body.
+
+        :param dict headers: headers of the request, updated in place
+        :param body: serialized request body
+        :type body: str or bytes
+        :returns: body to send
+        """
+        headers["Accept-Encoding"] = self.accept_encoding
+        if self.request_min_size is None or not body or len(body) < self.request_min_size:
+            return body
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers["Content-Encoding"] = "gzip"
+        with self._lock:
+            self.stats["compressed_requests"] += 1
+        # gzip.compress only takes mtime from Python 3.8
+        compressed = BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode="wb", compresslevel=self.request_level, mtime=0) as f:
+            f.write(body)
+        return compressed.getvalue()
+
+    def watch(self, response):
+        """
+        Count the bytes of the body of a response as they are read from the
+        connection. ``urllib3`` only counts them when the response has a
+        ``Content-Length``, not when its body is chunked.
+
+        :param response: ``requests.Response`` object, whose body is not read
+            yet
+        """
+        original = getattr(response.raw, "_fp", None)
+        if isinstance(original, HTTPResponse) and original.fp is not None:
+            original.fp = reader = _CountingReader(original.fp)
+            with self._lock:
+                self._readers[response] = reader
+
+    def record(self, response, decoded_bytes):
+        """
+        Account for the bytes of a response body, once fully read.
+
+        :param response: ``requests.Response`` object
+        :param int decoded_bytes: size of the decompressed body
+        :returns: the bytes transferred by the call
+        :rtype: Transfer
+        """
+        # bytes actually read from the connection, before decompression
+        with self._lock:
+            reader = self._readers.pop(response, None)
+        wire_bytes = response.raw.tell() if reader is None else reader.bytes_read
+
+        request = response.request
+        transfer = Transfer(
+            request.method,
+            response.url,
+            response.status_code,
+            response.headers.get("Content-Encoding", "identity"),
+            wire_bytes,
+            decoded_bytes,
+            len(request.body or b""),
+        )
+        with self._lock:
+            self.stats["responses"] += 1
+            self.stats["wire_bytes"] += wire_bytes
+            self.stats["decoded_bytes"] += decoded_bytes
+            self.stats["request_wire_bytes"] += transfer.request_wire_bytes
+        if self.on_transfer is not None:
+            self.on_transfer(transfer)
+        return transfer
@@ -0,0 +1,308 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides :py:class:`HTTP2Adapter`, a ``requests`` transport
+adapter multiplexing the requests of a :py:class:`ovh.Client` over a few
+HTTP/2 connections per host, rather than opening one HTTP/1.1 connection per
+concurrent request. Install it with ``pip install ovh[http2]``:
+
+.. code:: python
+
+    import ovh
+    from ovh.http2 import HTTP2Adapter
+
+    client = ovh.Client(http2=True)
+
+    # or, to tune the connections
+    client = ovh.Client(adapter=HTTP2Adapter(max_connections=2, max_streams=50))
+
+    # ... from many threads
+    client.get('/me')
+
+Hosts that do not negotiate HTTP/2 are transparently served over HTTP/1.1.
+"""
+
+from collections import Counter, defaultdict
+import threading
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ChunkedEncodingError, ConnectionError, ConnectTimeout, ReadTimeout
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util import parse_url
+
+from ._fork import register_after_fork
+
+#: Default maximum number of HTTP/2 connections per host
+MAX_CONNECTIONS = 4
+
+#: Default maximum number of concurrent requests per HTTP/2 connection. The
+#: server may advertise a lower limit.
+MAX_STREAMS = 100
+
+# Connection-specific headers, forbidden in HTTP/2
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade", "te"}
+
+
+class _Connection:
+    """HTTP/2 connection to a host, and the number of requests it carries"""
+
+    def __init__(self, client):
+        self.client = client
+        self.streams = 0
+
+
+class _Body:
+    """
+    Body of a response received over HTTP/2, read by ``requests`` the way it
+    reads ``urllib3`` responses. The stream is released once the body is fully
+    read, or the response closed.
+    """
+
+    def __init__(self, response, release):
+        self._response = response
+        self._release = release
+
+    def stream(self, amt=None, decode_content=True):
+        try:
+            for chunk in self._response.iter_bytes(amt):
+                yield chunk
+        except httpx.TransportError as error:
+            raise ChunkedEncodingError(error)
+        finally:
+            self.close()
+
+    def read(self, amt=None, decode_content=True, cache_content=False):
+        return b"".join(self.stream(amt))
+
+    def tell(self):
+        """Number of bytes of the body received over the wire"""
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+    def release_conn(self):
+        self.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter sending requests over HTTP/2 with ``httpx``. Each host
+    gets up to ``max_connections`` connections, each carrying at most
+    ``max_streams`` concurrent requests: a new connection is only opened when
+    all the others are full, and requests wait when all of them are.
+
+    Hosts that only speak HTTP/1.1 are detected on their first response, and
+    then served by a regular ``requests`` adapter.
+
+    :py:attr:`HTTP2Adapter.stats` counts the ``connections`` opened, the
+    ``requests`` sent over HTTP/2, the ``waits`` for a free stream and the
+    ``fallbacks`` to HTTP/1.1.
+    """
+
+    def __init__(
+        self, max_connections=MAX_CONNECTIONS, max_streams=MAX_STREAMS, verify=True, prior_knowledge=False, proxy=None
+    ):
+        """
+        :param int max_connections: maximum number of HTTP/2 connections per
+            host
+        :param int max_streams: maximum number of concurrent requests per
+            connection
+        :param verify: whether to check the certificates of the hosts, or the
+            path of the CA bundle to check them against
+        :param bool prior_knowledge: if True, speak HTTP/2 to plain ``http``
+            hosts without negotiation. Otherwise only ``https`` hosts are
+            reached over HTTP/2.
+        :param str proxy: URL of the proxy to send the requests through, with
+            its credentials if any
+        :raises ImportError: if ``httpx`` or ``h2`` are not installed
+        """
+        if httpx is None:
+            raise ImportError("HTTP2Adapter requires httpx and h2, install them with 'pip install ovh[http2]'")
+        super().__init__()
+        self.max_connections = max_connections
+        self.max_streams = max_streams
+        self.verify = verify
+        self.prior_knowledge = prior_knowledge
+        self.proxy = proxy
+        self.stats = Counter()
+        self._init_state()
+        register_after_fork(self)
+
+    def _init_state(self):
+        self._connections = defaultdict(list)
+        self._http1_hosts = set()
+        self._fallback = HTTPAdapter()
+        self._condition = threading.Condition()
+
+    def _after_fork(self):
+        # the connections of the parent process can't be used by the child
+        self._init_state()
+
+    def __getstate__(self):
+        return {
+            "max_connections": self.max_connections,
+            "max_streams": self.max_streams,
+            "verify": self.verify,
+            "prior_knowledge": self.prior_knowledge,
+            "proxy": self.proxy,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """
+        Send a prepared request, see ``requests.adapters.BaseAdapter.send``.
+        The ``verify``, ``cert`` and ``proxies`` settings of the session are
+        ignored, in favor of those of the adapter.
+
+        :rtype: requests.Response
+        """
+        url = parse_url(request.url)
+        host = (url.scheme, url.host, url.port)
+        if host in self._http1_hosts or (url.scheme == "http" and not self.prior_knowledge):
+            return self._fallback.send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+
+        connection = self._acquire(host)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._release(host, connection)
+
+        try:
+            h2_response = connection.client.send(self._build_request(connection.client, request, timeout), stream=True)
+        except httpx.TimeoutException as error:
+            release()
+            if isinstance(error, httpx.ConnectTimeout):
+                raise ConnectTimeout(error, request=request)
+            raise ReadTimeout(error, request=request)
+        except httpx.TransportError as error:
+            release()
+            raise ConnectionError(error, request=request)
+        except BaseException:
+            release()
+            raise
+
+        # the host does not speak HTTP/2: use HTTP/1.1 from now on
+        if h2_response.http_version != "HTTP/2":
+            with self._condition:
+                self._http1_hosts.add(host)
+                self.stats["fallbacks"] += 1
+
+        return self._build_response(request, h2_response, release)
+
+    def _acquire(self, host):
+        """
+        Reserve a stream on the least busy connection to ``host``, opening a
+        new connection only if all the others are full.
+        """
+        with self._condition:
+            while True:
+                connections = self._connections[host]
+                available = [connection for connection in connections if connection.streams < self.max_streams]
+                if available:
+                    connection = min(available, key=lambda connection: connection.streams)
+                    break
+                if len(connections) < self.max_connections:
+                    connection = _Connection(self._new_client())
+                    connections.append(connection)
+                    self.stats["connections"] += 1
+                    break
+                self.stats["waits"] += 1
+                self._condition.wait()
+            connection.streams += 1
+            self.stats["requests"] += 1
+            return connection
+
+    def _release(self, host, connection):
+        with self._condition:
+            connection.streams -= 1
+            self._condition.notify()
+
+    def _new_client(self):
+        """One ``httpx`` client per connection, so that the streams per connection are bounded"""
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        return httpx.Client(
+            http1=not self.prior_knowledge,
+            http2=True,
+            limits=limits,
+            verify=self.verify,
+            proxy=self.proxy,
+            timeout=None,
+            trust_env=False,
+        )
+
+    def _build_request(self, client, request, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        else:
+            timeout = httpx.Timeout(timeout)
+        headers = [(name, value) for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS]
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return client.build_request(request.method, request.url, headers=headers, content=body, timeout=timeout)
+
+    def _build_response(self, request, h2_response, release):
+        response = Response()
+        response.status_code = h2_response.status_code
+        response.headers = CaseInsensitiveDict(h2_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _Body(h2_response, release)
+        response.reason = h2_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """
+        Close all the connections.
+        """
+        with self._condition:
+            connections = [connection for host in self._connections.values() for connection in host]
+            self._connections.clear()
+        for connection in connections:
+            connection.client.close()
+        self._fallback.close()
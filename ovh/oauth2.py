@@ -28,17 +28,32 @@
 Thanks to https://github.com/requests/requests-oauthlib/issues/260 for the base used in this file.
 """
 
+import asyncio
+import base64
+import threading
+import time
+
 from oauthlib.oauth2 import BackendApplicationClient, MissingTokenError, OAuth2Error, TokenExpiredError
 from requests_oauthlib import OAuth2Session
 
 from .exceptions import OAuth2FailureError
 
 
+def token_error_detail(status_code, text):
+    """Describe why a token creation response could not be used, if it looks like a failure"""
+    if 200 <= status_code <= 299:
+        return "Received invalid body: " + text
+    if status_code >= 400:
+        return "Token creation failed with status_code={}, body={}".format(status_code, text)
+    return None
+
+
 class RefreshOAuth2Session(OAuth2Session):
     _error = None
 
     def __init__(self, token_url, **kwargs):
         self.token_url = token_url
+        self._refresh_lock = threading.Lock()
         super().__init__(**kwargs)
 
         # This hijacks the hook mechanism to save details about the last token creation failure.
@@ -49,10 +64,7 @@ class RefreshOAuth2Session(OAuth2Session):
 
     # See __init__, used as compliance hooks
     def save_error(self, resp):
-        if 200 <= resp.status_code <= 299:
-            self._error = "Received invalid body: " + resp.text
-        if resp.status_code >= 400:
-            self._error = "Token creation failed with status_code={}, body={}".format(resp.status_code, resp.text)
+        self._error = token_error_detail(resp.status_code, resp.text)
         return resp
 
     # Wraps OAuth2Session.fetch_token to enrich returned exception messages, wrapped in an unique class
@@ -70,30 +82,91 @@ class RefreshOAuth2Session(OAuth2Session):
 
     # Wraps OAuth2Session.request to handle TokenExpiredError by fetching a new token and retrying
     def request(self, *args, **kwargs):
+        token = self.token
         try:
             return super().request(*args, **kwargs)
         except TokenExpiredError:
-            self.token = self.fetch_token(token_url=self.token_url, **self.auto_refresh_kwargs)
-            self.token_updater(self.token)
+            self._refresh_token(token)
             return super().request(*args, **kwargs)
 
+    def add_token(self, method, url, headers, body):
+        """
+        Inject the ``Authorization`` header of the token in ``headers``,
+        fetching a new token first if it expired.
+
+        :returns: tuple of the URL, headers and body to send
+        """
+        token = self.token
+        try:
+            return self._client.add_token(url, http_method=method, body=body, headers=headers)
+        except TokenExpiredError:
+            self._refresh_token(token)
+            return self._client.add_token(url, http_method=method, body=body, headers=headers)
+
+    def _refresh_token(self, token):
+        with self._refresh_lock:
+            # another thread may have fetched a new token meanwhile
+            if self.token is token:
+                self.token = self.fetch_token(token_url=self.token_url, **self.auto_refresh_kwargs)
+                self.token_updater(self.token)
+
+
+class _TokenHolder:
+    """Holder of an OAuth2 token, shared by the sync and async flavors"""
 
-class OAuth2:
-    _session = None
     _token = None
 
-    def __init__(self, client_id, client_secret, token_url):
+    def _has_valid_token(self):
+        if self._token is None:
+            return False
+        expires_at = self._token.get("expires_at")
+        return expires_at is None or expires_at > time.time()
+
+
+class OAuth2(_TokenHolder):
+    _session = None
+
+    def __init__(self, client_id, client_secret, token_url, adapter_factory=None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.token_url = token_url
+        # builds the transport adapters mounted on the session, to size its connection pool
+        self.adapter_factory = adapter_factory
+        # the session and the first token are created only once, even when shared between threads
+        self._lock = threading.RLock()
 
     def token_updater(self, token):
         self._token = token
 
+    def _after_fork(self):
+        # never share the connections of the session with the parent process
+        self._session = None
+        self._lock = threading.RLock()
+
+    # Only carry the credentials and a still valid token, the session is rebuilt on first use
+    def __getstate__(self):
+        return {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "token_url": self.token_url,
+            "adapter_factory": self.adapter_factory,
+            "token": self._token if self._has_valid_token() else None,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["client_id"], state["client_secret"], state["token_url"], state["adapter_factory"])
+        self._token = state["token"]
+
     @property
     def session(self):
-        if self._session is None:
-            self._session = RefreshOAuth2Session(
+        if self._session is not None:
+            return self._session
+
+        with self._lock:
+            if self._session is not None:
+                return self._session
+
+            session = RefreshOAuth2Session(
                 token_url=self.token_url,
                 client=BackendApplicationClient(
                     client_id=self.client_id,
@@ -106,20 +179,115 @@ class OAuth2:
                     "client_secret": self.client_secret,
                 },
             )
+            if self.adapter_factory is not None:
+                session.mount("https://", self.adapter_factory())
+                session.mount("http://", self.adapter_factory())
+            self._session = session
         return self._session
 
+    def add_token(self, method, url, headers, body):
+        """
+        Inject the ``Authorization`` header in ``headers``, fetching a token
+        first if there is none yet or if it expired.
+
+        :returns: tuple of the URL, headers and body to send
+        """
+        return self.session.add_token(method, url, headers, body)
+
     @property
     def token(self):
-        if self._token is None:
-            self._token = RefreshOAuth2Session(
-                token_url=self.token_url,
-                client=BackendApplicationClient(
+        if self._token is not None:
+            return self._token
+
+        with self._lock:
+            if self._token is None:
+                self._token = RefreshOAuth2Session(
+                    token_url=self.token_url,
+                    client=BackendApplicationClient(
+                        client_id=self.client_id,
+                        scope=["all"],
+                    ),
+                ).fetch_token(
+                    token_url=self.token_url,
                     client_id=self.client_id,
-                    scope=["all"],
-                ),
-            ).fetch_token(
-                token_url=self.token_url,
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-            )
+                    client_secret=self.client_secret,
+                )
         return self._token
+
+
+class AsyncOAuth2(_TokenHolder):
+    """
+    Asynchronous counterpart of :py:class:`OAuth2`, fetching its token through
+    an ``aiohttp`` session. The token is fetched once, and only once, even when
+    many coroutines need it at the same time.
+    """
+
+    def __init__(self, client_id, client_secret, token_url):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self._client = BackendApplicationClient(client_id=client_id, scope=["all"])
+        self._token = None
+        self._lock = None
+
+    def _after_fork(self):
+        # the lock belongs to the event loop of the parent process
+        self._lock = None
+
+    def __getstate__(self):
+        return {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "token_url": self.token_url,
+            "token": self._token if self._has_valid_token() else None,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["client_id"], state["client_secret"], state["token_url"])
+        self._token = state["token"]
+
+    @property
+    def token(self):
+        return self._token
+
+    async def fetch_token(self, session):
+        """Fetch a new token, unless another coroutine got a valid one meanwhile"""
+        # the lock must be created from within the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._has_valid_token():
+                return self._token
+
+            credentials = "{}:{}".format(self.client_id, self.client_secret).encode("latin1")
+            headers = {
+                "Accept": "application/json",
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": "Basic " + base64.b64encode(credentials).decode("ascii"),
+            }
+            body = self._client.prepare_request_body(include_client_id=False)
+            async with session.post(self.token_url, headers=headers, data=body) as response:
+                status = response.status
+                text = await response.text()
+
+            try:
+                self._token = self._client.parse_request_body_response(text, scope=["all"])
+            except MissingTokenError as e:
+                desc = "OAuth2 failure: " + e.description
+                error = token_error_detail(status, text)
+                if error:
+                    desc += " " + error
+                raise OAuth2FailureError(desc) from e
+            except OAuth2Error as e:
+                raise OAuth2FailureError("OAuth2 failure: " + str(e)) from e
+            return self._token
+
+    async def add_token(self, session, method, url, headers, body):
+        """
+        Inject the ``Authorization`` header in ``headers``, fetching a new token
+        first if there is none yet or if it expired.
+        """
+        if not self._has_valid_token():
+            await self.fetch_token(session)
+        return self._client.add_token(url, http_method=method, body=body, headers=headers)
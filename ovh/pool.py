@@ -0,0 +1,259 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides :py:class:`ClientPool`, to manage many accounts at once.
+Building a :py:class:`ovh.Client` per account reads the configuration files
+and opens connections for each of them. Clients handed out by a pool instead
+share a single parsed configuration, a single bounded pool of connections and
+a single time delta per endpoint:
+
+.. code:: python
+
+    from ovh.pool import ClientPool
+
+    pool = ClientPool("ovh-eu", pool_maxsize=32)
+    for consumer_key in consumer_keys:
+        client = pool.client(consumer_key)
+        print(client.get("/me"))
+"""
+
+import threading
+
+from requests.adapters import HTTPAdapter
+from requests.utils import select_proxy
+
+from . import config
+from ._fork import register_after_fork
+from .client import ENDPOINTS, POOL_CONNECTIONS, TIMEOUT, Client
+from .transport import Urllib3Transport, resolve_environment
+
+#: Default maximum number of connections per host, shared by all the clients
+#: of a pool
+POOL_MAXSIZE = 32
+
+
+class _SharedTimeDeltas:
+    """
+    Time deltas of the endpoints of a pool, by URL, shared by its clients as
+    their ``time_delta_cache``. A client syncing its time delta again, after
+    a call was rejected because of its timestamp, updates it for the clients
+    built next. Backed by the ``time_delta_cache`` option of the pool, if any.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._time_deltas = {}
+
+    def get(self, endpoint):
+        time_delta = self._time_deltas.get(endpoint)
+        if time_delta is None and self.cache is not None:
+            time_delta = self.cache.get(endpoint)
+            if time_delta is not None:
+                self._time_deltas[endpoint] = time_delta
+        return time_delta
+
+    def set(self, endpoint, time_delta):
+        self._time_deltas[endpoint] = time_delta
+        return self.cache is None or self.cache.set(endpoint, time_delta)
+
+
+class ClientPool:
+    """
+    Factory of lightweight :py:class:`ovh.Client` instances, one per set of
+    credentials, all backed by the same transport.
+
+    The connections to each host are bounded by ``pool_maxsize``: when all
+    of them are in use, calls wait for one to be released. The time delta of
+    an endpoint is queried once, when the first client using the application
+    key authentication method is built for it. When a client syncs it again,
+    the clients built next get the new one.
+    """
+
+    def __init__(
+        self,
+        endpoint=None,
+        application_key=None,
+        application_secret=None,
+        config_file=None,
+        timeout=TIMEOUT,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=True,
+        **options,
+    ):
+        """
+        The configuration, see :py:mod:`ovh.config`, is read once. It provides
+        the defaults of the parameters of the clients.
+
+        :param str endpoint: default API endpoint of the clients
+        :param str application_key: default application key of the clients
+        :param str application_secret: default application secret of the
+            clients
+        :param str config_file: configuration file to read, on top of the
+            standard ones
+        :param timeout: timeout of the requests, see :py:class:`ovh.Client`
+        :param int pool_connections: number of per host connection pools
+        :param int pool_maxsize: maximum number of connections per host
+        :param bool pool_block: whether to wait for a connection when all of
+            them are in use. Otherwise extra connections are opened, and
+            discarded after use.
+        :param options: other parameters given to every client, such as
+            ``cache``, ``retry`` or ``rate_limiter``. They are shared by all
+            the clients. With ``http2=True``, the clients share a single
+            :py:class:`ovh.http2.HTTP2Adapter`, and the ``pool_*`` parameters
+            do not apply. A ``time_delta_cache`` backs the time deltas shared
+            by the clients. With ``trust_env="once"``, the shared HTTP/2
+            adapter or urllib3 transport use the proxy and the CA bundle of
+            the environment of the default endpoint, read once.
+        """
+        self.configuration = config.ConfigurationManager()
+        if config_file is not None:
+            self.configuration.read(config_file)
+
+        self.endpoint = endpoint
+        self.application_key = application_key
+        self.application_secret = application_secret
+        self.timeout = timeout
+        self.options = options
+
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._environment_settings = self._read_environment()
+        self.adapter = self._new_adapter()
+
+        # the clients share the connections of a urllib3 transport too
+        if options.get("transport") == "urllib3":
+            options["transport"] = Urllib3Transport(
+                pool_connections, pool_maxsize, pool_block, **self._environment_settings
+            )
+
+        self._time_deltas = _SharedTimeDeltas(options.pop("time_delta_cache", None))
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _read_environment(self):
+        """
+        Settings of the shared connections read from the environment, when
+        the clients only read it once: the CA bundle and the proxy of the
+        default endpoint. Otherwise, the HTTP/2 adapter and the urllib3
+        transport use their defaults.
+        """
+        endpoint = self.endpoint or self.configuration.get("default", "endpoint")
+        if self.options.get("trust_env") != "once" or endpoint is None:
+            return {}
+        url = ENDPOINTS.get(endpoint, endpoint)
+        environment = resolve_environment(url)
+        return {"verify": environment.verify, "proxy": select_proxy(url, environment.proxies)}
+
+    def _new_adapter(self):
+        # the clients multiplex their requests over the same HTTP/2 connections
+        if self.options.get("http2"):
+            from .http2 import HTTP2Adapter
+
+            return HTTP2Adapter(**self._environment_settings)
+        return HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+        )
+
+    def _after_fork(self):
+        # the child process must open its own connections. Clients keep a
+        # reference to the adapter, so reset its pools in place. The HTTP/2
+        # adapter resets its own.
+        if isinstance(self.adapter, HTTPAdapter):
+            self.adapter.init_poolmanager(self._pool_connections, self._pool_maxsize, block=self._pool_block)
+        if isinstance(self.options.get("transport"), Urllib3Transport):
+            self.options["transport"].after_fork()
+        self._lock = threading.Lock()
+
+    def client(
+        self,
+        consumer_key=None,
+        endpoint=None,
+        application_key=None,
+        application_secret=None,
+        client_id=None,
+        client_secret=None,
+    ):
+        """
+        Build a client backed by the transport of this pool. Missing parameters
+        default to those of the pool, then to the configuration.
+
+        :param str consumer_key: consumer key of the account
+        :param str endpoint: API endpoint to use
+        :param str application_key: application key
+        :param str application_secret: application secret
+        :param str client_id: OAuth2 client ID, instead of the application
+            key and secret
+        :param str client_secret: OAuth2 client secret
+        :rtype: ovh.Client
+        :raises InvalidRegion: if ``endpoint`` can't be found in
+            ``ENDPOINTS``
+        """
+        if endpoint is None:
+            endpoint = self.endpoint
+        if endpoint is None:
+            endpoint = self.configuration.get("default", "endpoint")
+
+        # an OAuth2 client does not use application keys
+        if client_id is None:
+            if application_key is None:
+                application_key = self.application_key
+            if application_secret is None:
+                application_secret = self.application_secret
+
+        client = Client(
+            endpoint=endpoint,
+            application_key=application_key,
+            application_secret=application_secret,
+            consumer_key=consumer_key,
+            timeout=self.timeout,
+            client_id=client_id,
+            client_secret=client_secret,
+            configuration=self.configuration,
+            adapter=self.adapter,
+            time_delta_cache=self._time_deltas,
+            **self.options,
+        )
+
+        if client._oauth2 is None:
+            client._time_delta = self._time_delta(client)
+        return client
+
+    def _time_delta(self, client):
+        """
+        Time delta of the endpoint of ``client``. It is queried through it,
+        and saved into the shared time deltas, when none of the clients of the
+        pool got it yet.
+        """
+        time_delta = self._time_deltas.get(client._endpoint)
+        if time_delta is None:
+            with self._lock:
+                time_delta = client.time_delta
+        return time_delta
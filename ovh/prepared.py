@@ -0,0 +1,134 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides prepared calls, built by :py:func:`ovh.Client.prepare`,
+for routes called over and over, such as in polling loops. Everything that
+does not depend on the time of the call is computed once: the target URL, the
+serialized body, the headers and the hash of the constant prefix of the
+signature. Each execution then only hashes the timestamp, and sends:
+
+.. code:: python
+
+    import ovh
+
+    client = ovh.Client()
+    task_status = client.prepare("GET", "/me/task/domain/1234")
+    while task_status()["status"] != "done":
+        time.sleep(1)
+"""
+
+import hashlib
+import time
+
+
+class PreparedCall:
+    """
+    A call prepared by :py:func:`ovh.Client.prepare`. It behaves as
+    :py:func:`ovh.Client.call`, retries, time delta resync and rate limiting
+    included, except that it never goes through the cache nor the coalescing
+    of the client.
+
+    The credentials of the client are captured when the call is prepared.
+    """
+
+    def __init__(self, client, method, path, data=None, need_auth=True, headers=None):
+        """
+        :param ovh.Client client: client sending the call
+        :param str method: HTTP verb. Usually one of GET, POST, PUT, DELETE
+        :param str path: api entrypoint to call, relative to endpoint base path
+        :param data: any json serializable data to send as request's body
+        :param boolean need_auth: if False, bypass signature
+        :param dict headers: extra headers to send, see
+            :py:func:`ovh.Client.raw_call`
+        :raises InvalidKey: if the call is signed and the application secret
+            or the consumer key is missing
+        """
+        self.client = client
+        self.method = method
+        self.need_auth = need_auth
+        self.target = client._get_target(path)
+
+        self.headers = dict(headers) if headers else {}
+        self.body = b""
+        if data is not None:
+            self.headers["Content-type"] = "application/json"
+            self.body = client._json_codec.dumps(data).encode("utf-8")
+
+        self._signature = None
+        if need_auth and client._oauth2 is None:
+            client._check_credentials()
+            self.headers["X-Ovh-Consumer"] = client._consumer_key
+            prefix = "+".join([client._application_secret, client._consumer_key, method.upper(), self.target, ""])
+            self._signature = hashlib.sha1(prefix.encode("utf-8") + self.body + b"+")
+        if not (need_auth and client._oauth2):
+            self.headers["X-Ovh-Application"] = client._application_key
+
+        # compressed once, after the signature prefix that covers the raw body
+        if client._compression is not None:
+            self.body = client._compression.compress(self.headers, self.body)
+
+        self._rate_limit_key = client._rate_limit_key() if client._rate_limiter is not None else None
+
+    def __call__(self):
+        """
+        Send the call.
+
+        :raises HTTPError: when underlying request failed for network reason
+        :raises InvalidResponse: when API response could not be decoded
+        :returns: the decoded response
+        """
+        client = self.client
+        try:
+            return client._send(self.method, self.need_auth, self.raw_call)[0]
+        finally:
+            if client._cache is not None and self.method.upper() != "GET":
+                client._cache.invalidate(self.target)
+
+    def raw_call(self):
+        """
+        Sign and send the call, see :py:func:`ovh.Client.raw_call`.
+
+        :returns: the ``requests.Response`` object
+        """
+        client = self.client
+        headers = self.headers.copy()
+
+        # wait for a token before signing, so that the timestamp stays accurate
+        if client._rate_limiter is not None:
+            client._rate_limiter.acquire(self._rate_limit_key)
+
+        target, body = self.target, self.body
+        if self._signature is not None:
+            now = str(int(time.time()) + client.time_delta)
+            signature = self._signature.copy()
+            signature.update(now.encode("ascii"))
+            headers["X-Ovh-Timestamp"] = now
+            headers["X-Ovh-Signature"] = "$1$" + signature.hexdigest()
+        elif self.need_auth:
+            target, headers, body = client._oauth2.add_token(self.method, target, headers, body)
+
+        return client._transport_send(self.method, target, headers, body)
@@ -0,0 +1,274 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides a client-side rate limiter for :py:class:`ovh.Client`.
+Calls take a token from a bucket shared by all the clients using the same
+application key (or the same consumer key), waiting for one when the bucket is
+empty. When the API answers with a 429 status, the bucket is paused, so that
+every client sharing it backs off, not only the one that was throttled:
+
+.. code:: python
+
+    import ovh
+    from ovh.ratelimit import RateLimiter, SQLiteBucketStore
+
+    # 20 calls per second, with bursts of 40 calls, for all the processes of the host
+    limiter = RateLimiter(rate=20, burst=40, store=SQLiteBucketStore("/tmp/ovh-ratelimit.db"))
+    client = ovh.Client(rate_limiter=limiter)
+
+Buckets live in a :py:class:`BucketStore`: in memory for the threads of a
+process, in an SQLite database for the processes of a host, or in a networked
+key-value store for a whole cluster.
+"""
+
+from collections import Counter
+import json
+import threading
+import time
+
+from ._fork import register_after_fork
+from ._sqlite import ThreadConnections
+from .retry import parse_retry_after
+
+#: Key the buckets by application key
+PER_APPLICATION = "application"
+
+#: Key the buckets by consumer key
+PER_CONSUMER = "consumer"
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter. Tokens are added at ``rate`` per second, up to
+    ``burst`` tokens, and each call takes one.
+
+    :py:attr:`RateLimiter.stats` counts the tokens ``acquired``, the attempts
+    to take one that had to wait (``waits``) and the ``throttled`` calls,
+    answered with a 429 status.
+    """
+
+    def __init__(self, rate, burst=None, store=None, per=PER_APPLICATION, pause=1):
+        """
+        :param float rate: calls allowed per second
+        :param float burst: maximum number of calls made at once, ``rate`` by
+            default
+        :param BucketStore store: where the buckets live, a new
+            :py:class:`MemoryBucketStore` by default. Limiters sharing a
+            store must use the same ``rate`` and ``burst``.
+        :param str per: :py:data:`PER_APPLICATION` to share a bucket between
+            all the consumer keys of an application key, or
+            :py:data:`PER_CONSUMER` for a bucket per consumer key
+        :param float pause: how long to pause a bucket on a 429 status without
+            a ``Retry-After`` header, in seconds
+        :raises ValueError: if ``rate`` is not positive or ``per`` is unknown
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive, got %r" % rate)
+        if per not in (PER_APPLICATION, PER_CONSUMER):
+            raise ValueError("Unknown rate limiter key %r" % per)
+
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.store = store if store is not None else MemoryBucketStore()
+        self.per = per
+        self.pause = pause
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Release the lock, possibly held by a thread of the parent process"""
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key):
+        """
+        Take a token from a bucket, if one is available.
+
+        :param str key: key of the bucket
+        :returns: ``0`` if a token was taken, otherwise how long to wait before
+            trying again, in seconds
+        :rtype: float
+        """
+        delay = self.store.update(key, self._take)
+        self._count("waits" if delay else "acquired")
+        return delay
+
+    def acquire(self, key):
+        """
+        Take a token from a bucket, waiting for one if needed.
+
+        :param str key: key of the bucket
+        """
+        delay = self.try_acquire(key)
+        while delay:
+            time.sleep(delay)
+            delay = self.try_acquire(key)
+
+    def throttled(self, key, response):
+        """
+        Pause a bucket after a 429 status, for the ``Retry-After`` delay if
+        any, :py:attr:`pause` seconds otherwise.
+
+        :param str key: key of the bucket
+        :param response: the throttled response
+        """
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = self.pause
+        self._count("throttled")
+        self.store.update(key, lambda bucket, now: self._pause(bucket, now, delay))
+
+    def _refill(self, bucket, now):
+        if bucket is None:
+            return [self.burst, now, 0]
+        # no token is added while the bucket is paused
+        tokens, updated_at, paused_until = bucket
+        elapsed = max(0, now - max(updated_at, paused_until))
+        return [min(self.burst, tokens + elapsed * self.rate), now, paused_until]
+
+    def _take(self, bucket, now):
+        bucket = self._refill(bucket, now)
+        if now < bucket[2]:
+            return bucket, bucket[2] - now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return bucket, 0
+        return bucket, (1 - bucket[0]) / self.rate
+
+    def _pause(self, bucket, now, delay):
+        bucket = self._refill(bucket, now)
+        bucket[0] = 0
+        bucket[2] = max(bucket[2], now + delay)
+        return bucket, None
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class BucketStore:
+    """
+    Interface of the storage of the buckets of a :py:class:`RateLimiter`.
+
+    A bucket is a list of JSON serializable values, or ``None`` if it does not
+    exist yet. Stores only need to apply updates atomically.
+    """
+
+    def update(self, key, function):
+        """
+        Atomically replace a bucket by ``function(bucket, now)[0]``.
+
+        :param str key: key of the bucket
+        :param function: called with the current bucket and the current time,
+            returns the new bucket and a result
+        :returns: the result of ``function``
+        """
+        raise NotImplementedError()
+
+
+class MemoryBucketStore(BucketStore):
+    """Store shared by the threads of a process"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Release the lock, possibly held by a thread of the parent process"""
+        self._lock = threading.Lock()
+
+    def update(self, key, function):
+        with self._lock:
+            self._buckets[key], result = function(self._buckets.get(key), time.time())
+        return result
+
+
+class SQLiteBucketStore(BucketStore):
+    """
+    Store backed by an SQLite database file, shared by all the threads and
+    processes of a host. Updates hold the database write lock, so they are
+    serialized between processes.
+    """
+
+    def __init__(self, path, timeout=5):
+        """
+        :param str path: path of the database file, created if needed
+        :param float timeout: how long to wait for a lock held by another
+            process, in seconds
+        """
+        self.path = path
+        self.timeout = timeout
+        self._connection = ThreadConnections(path, timeout)
+
+        self._connection().execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, bucket TEXT NOT NULL)")
+
+    def update(self, key, function):
+        db = self._connection()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT bucket FROM buckets WHERE key = ?", (key,)).fetchone()
+            bucket, result = function(None if row is None else json.loads(row[0]), time.time())
+            db.execute("INSERT OR REPLACE INTO buckets (key, bucket) VALUES (?, ?)", (key, json.dumps(bucket)))
+        return result
+
+
+class RemoteBucketStore(BucketStore):
+    """
+    Store backed by a networked key-value store, to share buckets between
+    hosts. ``client`` must provide the following subset of the ``redis-py``
+    API, so that a ``redis.Redis`` instance can be used as is:
+
+    - ``get(name)``, returning ``bytes`` or ``None``
+    - ``set(name, value, ex=None)``, ``ex`` being a time to live in seconds
+    - ``lock(name, timeout=None, blocking_timeout=None)``, returning a
+      distributed lock usable as a context manager
+
+    The clocks of the hosts should be synchronized, as buckets are refilled
+    according to the local time.
+    """
+
+    def __init__(self, client, prefix="ovh:ratelimit:", ttl=3600, lock_timeout=5):
+        """
+        :param client: remote store client, see above
+        :param str prefix: prefix of the remote keys
+        :param int ttl: how long unused buckets are kept, in seconds
+        :param float lock_timeout: how long the lock of a bucket may be held,
+            and how long to wait for it, in seconds
+        """
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    def update(self, key, function):
+        name = self.prefix + key
+        with self.client.lock(name + ":lock", timeout=self.lock_timeout, blocking_timeout=self.lock_timeout):
+            raw = self.client.get(name)
+            bucket, result = function(None if raw is None else json.loads(raw), time.time())
+            self.client.set(name, json.dumps(bucket).encode("utf-8"), ex=self.ttl)
+        return result
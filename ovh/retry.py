@@ -0,0 +1,221 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides a retry policy for :py:class:`ovh.Client`. Failed calls
+are retried with an exponential backoff and full jitter, honoring the
+``Retry-After`` header, within a retry budget that prevents retries from
+amplifying an API brownout:
+
+.. code:: python
+
+    import ovh
+    from ovh.retry import RetryPolicy
+
+    client = ovh.Client(retry=RetryPolicy(max_attempts=4, backoff=0.5))
+
+Only idempotent methods are retried by default. Each attempt is signed again,
+with a fresh timestamp.
+"""
+
+from collections import Counter
+import email.utils
+import random
+import threading
+import time
+
+from ._fork import register_after_fork
+
+#: Methods retried by default: the idempotent ones
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+#: HTTP statuses retried by default
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryBudget:
+    """
+    Thread-safe budget bounding retries to a fraction of the calls made over a
+    sliding window, plus a small number of retries per second so that
+    low-traffic clients can still retry.
+    """
+
+    def __init__(self, ratio=0.1, min_per_second=1, window=10):
+        """
+        :param float ratio: maximum number of retries per call
+        :param float min_per_second: retries per second always allowed
+        :param int window: duration of the sliding window, in seconds
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        # per second counts of calls and retries
+        self._buckets = {}
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Release the lock, possibly held by a thread of the parent process"""
+        self._lock = threading.Lock()
+
+    def _bucket(self):
+        now = int(time.time())
+        for second in [second for second in self._buckets if second <= now - self.window]:
+            del self._buckets[second]
+        return self._buckets.setdefault(now, [0, 0])
+
+    def record_call(self):
+        """Record a first attempt, which deposits into the budget"""
+        with self._lock:
+            self._bucket()[0] += 1
+
+    def try_withdraw(self):
+        """
+        Withdraw a retry from the budget.
+
+        :returns: whether the budget allows a retry
+        """
+        with self._lock:
+            bucket = self._bucket()
+            calls = sum(calls for calls, _ in self._buckets.values())
+            retries = sum(retries for _, retries in self._buckets.values())
+            if retries >= self.ratio * calls + self.min_per_second * self.window:
+                return False
+            bucket[1] += 1
+            return True
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed call.
+
+    :py:attr:`RetryPolicy.stats` counts the ``retries`` made and the retries
+    denied by the budget (``budget_exhausted``).
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=0.5,
+        max_backoff=30,
+        methods=IDEMPOTENT_METHODS,
+        statuses=RETRY_STATUSES,
+        max_retry_after=60,
+        budget=None,
+    ):
+        """
+        :param int max_attempts: maximum number of attempts of a call, the
+            first one included
+        :param float backoff: base delay, in seconds. The delay before the
+            ``n``-th retry is drawn uniformly between ``0`` and
+            ``backoff * 2 ** (n - 1)``, capped to ``max_backoff``.
+        :param float max_backoff: maximum delay between two attempts
+        :param methods: HTTP methods that may be retried
+        :param statuses: HTTP statuses that may be retried. Network errors are
+            always retried.
+        :param float max_retry_after: maximum ``Retry-After`` delay honored.
+            When the API asks for a longer delay, the call is not retried.
+        :param RetryBudget budget: retry budget, a new :py:class:`RetryBudget`
+            by default. It may be shared between policies.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Release the lock, possibly held by a thread of the parent process"""
+        self._lock = threading.Lock()
+
+    def first_attempt(self):
+        """Record the first attempt of a call"""
+        self.budget.record_call()
+
+    def delay(self, method, attempt, response=None):
+        """
+        Delay before the next attempt of a failed call, or ``None`` if it must
+        not be retried.
+
+        :param str method: HTTP verb of the call
+        :param int attempt: number of attempts made so far
+        :param response: response of the failed attempt, ``None`` on network
+            errors
+        :returns: delay in seconds, or ``None``
+        :rtype: float
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        if response is not None:
+            if response.status_code not in self.statuses:
+                return None
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+
+        if not self.budget.try_withdraw():
+            self._count("budget_exhausted")
+            return None
+
+        self._count("retries")
+        return delay
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def parse_retry_after(value):
+    """
+    Parse a ``Retry-After`` header, either a number of seconds or an HTTP date.
+
+    :param str value: header value, possibly ``None``
+    :returns: delay in seconds, or ``None`` if missing or invalid
+    :rtype: float
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:  # pragma: no cover (python < 3.10)
+        return None
+    return max(0.0, date.timestamp() - time.time())
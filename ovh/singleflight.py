@@ -0,0 +1,120 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides request coalescing for :py:class:`ovh.Client`: while a
+'GET' call is in flight, identical calls wait for it and share its result,
+rather than sending duplicate requests.
+
+.. code:: python
+
+    import ovh
+    from ovh.singleflight import SingleFlight
+
+    flights = SingleFlight()
+    client = ovh.Client(coalesce=flights)
+
+    # ... from many threads
+    client.get('/me')
+
+    print(flights.stats)  # Counter({'calls': 1, 'coalesced': 63})
+"""
+
+from collections import Counter
+import threading
+
+from ._fork import register_after_fork
+from .exceptions import APIError
+
+
+class _Flight:
+    """Call in flight, and its outcome once it lands"""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of identical concurrent calls.
+
+    :py:attr:`SingleFlight.stats` counts the ``calls`` actually made and the
+    calls ``coalesced`` into them.
+    """
+
+    def __init__(self):
+        self.stats = Counter()
+        self._flights = {}
+        self._lock = threading.Lock()
+        register_after_fork(self)
+
+    def _after_fork(self):
+        """Forget the calls in flight in the parent process, which never land in the child"""
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args):
+        """
+        Call ``function(*args)``, unless a call with the same ``key`` is
+        already in flight: then wait for it and share its return value or
+        exception.
+
+        :param key: hashable identifier of the call
+        :param function: function to call
+        :returns: return value of ``function``
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                if isinstance(flight.error, APIError):
+                    # raise a new instance, so that each thread gets its own traceback
+                    raise flight.error.__class__(*flight.error.args, response=flight.error.response)
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = function(*args)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,161 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides the incremental JSON decoding behind
+:py:func:`ovh.Client.iter_get`: the elements of a top-level JSON array are
+decoded and yielded as the chunks of the response body arrive, so that the
+whole body is never held in memory.
+
+.. code:: python
+
+    from ovh.streaming import iter_json_array
+
+    chunks = [b'[{"id": 1}, {"id"', b': 2}]']
+    print(list(iter_json_array(chunks)))  # [{'id': 1}, {'id': 2}]
+"""
+
+import codecs
+import json
+
+from .exceptions import InvalidResponse
+
+#: Default maximum size of a streamed response body, in bytes
+MAX_SIZE = 1024 * 1024 * 1024
+
+#: Default size of the chunks read from a streamed response body, in bytes
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Text buffer over an iterable of bytes chunks, with a size guard"""
+
+    def __init__(self, chunks, max_size):
+        self.chunks = iter(chunks)
+        self.max_size = max_size
+        self.size = 0
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Append the next chunk to the buffer, dropping its consumed part.
+
+        :raises InvalidResponse: if the body exceeds ``max_size``
+        :returns: False once the body was fully read
+        """
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            chunk = b""
+        else:
+            self.size += len(chunk)
+            if self.max_size is not None and self.size > self.max_size:
+                raise InvalidResponse("Response body exceeds %d bytes" % self.max_size)
+        try:
+            text = self.decoder.decode(chunk, final=self.eof)
+        except UnicodeDecodeError as error:
+            raise InvalidResponse("Failed to decode API response", error)
+        pos, self.pos = self.pos, 0
+        self.buffer = self.buffer[pos:] + text
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character, without consuming it.
+
+        :returns: next character, or an empty string at the end of the body
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters):
+        """
+        Consume the next character if it is one of ``characters``.
+
+        :raises InvalidResponse: otherwise
+        :returns: consumed character
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise InvalidResponse("Failed to decode API response, expected one of %r" % characters)
+        self.pos += 1
+        return character
+
+
+def iter_json_array(chunks, max_size=MAX_SIZE, decoder=None):
+    """
+    Lazily decode the elements of a JSON array split across ``chunks``.
+
+    An element is only decoded once the character that follows it was read:
+    a number cut in the middle by a chunk boundary is never mistaken for a
+    shorter one.
+
+    :param chunks: iterable of ``bytes`` holding a UTF-8 encoded JSON array
+    :param int max_size: maximum total size of the chunks, in bytes. ``None``
+        disables the guard.
+    :param json.JSONDecoder decoder: decoder of the elements
+    :raises InvalidResponse: if the body is not a JSON array, or exceeds
+        ``max_size``
+    :returns: generator of the decoded elements
+    """
+    decoder = decoder or json.JSONDecoder()
+    reader = _Reader(chunks, max_size)
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            reader.peek()
+            try:
+                element, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except ValueError:
+                element = end = None
+            # the element may be truncated, or be followed by more of itself
+            if end is None or end == len(reader.buffer):
+                if reader.fill():
+                    continue
+                if end is None:
+                    raise InvalidResponse("Failed to decode API response, invalid or truncated JSON array")
+            reader.pos = end
+            yield element
+            if reader.expect(",]") == "]":
+                break
+
+    if reader.peek():
+        raise InvalidResponse("Failed to decode API response, extra data after JSON array")
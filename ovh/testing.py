@@ -0,0 +1,492 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides :py:class:`APIServer`, a local stand-in of the OVHcloud
+API to test and load-test code using :py:class:`ovh.Client` without reaching
+the real API. It answers ``/auth/time``, checks the signature of the requests
+the way :py:func:`ovh.Client.raw_call` builds it, serves fixture routes,
+including the batch mode and the pagination of ``/v2`` routes, and can inject
+latency and errors:
+
+.. code:: python
+
+    import random
+
+    from ovh.testing import APIServer
+
+    with APIServer(latency=lambda: random.expovariate(1 / 0.02), errors={503: 0.01}) as server:
+        server.add_route("GET", "/me", {"nichandle": "xx1234-ovh"})
+        server.add_collection("/dedicated/server", {"ns1.example.com": {"state": "ok"}})
+
+        client = server.client(retry=True)
+        print(client.get("/me"))
+        print(client.get_batch("/dedicated/server/{}", ["ns1.example.com"]))
+
+It can also be run on its own, serving demonstration fixtures or the ones of
+a JSON file::
+
+    python -m ovh.testing --port 8080 --latency 20 --error 503:0.01
+"""
+
+import argparse
+import base64
+from collections import Counter
+import email.utils
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import sys
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+from .client import Client
+
+#: Application credentials accepted by default
+APPLICATION_KEY = "TDPKJdwZwAQPwKX2"
+APPLICATION_SECRET = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+CONSUMER_KEY = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+#: Maximum distance between the timestamp of a signed request and the clock
+#: of the server, in seconds
+MAX_SKEW = 30
+
+#: Number of items per page of ``/v2`` routes, unless ``X-Pagination-Size``
+#: is set
+PAGE_SIZE = 100
+
+#: Fixtures served by ``python -m ovh.testing`` without ``--fixtures``
+DEMO_FIXTURES = {
+    "routes": {
+        "GET /me": {"nichandle": "xx1234-ovh", "email": "admin@example.com", "state": "complete"},
+    },
+    "collections": {
+        "/dedicated/server": {
+            "ns%d.ip-10-0-0.eu" % i: {"name": "ns%d.ip-10-0-0.eu" % i, "datacenter": "sbg1", "state": "ok"}
+            for i in range(200)
+        },
+        "/v2/iam/resource": {
+            "urn:v1:eu:resource:vps:vps-%d" % i: {"urn": "urn:v1:eu:resource:vps:vps-%d" % i, "type": "vps"}
+            for i in range(1000)
+        },
+    },
+}
+
+# (status, errorCode, message) of the responses of the API
+_ERRORS = {
+    "not_found": (404, None, "Got an invalid (or empty) URL"),
+    "no_object": (404, None, "This object does not exist"),
+    "login": (401, None, "You must login first"),
+    "invalid_key": (403, "INVALID_KEY", "This application key is invalid"),
+    "invalid_credential": (403, "INVALID_CREDENTIAL", "This credential does not exist"),
+    "invalid_signature": (400, "INVALID_SIGNATURE", "Invalid signature"),
+    "query_time_out": (400, "QUERY_TIME_OUT", "Query out of time"),
+}
+
+
+class _Route:
+    """Fixture route: a method, a path pattern with ``{}`` placeholders, and its response"""
+
+    def __init__(self, method, path, result, status, headers):
+        self.method = method.upper()
+        self.pattern = re.compile("^%s$" % "([^/]+)".join(re.escape(part) for part in path.split("{}")))
+        self.result = result
+        self.status = status
+        self.headers = headers or {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send the headers and the body at once, flushed after each request
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def date_time_string(self, timestamp=None):
+        return email.utils.formatdate(self.server.api.now(), usegmt=True)
+
+    def do_GET(self):
+        self.server.api._handle(self)
+
+    do_POST = do_PUT = do_DELETE = do_GET
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class APIServer:
+    """
+    Local HTTP server standing in for the OVHcloud API, in a background
+    thread. Signed requests are checked as the API does: unknown application
+    keys, unknown consumer keys, invalid signatures and timestamps too far
+    from the clock of the server are rejected with the errors of the API.
+
+    :py:attr:`APIServer.stats` counts the ``requests`` received, the
+    ``rejected`` ones and the ``injected`` errors.
+    """
+
+    def __init__(
+        self,
+        application_key=APPLICATION_KEY,
+        application_secret=APPLICATION_SECRET,
+        consumer_keys=None,
+        latency=None,
+        errors=None,
+        time_offset=0,
+        seed=None,
+        host="127.0.0.1",
+        port=0,
+    ):
+        """
+        :param str application_key: application key accepted
+        :param str application_secret: secret of the application key
+        :param consumer_keys: consumer keys accepted, any by default
+        :param latency: delay before each response, in seconds, or a function
+            returning it, such as ``lambda: random.expovariate(1 / 0.02)``
+        :param dict errors: probability of each error status, such as
+            ``{503: 0.01, 429: 0.001}``. They are answered before any check.
+        :param int time_offset: distance between the clock of the server and
+            the local one, in seconds
+        :param seed: seed of the random draws of the injected errors
+        :param str host: address to listen on
+        :param int port: port to listen on, any free one by default
+        """
+        self.application_key = application_key
+        self.application_secret = application_secret
+        self.consumer_keys = None if consumer_keys is None else set(consumer_keys)
+        self.latency = latency
+        self.errors = dict(errors or {})
+        self.time_offset = time_offset
+        self.stats = Counter()
+
+        self._random = random.Random(seed)
+        self._routes = []
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.api = self
+        self._thread = None
+
+        #: Base URL of the server
+        self.url = "http://%s:%d" % self._server.server_address[:2]
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests, and close the socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def now(self):
+        """Time of the server, as a timestamp"""
+        return time.time() + self.time_offset
+
+    def client(self, consumer_key=CONSUMER_KEY, **kwargs):
+        """
+        Build a client calling this server, with the credentials it accepts.
+
+        :param str consumer_key: consumer key of the client
+        :param kwargs: other parameters of :py:class:`ovh.Client`
+        :rtype: ovh.Client
+        """
+        kwargs.setdefault("application_key", self.application_key)
+        kwargs.setdefault("application_secret", self.application_secret)
+        return Client(self.url + "/1.0", consumer_key=consumer_key, **kwargs)
+
+    # fixtures
+
+    def add_route(self, method, path, result, status=200, headers=None):
+        """
+        Serve ``result`` for the calls to a route. Routes added last take
+        precedence.
+
+        :param str method: HTTP verb
+        :param str path: path of the route, relative to the ``/1.0`` base path
+            unless it starts with ``/v1`` or ``/v2``. ``{}`` placeholders
+            match a path segment.
+        :param result: JSON serializable body of the response, or a function
+            called with the values of the placeholders, the decoded request
+            body and the ``BaseHTTPRequestHandler`` of the request, returning
+            either the body or a tuple of the status, body and headers
+        :param int status: status of the response
+        :param dict headers: headers of the response
+        """
+        with self._lock:
+            self._routes.insert(0, _Route(method, self._base_path(path), result, status, headers))
+
+    def add_collection(self, path, items):
+        """
+        Serve a collection of objects, like the API does:
+
+        - ``GET path`` returns the list of the identifiers of ``items`` or,
+          for ``/v2`` routes, the objects themselves a page at a time,
+          following the ``X-Pagination-Size`` and ``X-Pagination-Cursor``
+          request headers
+        - ``GET path/{id}`` returns an object, or several in batch mode when
+          the ``X-Ovh-Batch`` header is set
+
+        :param str path: path of the collection
+        :param dict items: objects of the collection, by identifier
+        """
+        items = {str(key): value for key, value in items.items()}
+        if self._base_path(path).startswith("/v2"):
+            self.add_route("GET", path, lambda params, body, request: self._page(list(items.values()), request))
+        else:
+            self.add_route("GET", path, list(items))
+        self.add_route("GET", path + "/{}", lambda params, body, request: self._object(items, params[0], request))
+
+    def load_fixtures(self, fixtures):
+        """
+        Serve fixtures in the form of :py:data:`DEMO_FIXTURES`: ``routes``
+        maps ``"METHOD /path"`` to the body of the response, and
+        ``collections`` maps paths to the objects of
+        :py:func:`APIServer.add_collection`.
+
+        :param dict fixtures: the fixtures, as decoded from JSON
+        """
+        for route, result in fixtures.get("routes", {}).items():
+            method, path = route.split(" ", 1)
+            self.add_route(method, path, result)
+        for path, items in fixtures.get("collections", {}).items():
+            self.add_collection(path, items)
+
+    @staticmethod
+    def _base_path(path):
+        return path if path.startswith(("/v1", "/v2")) else "/1.0" + path
+
+    def _page(self, items, request):
+        size = int(request.headers.get("X-Pagination-Size") or PAGE_SIZE)
+        cursor = request.headers.get("X-Pagination-Cursor")
+        start = int(base64.urlsafe_b64decode(cursor)) if cursor else 0
+        end = start + size
+        headers = {}
+        if end < len(items):
+            headers["X-Pagination-Cursor-Next"] = base64.urlsafe_b64encode(b"%d" % end).decode()
+        return 200, items[start:end], headers
+
+    def _object(self, items, key, request):
+        separator = request.headers.get("X-Ovh-Batch")
+        if separator is None:
+            if key not in items:
+                return self._error("no_object")
+            return 200, items[key], {}
+
+        # missing objects report the error of a single call, see Client._read_batch
+        batch = []
+        for key in key.split(separator):
+            if key in items:
+                batch.append({"key": key, "value": items[key], "error": ""})
+            else:
+                status, error, _ = self._error("no_object")
+                batch.append({"key": key, "value": None, "error": error.pop("message"), "status": status, **error})
+        return 200, batch, {}
+
+    # requests
+
+    def _handle(self, request):
+        with self._lock:
+            self.stats["requests"] += 1
+            draw = self._random.random()
+
+        length = int(request.headers.get("Content-Length") or 0)
+        body = request.rfile.read(length) if length else b""
+        # the signature covers the uncompressed body
+        if body and request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        status, result, headers = self._respond(request, body, draw)
+        payload = json.dumps(result).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _respond(self, request, body, draw):
+        """
+        :returns: tuple of the status, the body and the headers of the response
+        """
+        # injected errors, drawn once per request
+        for status, probability in self.errors.items():
+            if draw < probability:
+                self._count("injected")
+                headers = {"Retry-After": "1"} if status == 429 else {}
+                return status, {"message": "Injected error %d" % status}, headers
+            draw -= probability
+
+        path = unquote(urlsplit(request.path).path)
+        if path.endswith("/auth/time") and request.command == "GET":
+            return 200, int(self.now()), {}
+
+        rejection = self._check_signature(request, body)
+        if rejection is not None:
+            self._count("rejected")
+            return self._error(rejection)
+
+        with self._lock:
+            routes = list(self._routes)
+        for route in routes:
+            match = route.pattern.match(path)
+            if match is None or route.method != request.command:
+                continue
+            if not callable(route.result):
+                return route.status, route.result, route.headers
+            response = route.result(match.groups(), json.loads(body) if body else None, request)
+            if isinstance(response, tuple):
+                return response
+            return route.status, response, route.headers
+        return self._error("not_found")
+
+    def _check_signature(self, request, body):
+        """
+        Check the authentication headers of a request, as built by
+        :py:func:`ovh.Client.raw_call`.
+
+        :returns: the name of the error of the API, if rejected
+        """
+        headers = request.headers
+        if headers.get("X-Ovh-Application") != self.application_key:
+            return "invalid_key" if headers.get("X-Ovh-Application") else "login"
+
+        consumer_key = headers.get("X-Ovh-Consumer")
+        if not consumer_key:
+            return "login"
+        if self.consumer_keys is not None and consumer_key not in self.consumer_keys:
+            return "invalid_credential"
+
+        timestamp = headers.get("X-Ovh-Timestamp", "")
+        if not timestamp.isdigit() or abs(int(timestamp) - self.now()) > MAX_SKEW:
+            return "query_time_out"
+
+        url = "http://%s%s" % (headers.get("Host"), request.path)
+        signature = hashlib.sha1(
+            "+".join([self.application_secret, consumer_key, request.command, url, ""]).encode("utf-8")
+            + body
+            + ("+" + timestamp).encode("utf-8")
+        )
+        if headers.get("X-Ovh-Signature") != "$1$" + signature.hexdigest():
+            return "invalid_signature"
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def _error(name):
+        status, error_code, message = _ERRORS[name]
+        result = {"message": message}
+        if error_code is not None:
+            result["errorCode"] = error_code
+        return status, result, {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in of the OVHcloud API")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on, 0 for any free one")
+    parser.add_argument("--fixtures", help="JSON file of fixtures, demonstration ones by default")
+    parser.add_argument("--latency", type=float, default=0, help="mean latency of the responses, in milliseconds")
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "exponential"],
+        default="fixed",
+        help="distribution of the latency of the responses",
+    )
+    parser.add_argument(
+        "--error",
+        action="append",
+        default=[],
+        metavar="STATUS:PROBABILITY",
+        help="inject an error status with a probability, such as 503:0.01",
+    )
+    parser.add_argument("--time-offset", type=int, default=0, help="offset of the clock of the server, in seconds")
+    parser.add_argument("--seed", type=int, help="seed of the random draws")
+    args = parser.parse_args(argv)
+
+    mean = args.latency / 1000
+    rng = random.Random(args.seed)
+
+    def exponential_latency():
+        return rng.expovariate(1 / mean)
+
+    latency = exponential_latency if args.distribution == "exponential" and mean else mean
+
+    errors = {}
+    for error in args.error:
+        status, probability = error.split(":")
+        errors[int(status)] = float(probability)
+
+    fixtures = DEMO_FIXTURES
+    if args.fixtures:
+        with open(args.fixtures) as f:
+            fixtures = json.load(f)
+
+    server = APIServer(
+        latency=latency,
+        errors=errors,
+        time_offset=args.time_offset,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    server.load_fixtures(fixtures)
+    print("Serving on %s" % server.url, flush=True)
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides an on-disk cache of the time delta of each endpoint, see
+:py:attr:`ovh.Client.time_delta`. Short-lived processes sharing it sign their
+first request right away, instead of querying ``/auth/time`` first:
+
+.. code:: python
+
+    import ovh
+    from ovh.timesync import TimeDeltaCache
+
+    client = ovh.Client(time_delta_cache=TimeDeltaCache(ttl=3600))
+
+Each endpoint has its own cache file. Files are replaced atomically, so that
+they can be read and written by many processes at once.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+#: Default time to live of the cached time deltas, in seconds
+DEFAULT_TTL = 3600
+
+
+def default_directory():
+    """
+    Default location of the cache files, in the user cache directory.
+
+    :rtype: str
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_dir, "ovh", "time-delta")
+
+
+class TimeDeltaCache:
+    """
+    Time deltas of the endpoints, stored in JSON files. Errors reading or
+    writing the files are ignored: the time delta is then queried from the
+    API.
+    """
+
+    def __init__(self, directory=None, ttl=DEFAULT_TTL):
+        """
+        :param str directory: directory of the cache files,
+            :py:func:`default_directory` by default. It is created if needed.
+        :param float ttl: how long a time delta is used, in seconds
+        """
+        self.directory = directory if directory is not None else default_directory()
+        self.ttl = ttl
+
+    def path(self, endpoint):
+        """
+        Path of the cache file of an endpoint.
+
+        :param str endpoint: URL of the endpoint
+        :rtype: str
+        """
+        return os.path.join(self.directory, hashlib.sha1(endpoint.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, endpoint):
+        """
+        Cached time delta of an endpoint.
+
+        :param str endpoint: URL of the endpoint
+        :returns: the time delta, or ``None`` if missing or expired
+        :rtype: int
+        """
+        try:
+            with open(self.path(endpoint)) as cache_file:
+                entry = json.load(cache_file)
+            time_delta, saved_at = entry["time_delta"], entry["saved_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not 0 <= time.time() - saved_at <= self.ttl:
+            return None
+        return time_delta
+
+    def set(self, endpoint, time_delta):
+        """
+        Cache the time delta of an endpoint. It is written to a temporary file
+        first, then atomically moved in place.
+
+        :param str endpoint: URL of the endpoint
+        :param int time_delta: its time delta
+        :returns: whether the cache was written
+        :rtype: bool
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        except OSError:
+            return False
+
+        try:
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump({"endpoint": endpoint, "time_delta": time_delta, "saved_at": time.time()}, tmp_file)
+            os.replace(tmp_path, self.path(endpoint))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def clear(self, endpoint):
+        """
+        Remove the cached time delta of an endpoint.
+
+        :param str endpoint: URL of the endpoint
+        """
+        try:
+            os.unlink(self.path(endpoint))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,285 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ````AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This module provides the transports of :py:class:`ovh.Client`: once a call is
+signed, its transport sends the method, URL, headers and body, and returns the
+status, headers and body of the response. Both authentication modes go
+through it:
+
+.. code:: python
+
+    import ovh
+
+    # requests, the default
+    client = ovh.Client(transport="requests")
+
+    # urllib3 connection pools, without the per-call overhead of requests
+    client = ovh.Client(transport="urllib3")
+
+Any :py:class:`Transport` instance may be given too, for instance a test
+double. Whatever the transport, responses are ``requests.Response`` objects
+and network errors are ``requests`` exceptions.
+
+The settings ``requests`` reads from the environment on every call can be
+read once instead, with :py:func:`resolve_environment`:
+
+.. code:: python
+
+    client = ovh.Client(trust_env="once")
+
+    # after the proxy variables changed
+    client.reload_environment()
+"""
+
+from collections import namedtuple
+import os
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.certs import where
+from requests.exceptions import ConnectionError, ConnectTimeout, InvalidURL, ProxyError, ReadTimeout, SSLError
+from requests.utils import (
+    default_headers,
+    get_auth_from_url,
+    get_encoding_from_headers,
+    get_environ_proxies,
+    get_netrc_auth,
+)
+from urllib3 import PoolManager, ProxyManager, Timeout
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.util import make_headers
+
+#: Names of the transports :py:class:`ovh.Client` can build
+TRANSPORTS = ("requests", "urllib3")
+
+# Names of the default headers sent by requests, by lowercase name
+_DEFAULT_NAMES = {name.lower(): name for name in default_headers()}
+
+#: Settings of the environment for a URL: the proxies by scheme, the CA
+#: bundle, or True for the default one, and the ``.netrc`` credentials
+Environment = namedtuple("Environment", ["proxies", "verify", "auth"])
+
+
+def resolve_environment(url):
+    """
+    Read the settings ``requests`` reads from the environment on every call
+    to ``url``: the proxies of the ``*_PROXY`` variables unless ``NO_PROXY``
+    excludes the host, the CA bundle of ``REQUESTS_CA_BUNDLE`` or
+    ``CURL_CA_BUNDLE``, and the credentials of the host in ``.netrc``.
+
+    :param str url: URL of the host called
+    :rtype: Environment
+    """
+    verify = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or True
+    return Environment(get_environ_proxies(url), verify, get_netrc_auth(url))
+
+
+class Transport:
+    """
+    Base class of the transports, sending signed requests.
+    """
+
+    def send(self, method, url, headers, body, timeout, stream=False):
+        """
+        Send a request.
+
+        :param str method: HTTP verb
+        :param str url: full request URL
+        :param dict headers: request headers, authentication headers included
+        :param body: serialized request body, possibly empty
+        :type body: str or bytes
+        :param timeout: same timeout for both connection and read, or tuple of
+            connection and read timeouts
+        :param boolean stream: if True, the response body is not downloaded
+            until it is read from the response object
+        :raises requests.RequestException: when the request failed for network
+            reason
+        :returns: the response, with its ``status_code``, ``headers`` and
+            ``content``
+        :rtype: requests.Response
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Close the connections of the transport.
+        """
+
+    def after_fork(self):
+        """
+        Called in the child process after a fork by the clients holding the
+        transport, so that the child opens its own connections.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Transport sending requests through a ``requests`` session, with its
+    transport adapters, proxy settings and environment.
+    """
+
+    def __init__(self, session):
+        """
+        :param requests.Session session: session sending the requests
+        """
+        self.session = session
+
+    def send(self, method, url, headers, body, timeout, stream=False):
+        options = {"headers": headers, "data": body, "timeout": timeout}
+        if stream:
+            options["stream"] = True
+        return self.session.request(method, url, **options)
+
+    def close(self):
+        self.session.close()
+
+    def after_fork(self):
+        # reset the pools in place, without closing the sockets of the parent
+        for adapter in self.session.adapters.values():
+            if isinstance(adapter, HTTPAdapter):
+                adapter.init_poolmanager(adapter._pool_connections, adapter._pool_maxsize, block=adapter._pool_block)
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport sending requests straight to a ``urllib3`` pool manager. It
+    skips the per-call work of ``requests`` that API calls do not need:
+    hooks, cookies, redirects, and the merge of the environment settings.
+    The environment variables are not read: proxies and CA bundle are only
+    the ones given.
+    """
+
+    def __init__(self, num_pools=10, maxsize=10, block=False, verify=True, proxy=None):
+        """
+        :param int num_pools: number of per host connection pools
+        :param int maxsize: maximum number of connections kept open per host
+        :param bool block: whether to wait for a connection when all the
+            connections of the pool are in use, rather than opening a new one
+        :param verify: whether to check the certificates of the hosts, or the
+            path of the CA bundle to check them against. Defaults to the CA
+            bundle of ``requests``.
+        :param str proxy: URL of the proxy to send the requests through, if
+            any
+        """
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.block = block
+        self.verify = verify
+        self.proxy = proxy
+        self.headers = dict(default_headers())
+        self.init_pool_manager()
+
+    def init_pool_manager(self):
+        """
+        Replace the pool manager with a new one, without any connection. In a
+        child process, this keeps the connections of the parent from being
+        shared.
+        """
+        if self.verify is False:
+            tls = {"cert_reqs": "CERT_NONE"}
+        else:
+            tls = {"cert_reqs": "CERT_REQUIRED", "ca_certs": where() if self.verify is True else self.verify}
+        options = dict(num_pools=self.num_pools, maxsize=self.maxsize, block=self.block, **tls)
+        if self.proxy is None:
+            self.pool_manager = PoolManager(**options)
+            return
+
+        username, password = get_auth_from_url(self.proxy)
+        if username:
+            options["proxy_headers"] = make_headers(proxy_basic_auth="%s:%s" % (username, password))
+        self.pool_manager = ProxyManager(self.proxy, **options)
+
+    def send(self, method, url, headers, body, timeout, stream=False):
+        # default headers are overridden whatever the case of their name
+        request_headers = self.headers.copy()
+        for name in headers:
+            default = _DEFAULT_NAMES.get(name.lower())
+            if default is not None:
+                request_headers.pop(default, None)
+        request_headers.update(headers)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = Timeout(connect=connect, read=read)
+        else:
+            timeout = Timeout(connect=timeout, read=timeout)
+
+        try:
+            raw = self.pool_manager.urlopen(
+                method,
+                url,
+                body=body or None,
+                headers=request_headers,
+                redirect=False,
+                retries=False,
+                timeout=timeout,
+                preload_content=not stream,
+            )
+        except urllib3_exceptions.NewConnectionError as error:
+            raise ConnectionError(error)
+        except urllib3_exceptions.ConnectTimeoutError as error:
+            raise ConnectTimeout(error)
+        except urllib3_exceptions.ReadTimeoutError as error:
+            raise ReadTimeout(error)
+        except urllib3_exceptions.SSLError as error:
+            raise SSLError(error)
+        except urllib3_exceptions.ProxyError as error:
+            raise ProxyError(error)
+        except urllib3_exceptions.LocationValueError as error:
+            raise InvalidURL(error)
+        except (urllib3_exceptions.HTTPError, OSError) as error:
+            raise ConnectionError(error)
+
+        # what the response exposes of its request
+        request = PreparedRequest()
+        request.method = method
+        request.url = url
+        request.headers = request_headers
+        request.body = body
+
+        response = Response()
+        response.status_code = raw.status
+        # already a case-insensitive dict
+        response.headers = raw.headers
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = raw
+        response.reason = raw.reason
+        response.url = url
+        response.request = request
+        if not stream:
+            # already downloaded, and the connection released
+            response._content = raw.data
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        self.pool_manager.clear()
+
+    def after_fork(self):
+        self.init_pool_manager()
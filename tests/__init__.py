@@ -23,3 +23,120 @@
 # ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import contextlib
+import fnmatch
+import json
+import os
+import signal
+import threading
+import time
+from unittest import mock
+
+from ovh.client import Client
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+
+def make_response(status=200, body=None, headers=None):
+    """Stand-in of a response of the API, whose body defaults to an error message for error statuses"""
+    if body is None:
+        body = {"message": "status %d" % status} if status >= 400 else {}
+    res = mock.Mock()
+    res.status_code = status
+    res.headers = headers or {}
+    res.content = json.dumps(body).encode()
+    return res
+
+
+def make_client(server=None, **kwargs):
+    """Client of the ovh-eu endpoint, or of a local ``server``, whose time delta is already known"""
+    endpoint = "http://%s:%d/1.0" % server.server_address if server is not None else "ovh-eu"
+    api = Client(endpoint, MockApplicationKey, MockApplicationSecret, MockConsumerKey, **kwargs)
+    api._time_delta = 0
+    return api
+
+
+def run_in_child(function):
+    """Call ``function`` in a forked child process, and tell whether it returned a true value within 5 seconds"""
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        try:
+            signal.alarm(5)
+            os.write(write, bytes([1 if function() else 0]))
+        finally:
+            os._exit(0)
+
+    os.waitpid(pid, 0)
+    os.close(write)
+    result = os.read(read, 1) == bytes([1])
+    os.close(read)
+    return result
+
+
+@contextlib.contextmanager
+def locks_held(*locks):
+    """Hold ``locks`` from another thread"""
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with contextlib.ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    try:
+        yield
+    finally:
+        release.set()
+        thread.join()
+
+
+class FakeRedis:
+    """Local stand-in of a networked store, implementing the subset of redis-py used by RemoteStore and
+    RemoteBucketStore"""
+
+    def __init__(self):
+        self.data = {}
+        self.locks = {}
+        self.lock_calls = 0
+        self._mutex = threading.Lock()
+
+    def get(self, name):
+        with self._mutex:
+            value, expires_at = self.data.get(name, (None, None))
+            if expires_at is not None and expires_at <= time.time():
+                del self.data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        assert isinstance(value, bytes) and (ex is None or ex > 0)
+        with self._mutex:
+            self.data[name] = (value, None if ex is None else time.time() + ex)
+
+    def delete(self, *names):
+        with self._mutex:
+            for name in names:
+                self.data.pop(name, None)
+
+    def scan_iter(self, match=None):
+        with self._mutex:
+            names = list(self.data)
+        for name in names:
+            if match is None or fnmatch.fnmatchcase(name, match):
+                yield name.encode("utf-8")
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        with self._mutex:
+            self.lock_calls += 1
+            return self.locks.setdefault(name, threading.Lock())
@@ -0,0 +1,330 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import base64
+import hashlib
+import os
+import pickle
+import subprocess
+import sys
+import time
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from ovh.async_client import AsyncClient
+from ovh.client import BaseClient, Client
+from ovh.exceptions import (
+    APIError,
+    HTTPError,
+    InvalidKey,
+    InvalidResponse,
+    OAuth2FailureError,
+    ResourceNotFoundError,
+)
+from ovh.ratelimit import RateLimiter
+
+from tests import run_in_child
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+MockServerTime = 1457018875
+
+
+class FakeAPI:
+    """Minimal local stand-in of the API, checking request signatures"""
+
+    def __init__(self):
+        self.hits = {}
+        self.app = web.Application()
+        self.app.router.add_route("*", "/{tail:.*}", self.handle)
+
+    async def handle(self, request):
+        path = request.path
+        self.hits[path] = self.hits.get(path, 0) + 1
+
+        if path == "/1.0/auth/time":
+            await asyncio.sleep(0.05)
+            return web.json_response(MockServerTime)
+
+        if path == "/auth/oauth2/token":
+            if request.headers["Authorization"] != "Basic " + base64.b64encode(b"oauth2_id:oauth2_secret").decode():
+                return web.json_response({"message": "Invalid client credentials"}, status=401)
+            return web.json_response(
+                {"access_token": "MTQ0NjJkZmQ5OTM2NDE1ZTZjNGZmZjI3", "token_type": "Bearer", "expires_in": 3600}
+            )
+
+        if request.headers.get("Authorization") == "Bearer MTQ0NjJkZmQ5OTM2NDE1ZTZjNGZmZjI3":
+            return web.json_response({"auth": "oauth2"})
+
+        body = await request.text()
+        signature = hashlib.sha1()
+        signature.update(
+            "+".join(
+                [
+                    MockApplicationSecret,
+                    request.headers["X-Ovh-Consumer"],
+                    request.method,
+                    str(request.url),
+                    body,
+                    request.headers["X-Ovh-Timestamp"],
+                ]
+            ).encode("utf-8")
+        )
+        if request.headers["X-Ovh-Signature"] != "$1$" + signature.hexdigest():
+            return web.json_response({"errorCode": "INVALID_SIGNATURE", "message": "Invalid signature"}, status=400)
+
+        if path == "/1.0/throttled":
+            return web.json_response({"message": "Too many requests"}, status=429, headers={"Retry-After": "0.2"})
+        if path == "/1.0/clock" and abs(int(request.headers["X-Ovh-Timestamp"]) - time.time()) > 5:
+            return web.json_response({"errorCode": "QUERY_TIME_OUT", "message": "Query out of time"}, status=400)
+        if path == "/1.0/missing":
+            return web.json_response({"message": "Got an invalid (or empty) URL"}, status=404)
+        if path == "/1.0/pages":
+            cursor = int(request.headers.get("X-Pagination-Cursor", 0))
+            size = int(request.headers["X-Pagination-Size"])
+            headers = {"X-Pagination-Cursor-Next": str(cursor + size)} if cursor + size < 5 else {}
+            return web.json_response(list(range(cursor, min(cursor + size, 5))), headers=headers)
+        if path.startswith("/1.0/batch/") and request.headers.get("X-Ovh-Batch") == ",":
+            ids = path.rsplit("/", 1)[1].split(",")
+            items = [
+                (
+                    {"key": id, "value": None, "error": "The requested object does not exist", "status": 404}
+                    if id == "missing"
+                    else {"key": id, "value": {"name": id}, "error": ""}
+                )
+                for id in ids
+                if id != "omitted"
+            ]
+            return web.json_response(items)
+        if request.method == "DELETE":
+            return web.Response(status=204)
+        return web.json_response({"method": request.method, "query": request.query_string, "body": body})
+
+
+def run(coro_fn):
+    """Run ``coro_fn(server)`` against a fresh FakeAPI"""
+
+    async def wrapper():
+        api = FakeAPI()
+        server = TestServer(api.app)
+        await server.start_server()
+        try:
+            return await coro_fn(api, server)
+        finally:
+            await server.close()
+
+    return asyncio.run(wrapper())
+
+
+def make_client(server, **kwargs):
+    if "client_id" not in kwargs:
+        kwargs.update(
+            application_key=MockApplicationKey,
+            application_secret=MockApplicationSecret,
+            consumer_key=MockConsumerKey,
+        )
+    return AsyncClient(str(server.make_url("/1.0")), **kwargs)
+
+
+class TestAsyncClient:
+    def test_calls(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                assert await client.get("/me", _from="a", checkbox=True) == {
+                    "method": "GET",
+                    "query": "from=a&checkbox=true",
+                    "body": "",
+                }
+                assert await client.post("/me", key="value") == {
+                    "method": "POST",
+                    "query": "",
+                    "body": '{"key":"value"}',
+                }
+                assert (await client.put("/me"))["method"] == "PUT"
+                assert await client.delete("/me") is None
+
+                with pytest.raises(ResourceNotFoundError):
+                    await client.get("/missing")
+
+                assert abs(await client.time_delta - (MockServerTime - int(time.time()))) <= 1
+
+        run(scenario)
+
+    def test_get_many(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                results = await client.get_many(["/me", "/missing", "/me?n=2"], max_workers=2)
+                assert results[0]["query"] == ""
+                assert isinstance(results[1], ResourceNotFoundError)
+                assert results[2]["query"] == "n=2"
+
+                completed = [target async for target, _ in client.get_as_completed(["/me"] * 5, max_workers=2)]
+                assert completed == ["/me"] * 5
+            assert api.hits["/1.0/me"] == 7
+
+        run(scenario)
+
+    def test_iter_pages(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                assert [item async for item in client.iter_pages("/pages", page_size=2)] == [0, 1, 2, 3, 4]
+                assert api.hits["/1.0/pages"] == 3
+
+                # the page fetched in advance is dropped when the caller stops
+                pages = client.iter_pages("/pages", page_size=2)
+                assert await pages.__anext__() == 0
+                await pages.aclose()
+
+                with pytest.raises(ResourceNotFoundError):
+                    [item async for item in client.iter_pages("/missing")]
+
+        run(scenario)
+
+    def test_get_batch(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                results = await client.get_batch("/batch/{}", ["a", "missing", "b", "omitted"], batch_size=3)
+            assert results["a"] == {"name": "a"}
+            assert results["b"] == {"name": "b"}
+            assert isinstance(results["missing"], ResourceNotFoundError)
+            assert type(results["omitted"]) is InvalidResponse
+            assert api.hits == {"/1.0/auth/time": 1, "/1.0/batch/a,missing,b": 1, "/1.0/batch/omitted": 1}
+
+        run(scenario)
+
+    def test_lazy_import(self):
+        # aiohttp is only imported along with AsyncClient
+        code = "import sys, ovh; assert 'aiohttp' not in sys.modules; ovh.AsyncClient; assert 'aiohttp' in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_base_client(self):
+        # the configuration, signing and error mapping are shared with Client,
+        # not its synchronous API
+        client = AsyncClient("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey)
+        assert isinstance(client, BaseClient) and not isinstance(client, Client)
+        assert not hasattr(client, "iter_get") and not hasattr(client, "prepare")
+        assert client._get_target("/v2/me") == "https://eu.api.ovh.com/v2/me"
+        assert type(client._api_error(404, {"message": "gone"}, None)) is ResourceNotFoundError
+
+    def test_time_delta_loaded_once(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                results = await asyncio.gather(*(client.get("/me") for _ in range(200)))
+            assert len(results) == 200
+            assert api.hits["/1.0/auth/time"] == 1
+            assert api.hits["/1.0/me"] == 200
+
+        run(scenario)
+
+    def test_rate_limiter(self):
+        async def scenario(api, server):
+            limiter = RateLimiter(rate=100, burst=5)
+            async with make_client(server, rate_limiter=limiter) as client:
+                start = time.monotonic()
+                await asyncio.gather(*(client.get("/me") for _ in range(20)))
+                assert time.monotonic() - start >= 0.15
+                assert limiter.stats["acquired"] == 21
+                assert limiter.stats["waits"] > 0
+
+                # a 429 pauses the bucket
+                with pytest.raises(APIError):
+                    await client.get("/throttled")
+                start = time.monotonic()
+                await client.get("/me")
+                assert time.monotonic() - start >= 0.2
+                assert limiter.stats["throttled"] == 1
+
+        run(scenario)
+
+    def test_time_delta_resync(self):
+        async def scenario(api, server):
+            async with make_client(server) as client:
+                # the clock drifted, the Date header of the rejection fixes it
+                client._time_delta = 1000
+                assert (await client.get("/clock"))["method"] == "GET"
+                assert api.hits["/1.0/clock"] == 2
+                assert abs(client._time_delta) <= 1
+                assert "/1.0/auth/time" not in api.hits
+
+        run(scenario)
+
+    def test_pickle(self):
+        client = AsyncClient("ovh-eu", client_id="oauth2_id", client_secret="oauth2_secret", pool_maxsize=20)
+        client._oauth2._token = {"access_token": "MTQ0NjJkZmQ5OTM2NDE1ZTZjNGZmZjI3", "expires_at": time.time() + 60}
+        clone = pickle.loads(pickle.dumps(client))
+        assert isinstance(clone, AsyncClient)
+        assert clone._oauth2.token == client._oauth2.token
+        assert clone._pool_maxsize == 20
+        assert clone._session is None and clone._time_delta_lock is None
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        client = AsyncClient("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey)
+        client._session = session = mock.Mock()
+
+        # the session belongs to the event loop of the parent process
+        assert run_in_child(lambda: client._session is None)
+        assert client._session is session
+
+    @mock.patch.dict(os.environ, {"OAUTHLIB_INSECURE_TRANSPORT": "1"})
+    def test_oauth2_token_fetched_once(self):
+        async def scenario(api, server):
+            async with make_client(server, client_id="oauth2_id", client_secret="oauth2_secret") as client:
+                results = await asyncio.gather(*(client.get("/me") for _ in range(100)))
+            assert results == [{"auth": "oauth2"}] * 100
+            assert api.hits["/auth/oauth2/token"] == 1
+            assert "/1.0/auth/time" not in api.hits
+
+        run(scenario)
+
+    @mock.patch.dict(os.environ, {"OAUTHLIB_INSECURE_TRANSPORT": "1"})
+    def test_oauth2_failure(self):
+        async def scenario(api, server):
+            async with make_client(server, client_id="oauth2_id", client_secret="wrong_secret") as client:
+                with pytest.raises(OAuth2FailureError) as e:
+                    await client.get("/me")
+            assert str(e.value).startswith("OAuth2 failure: Missing access token parameter. Token creation failed")
+
+        run(scenario)
+
+    def test_errors(self):
+        async def scenario(api, server):
+            async with make_client(server, consumer_key=None) as client:
+                client._consumer_key = None
+                with pytest.raises(InvalidKey):
+                    await client.get("/me")
+
+            async with AsyncClient("http://127.0.0.1:1/1.0", MockApplicationKey, MockApplicationSecret) as client:
+                with pytest.raises(HTTPError):
+                    await client.get("/auth/time", _need_auth=False)
+
+        run(scenario)
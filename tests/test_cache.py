@@ -0,0 +1,484 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from ovh.cache import MISS, MemoryStore, RemoteStore, ResponseCache, SQLiteStore
+from ovh.client import Client
+from ovh.exceptions import BadParametersError, ResourceExpiredError, ResourceNotFoundError
+
+from tests import FakeRedis, locks_held, make_response, run_in_child
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+URL = "https://eu.api.ovh.com/1.0"
+
+
+def make_store(kind, tmp_path, max_bytes=100):
+    if kind == "memory":
+        return MemoryStore(max_bytes)
+    if kind == "sqlite":
+        return SQLiteStore(str(tmp_path / "cache.sqlite"), max_bytes)
+    if kind == "sqlite-zstd":
+        return SQLiteStore(str(tmp_path / "cache.sqlite"), max_bytes, compression="zstd")
+    if kind == "remote":
+        return RemoteStore(FakeRedis(), compression="zlib")
+    raise ValueError(kind)
+
+
+def _worker(path, worker):
+    """Concurrently share a SQLite store between processes"""
+    cache = ResponseCache(store=SQLiteStore(path))
+    for i in range(50):
+        cache.set(("id", URL + "/item/%d" % i), {"worker": worker, "i": i}, 10, 60)
+        # the item may have been invalidated by another worker meanwhile
+        value = cache.get(("id", URL + "/item/%d" % i))
+        assert value is MISS or value["i"] == i
+        cache.invalidate(URL + "/item/%d" % (i // 2))
+
+
+class TestResponseCache:
+    @mock.patch("time.time")
+    def test_ttl(self, m_time):
+        m_time.return_value = 1000
+        cache = ResponseCache(ttl=10, ttls={"/me": 60, "/me/bill*": 0, "/dedicated/server/*": 30})
+
+        assert cache.ttl_for("/me") == 60
+        assert cache.ttl_for("/me?param=value") == 60
+        assert cache.ttl_for("/me/bill/BILL1") == 0
+        assert cache.ttl_for("/dedicated/server/ns1/serviceInfos") == 30
+        assert cache.ttl_for("/other") == 10
+
+        cache.set(("id", URL + "/me"), {"name": "me"}, 10, 60)
+        cache.set(("id", URL + "/me/bill"), ["BILL1"], 10, 0)
+        assert cache.get(("id", URL + "/me")) == {"name": "me"}
+        assert cache.get(("other", URL + "/me")) is MISS
+        assert cache.get(("id", URL + "/me/bill")) is MISS
+
+        m_time.return_value = 1060
+        assert cache.get(("id", URL + "/me")) is MISS
+        assert len(cache) == 0
+        assert cache.stats == {"hits": 1, "misses": 3}
+
+    def test_lru(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set(("id", "a"), "a", 40, 60)
+        cache.set(("id", "b"), "b", 40, 60)
+        assert cache.get(("id", "a")) == "a"
+
+        # "b" is the least recently used
+        cache.set(("id", "c"), "c", 40, 60)
+        assert cache.get(("id", "b")) is MISS
+        assert cache.get(("id", "a")) == "a"
+        assert cache.get(("id", "c")) == "c"
+        assert cache.bytes == 80
+        assert cache.stats["evictions"] == 1
+
+        # too big to be cached at all
+        cache.set(("id", "d"), "d", 101, 60)
+        assert cache.get(("id", "d")) is MISS
+        assert len(cache) == 2
+
+        # replacing an entry does not leak its size
+        cache.set(("id", "a"), "a", 10, 60)
+        assert cache.bytes == 50
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.bytes == 0
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        for path in (
+            "/domain/zone",
+            "/domain/zone/example.com",
+            "/domain/zone/example.com/record",
+            "/domain/zone/example.com/record?fieldType=A",
+            "/domain/zone/example.com/record/42",
+            "/domain/zone/example.community",
+            "/me",
+        ):
+            cache.set(("id", URL + path), path, 1, 60)
+
+        cache.invalidate(URL + "/domain/zone/example.com/record")
+        assert sorted(key[1].replace(URL, "") for key in cache.store._entries) == [
+            "/domain/zone/example.community",
+            "/me",
+        ]
+        assert cache.stats["invalidations"] == 5
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        cache = ResponseCache()
+        cache.set(("id", URL + "/me"), {"name": "me"}, 10, 60)
+        assert cache.start_refresh(("id", URL + "/me"))
+
+        # neither the refresh nor the locks of the parent are carried into the child
+        with locks_held(cache._lock, cache.store._lock):
+            assert run_in_child(
+                lambda: cache.start_refresh(("id", URL + "/me")) and cache.get(("id", URL + "/me")) == {"name": "me"}
+            )
+        assert not cache.start_refresh(("id", URL + "/me"))
+
+
+class TestClientCache:
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_cached_get(self, m_time_delta, m_req):
+        m_req.return_value = make_response(body={"name": "me"})
+        cache = ResponseCache()
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+
+        assert api.get("/me") == {"name": "me"}
+        assert api.get("/me") == {"name": "me"}
+        assert m_req.call_count == 1
+
+        # query strings are part of the key
+        assert api.get("/me", param=True) == {"name": "me"}
+        assert m_req.call_count == 2
+        assert api.get("/me?param=true") == {"name": "me"}
+        assert m_req.call_count == 2
+
+        # credentials are part of the key
+        other = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, "other", cache=cache)
+        other.get("/me")
+        assert m_req.call_count == 3
+
+        # unauthenticated calls are not cached
+        api.get("/auth/time", _need_auth=False)
+        api.get("/auth/time", _need_auth=False)
+        assert m_req.call_count == 5
+
+        # writes invalidate
+        api.put("/me", name="new")
+        assert m_req.call_count == 6
+        api.get("/me")
+        assert m_req.call_count == 7
+        assert cache.stats["hits"] == 2
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_errors_not_cached(self, m_time_delta, m_req):
+        m_req.return_value = make_response(404, {"message": "not found"})
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=ResponseCache())
+
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                api.get("/me")
+        assert m_req.call_count == 2
+
+        # failed writes invalidate too
+        m_req.return_value = make_response(body={"name": "me"})
+        api.get("/me")
+        m_req.return_value = make_response(404, {"message": "not found"})
+        with pytest.raises(ResourceNotFoundError):
+            api.delete("/me")
+        m_req.return_value = make_response(body={"name": "me"})
+        api.get("/me")
+        assert m_req.call_count == 5
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_revalidation(self, m_time_delta, m_req):
+        validators = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        m_req.return_value = make_response(body=["record"], headers=validators)
+        cache = ResponseCache(ttl=0.01)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+
+        records = api.get("/domain/zone/example.com/record")
+        assert records == ["record"]
+        assert "If-None-Match" not in m_req.call_args[1]["headers"]
+
+        # expired: revalidated with a conditional request, the body is not decoded again
+        time.sleep(0.02)
+        m_req.return_value = make_response(304)
+        assert api.get("/domain/zone/example.com/record") is records
+        headers = m_req.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert m_req.return_value.json.called is False
+        assert cache.stats["revalidations"] == 1
+
+        # revalidated entries are fresh again
+        assert api.get("/domain/zone/example.com/record") is records
+        assert m_req.call_count == 2
+
+        # modified: replaced by the new value
+        time.sleep(0.02)
+        m_req.return_value = make_response(body=["new record"], headers={"ETag": '"v2"'})
+        assert api.get("/domain/zone/example.com/record") == ["new record"]
+        time.sleep(0.02)
+        m_req.return_value = make_response(304)
+        assert api.get("/domain/zone/example.com/record") == ["new record"]
+        assert m_req.call_args[1]["headers"]["If-None-Match"] == '"v2"'
+        assert "If-Modified-Since" not in m_req.call_args[1]["headers"]
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_no_validators(self, m_time_delta, m_req):
+        m_req.return_value = make_response(body={"name": "me"})
+        cache = ResponseCache(ttl=0.01)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+
+        api.get("/me")
+        time.sleep(0.02)
+        api.get("/me")
+        assert "If-None-Match" not in m_req.call_args[1]["headers"]
+        assert "If-Modified-Since" not in m_req.call_args[1]["headers"]
+        assert m_req.call_count == 2
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_stale_while_revalidate(self, m_time_delta, m_req):
+        release = threading.Event()
+        calls = []
+
+        def request(method, url, headers, data, timeout):
+            calls.append(threading.current_thread().name)
+            if len(calls) > 1:
+                release.wait(5)
+            return make_response(body={"version": len(calls)})
+
+        m_req.side_effect = request
+        cache = ResponseCache(ttl=0.05, stale_ttls={"/me": 0.5})
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+        assert api.get("/me") == {"version": 1}
+
+        # stale: served at once while a single refresh runs in the background
+        time.sleep(0.06)
+        for _ in range(10):
+            assert api.get("/me") == {"version": 1}
+        assert cache.stats["stale_hits"] == 10
+        assert cache.stats["refreshes"] == 1
+
+        release.set()
+        for _ in range(100):
+            if api.get("/me") == {"version": 2}:
+                break
+            time.sleep(0.01)
+        assert api.get("/me") == {"version": 2}
+        assert len(calls) == 2
+        assert calls[1].startswith("ovh-cache-refresh")
+
+        # once the stale window is over, callers wait for the API
+        time.sleep(0.6)
+        assert api.get("/me") == {"version": 3}
+        assert calls[2] == threading.current_thread().name
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_stale_refresh_failure(self, m_time_delta, m_req):
+        m_req.return_value = make_response(body={"name": "me"})
+        cache = ResponseCache(ttl=0.01, stale_ttl=0.3)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+        api.get("/me")
+
+        m_req.return_value = make_response(404, {"message": "not found"})
+        time.sleep(0.02)
+        assert api.get("/me") == {"name": "me"}
+        for _ in range(100):
+            if not cache._refreshing:
+                break
+            time.sleep(0.01)
+        assert cache._refreshing == set()
+        assert m_req.call_count == 2
+
+        # the failed refresh leaves the stale entry in place
+        assert api.get("/me") == {"name": "me"}
+        # and the refresh it starts again does not outlive the test
+        api._refresh_workers.shutdown(wait=True)
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_negative_cache(self, m_time_delta, m_req):
+        m_req.return_value = make_response(404, {"message": "not found"})
+        cache = ResponseCache(negative_ttl=60, negative_statuses=(404, 460))
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+
+        errors = []
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundError) as e:
+                api.get("/dedicated/server/gone")
+            errors.append(e.value)
+        assert m_req.call_count == 1
+        assert cache.stats["negative_hits"] == 2
+        assert str(errors[2]) == "not found"
+        assert errors[2] is not errors[1]
+        assert errors[2].response is errors[0].response
+
+        m_req.return_value = make_response(460, {"message": "expired"})
+        with pytest.raises(ResourceExpiredError):
+            api.get("/dedicated/server/expired")
+        with pytest.raises(ResourceExpiredError):
+            api.get("/dedicated/server/expired")
+        assert m_req.call_count == 2
+
+        # other errors are never cached
+        m_req.return_value = make_response(400, {"message": "bad"})
+        for _ in range(2):
+            with pytest.raises(BadParametersError):
+                api.get("/dedicated/server/bad")
+        assert m_req.call_count == 4
+
+        # creating the resource invalidates the cached error
+        m_req.return_value = make_response(body={"name": "gone"})
+        api.post("/dedicated/server/gone", name="gone")
+        assert api.get("/dedicated/server/gone") == {"name": "gone"}
+        assert m_req.call_count == 6
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_negative_cache_disabled(self, m_time_delta, m_req):
+        m_req.return_value = make_response(404, {"message": "not found"})
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=ResponseCache())
+
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                api.get("/dedicated/server/gone")
+        assert m_req.call_count == 2
+
+
+STORES = ["memory", "sqlite", "sqlite-zstd", "remote"]
+
+
+class TestCacheStores:
+    @pytest.mark.parametrize("kind", STORES)
+    def test_store(self, kind, tmp_path):
+        cache = ResponseCache(store=make_store(kind, tmp_path), negative_ttl=60)
+        cache.set(("id", URL + "/me"), {"name": "me", "list": [1, 2.5, None, True]}, 10, 60, etag='"v1"')
+        cache.set(("other", URL + "/me"), {"name": "other"}, 10, 60)
+        cache.set(("id", URL + "/me/bill?date.from=2024-01-01"), ["BILL1"], 10, 60)
+
+        assert cache.get(("id", URL + "/me")) == {"name": "me", "list": [1, 2.5, None, True]}
+        assert cache.get(("other", URL + "/me")) == {"name": "other"}
+        assert cache.get_entry(("id", URL + "/me")).etag == '"v1"'
+        assert cache.get(("id", URL + "/me/bill?date.from=2024-01-01")) == ["BILL1"]
+        assert cache.get(("id", URL + "/missing")) is MISS
+        assert len(cache) == 3
+        assert cache.bytes == 30
+
+        # errors survive serialization
+        cache.set(("id", URL + "/gone"), ResourceNotFoundError("not found"), 10, 60)
+        with pytest.raises(ResourceNotFoundError) as e:
+            cache.get(("id", URL + "/gone"))
+        assert str(e.value) == "not found"
+
+        cache.invalidate(URL + "/me")
+        assert cache.get(("id", URL + "/me")) is MISS
+        assert cache.get(("other", URL + "/me")) is MISS
+        assert cache.get(("id", URL + "/me/bill?date.from=2024-01-01")) is MISS
+        assert cache.stats["invalidations"] == 3
+        assert len(cache) == 1
+
+        cache.clear()
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_store_lru(self, kind, tmp_path):
+        cache = ResponseCache(store=make_store(kind, tmp_path, max_bytes=100))
+        cache.set(("id", "a"), "a", 40, 60)
+        time.sleep(0.01)
+        cache.set(("id", "b"), "b", 40, 60)
+        time.sleep(0.01)
+        cache.store.TOUCH_DELAY = 0
+        assert cache.get(("id", "a")) == "a"
+        time.sleep(0.01)
+
+        cache.set(("id", "c"), "c", 40, 60)
+        assert cache.get(("id", "b")) is MISS
+        assert cache.get(("id", "a")) == "a"
+        assert cache.get(("id", "c")) == "c"
+        assert cache.bytes == 80
+        assert cache.stats["evictions"] == 1
+
+        cache.set(("id", "d"), "d", 101, 60)
+        assert cache.get(("id", "d")) is MISS
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite", "remote"])
+    def test_store_revalidated(self, kind, tmp_path):
+        cache = ResponseCache(store=make_store(kind, tmp_path))
+        cache.set(("id", URL + "/me"), {"name": "me"}, 10, 0.01, etag='"v1"')
+        time.sleep(0.02)
+
+        # expired entries with validators are kept for revalidation
+        entry = cache.get_entry(("id", URL + "/me"))
+        assert entry.is_fresh() is False
+        cache.revalidated(("id", URL + "/me"), entry, 60)
+        assert cache.get(("id", URL + "/me")) == {"name": "me"}
+
+    def test_sqlite_warm_start(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        ResponseCache(store=SQLiteStore(path, compression="zlib")).set(("id", URL + "/me"), {"name": "me"}, 10, 60)
+
+        # e.g. after a restart
+        cache = ResponseCache(store=SQLiteStore(path, compression="zlib"))
+        assert cache.get(("id", URL + "/me")) == {"name": "me"}
+
+    def test_sqlite_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        SQLiteStore(path)
+        processes = [multiprocessing.Process(target=_worker, args=(path, worker)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        assert [process.exitcode for process in processes] == [0] * 4
+
+        cache = ResponseCache(store=SQLiteStore(path))
+        assert cache.get(("id", URL + "/item/49"))["i"] == 49
+
+    def test_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteStore(str(tmp_path / "cache.sqlite"), compression="lzma")
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_client_shared_store(self, m_time_delta, m_req, tmp_path):
+        res = m_req.return_value
+        res.status_code = 200
+        res.content = json.dumps({"name": "me"}).encode()
+        res.headers = {}
+        path = str(tmp_path / "cache.sqlite")
+
+        cache = ResponseCache(store=SQLiteStore(path))
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+        assert api.get("/me") == {"name": "me"}
+
+        # another worker of the same host
+        cache = ResponseCache(store=SQLiteStore(path))
+        other = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, cache=cache)
+        assert other.get("/me") == {"name": "me"}
+        assert m_req.call_count == 1
@@ -0,0 +1,122 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import math
+import pickle
+from unittest import mock
+
+import pytest
+
+from ovh import codec
+from ovh.client import Client
+from ovh.codec import JSONCodec, OrjsonCodec, get_codec
+
+CODECS = [codec_class() for codec_class in codec._CODECS if codec._installed(codec_class)]
+
+PAYLOADS = [
+    b'{"nichandle":"xx1234-ovh","currency":{"code":"EUR"},"state":"complete","kycValidated":true}',
+    b'[1, -2, 3.5, 1e+16, -0.0, null, false, "\\u00e9", "\xc3\xa9", "\\ud83d\\ude00"]',
+    b"[18446744073709551615, -9223372036854775808, 123456789012345678901234567890]",
+    b"[NaN, Infinity, -Infinity]",
+    b'{"a": 1, "a": 2}',
+    b"  42  ",
+]
+
+
+class TestCodecs:
+    @pytest.mark.parametrize("json_codec", CODECS, ids=lambda json_codec: json_codec.name)
+    @pytest.mark.parametrize("raw", PAYLOADS)
+    def test_loads(self, json_codec, raw):
+        expected = json.loads(raw)
+        decoded = json_codec.loads(raw)
+        assert repr(decoded) == repr(expected)
+        assert json.dumps(decoded) == json.dumps(expected)
+
+    @pytest.mark.parametrize("json_codec", CODECS, ids=lambda json_codec: json_codec.name)
+    @pytest.mark.parametrize("raw", [b"", b"<html>", b"[1,", b'["\xff"]'])
+    def test_loads_invalid(self, json_codec, raw):
+        with pytest.raises(ValueError):
+            json_codec.loads(raw)
+
+    @pytest.mark.parametrize("json_codec", CODECS, ids=lambda json_codec: json_codec.name)
+    def test_dumps(self, json_codec):
+        data = {"description": "ovh-é ☃", "ttl": 1e16, "ratio": 1e-7, "id": 2**70, "rules": [{"path": "/me/*"}]}
+        assert json_codec.dumps(data) == json.dumps(data, separators=(",", ":"))
+        assert json_codec.dumps(data) == (
+            '{"description":"ovh-\\u00e9 \\u2603","ttl":1e+16,"ratio":1e-07,'
+            '"id":1180591620717411303424,"rules":[{"path":"/me/*"}]}'
+        )
+
+    def test_get_codec(self):
+        assert get_codec().name == CODECS[0].name
+        assert isinstance(get_codec("json"), JSONCodec)
+
+        with mock.patch("ovh.codec.orjson", None):
+            with pytest.raises(ImportError, match="pip install orjson"):
+                get_codec("orjson")
+            assert get_codec().name != "orjson"
+
+        with mock.patch.multiple("ovh.codec", orjson=None, simdjson=None, ujson=None):
+            assert type(get_codec()) is JSONCodec
+
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+    @mock.patch("ovh.codec.orjson")
+    def test_fallback(self, m_orjson):
+        m_orjson.loads.return_value = "fast"
+        json_codec = OrjsonCodec()
+        assert json_codec.loads(b"[1, 2]") == "fast"
+
+        # large integers are left to the standard library
+        assert json_codec.loads(b"[12345678901234567890]") == [12345678901234567890]
+        assert m_orjson.loads.call_count == 1
+
+        # so are the bodies rejected by the faster library
+        m_orjson.loads.side_effect = ValueError
+        assert math.isnan(json_codec.loads(b"[NaN]")[0])
+        assert json_codec.loads(b'{"a": 1}') == {"a": 1}
+
+    @mock.patch("ovh.client.Session.request")
+    def test_client(self, m_req):
+        m_res = m_req.return_value
+        m_res.status_code = 200
+        m_res.content = b'{"id": 1}'
+
+        api = Client("ovh-eu", "AK", "AS", json_codec="json")
+        assert type(api._json_codec) is JSONCodec
+        assert api.get("/me", _need_auth=False) == {"id": 1}
+        assert type(pickle.loads(pickle.dumps(api))._json_codec) is JSONCodec
+
+        json_codec = mock.Mock()
+        json_codec.loads.return_value = "decoded"
+        json_codec.dumps.return_value = '{"custom":true}'
+        api = Client("ovh-eu", "AK", "AS", json_codec=json_codec)
+        assert api.post("/me", _need_auth=False, name="x") == "decoded"
+        json_codec.loads.assert_called_once_with(b'{"id": 1}')
+        json_codec.dumps.assert_called_once_with({"name": "x"})
+        assert m_req.call_args[1]["data"] == '{"custom":true}'
@@ -0,0 +1,218 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+import pytest
+
+from ovh.compression import Compression, supported_encodings
+
+from tests import make_client
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+RECORDS = [
+    {"id": i, "fieldType": "A", "subDomain": "host-%d" % i, "target": "10.0.0.%d" % (i % 256)} for i in range(500)
+]
+
+
+def chunked(body, size=1000):
+    """Frame ``body`` with the chunked transfer encoding"""
+    chunks = []
+    for start in range(0, len(body), size):
+        end = start + size
+        chunks.append(b"%x\r\n%s\r\n" % (len(body[start:end]), body[start:end]))
+    return chunks + [b"0\r\n\r\n"]
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Minimal local stand-in of the API, gzipping its responses on demand"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.endswith("/chunked"):
+            self.respond_chunked(json.dumps(RECORDS).encode())
+        else:
+            self.respond(json.dumps(RECORDS).encode())
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        body = gzip.decompress(raw) if self.headers.get("Content-Encoding") == "gzip" else raw
+        url = "http://%s:%d%s" % (self.server.server_address + (self.path,))
+        signature = hashlib.sha1(
+            "+".join([MockApplicationSecret, MockConsumerKey, "POST", url, ""]).encode()
+            + body
+            + ("+" + self.headers["X-Ovh-Timestamp"]).encode()
+        )
+        self.respond(
+            json.dumps(
+                {
+                    "encoding": self.headers.get("Content-Encoding"),
+                    "size": len(raw),
+                    "body": json.loads(body),
+                    "signed": self.headers["X-Ovh-Signature"] == "$1$" + signature.hexdigest(),
+                }
+            ).encode()
+        )
+
+    def respond(self, body):
+        self.server.accept_encodings.append(self.headers.get("Accept-Encoding"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond_chunked(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunked(gzip.compress(body, mtime=0)):
+            self.wfile.write(chunk)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.accept_encodings = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestCompression:
+    def test_supported_encodings(self):
+        assert "gzip" in supported_encodings()
+        assert Compression().encodings == supported_encodings()
+        assert Compression(["gzip"]).accept_encoding == "gzip"
+        assert Compression([]).accept_encoding == "identity"
+        with pytest.raises(ValueError):
+            Compression(["gzip", "lzma"])
+
+    def test_compressed_responses(self, server):
+        transfers = []
+        compression = Compression(["gzip"], on_transfer=transfers.append)
+        api = make_client(server, compression=compression)
+
+        assert api.get("/domain/zone/example.com/record") == RECORDS
+        assert server.accept_encodings == ["gzip"]
+        (transfer,) = transfers
+        assert transfer.method == "GET"
+        assert transfer.status == 200
+        assert transfer.encoding == "gzip"
+        assert transfer.decoded_bytes == len(json.dumps(RECORDS))
+        assert transfer.wire_bytes == len(gzip.compress(json.dumps(RECORDS).encode()))
+        assert transfer.wire_bytes * 5 < transfer.decoded_bytes
+
+        # streamed responses are decompressed while they are read
+        assert list(api.iter_get("/domain/zone/example.com/record", chunk_size=1024)) == RECORDS
+        assert transfers[1] == transfer
+
+        assert compression.stats == {
+            "responses": 2,
+            "wire_bytes": 2 * transfer.wire_bytes,
+            "decoded_bytes": 2 * transfer.decoded_bytes,
+            "request_wire_bytes": 0,
+        }
+
+    @pytest.mark.parametrize("transport", ["requests", "urllib3"])
+    def test_chunked_responses(self, server, transport):
+        transfers = []
+        compression = Compression(["gzip"], on_transfer=transfers.append)
+        api = make_client(server, compression=compression, transport=transport)
+
+        # without Content-Length, the bytes are counted as they are read
+        wire_bytes = len(b"".join(chunked(gzip.compress(json.dumps(RECORDS).encode(), mtime=0))))
+        assert api.get("/domain/zone/example.com/record/chunked") == RECORDS
+        assert list(api.iter_get("/domain/zone/example.com/record/chunked", chunk_size=1024)) == RECORDS
+        assert [transfer.wire_bytes for transfer in transfers] == [wire_bytes, wire_bytes]
+        assert transfers[0].decoded_bytes == len(json.dumps(RECORDS))
+
+        # and are still the body size with one
+        assert api.get("/domain/zone/example.com/record") == RECORDS
+        assert transfers[2].wire_bytes == len(gzip.compress(json.dumps(RECORDS).encode()))
+
+    def test_uncompressed_responses(self, server):
+        transfers = []
+        api = make_client(server, compression=Compression([], on_transfer=transfers.append))
+        assert api.get("/domain/zone/example.com/record") == RECORDS
+        assert server.accept_encodings == ["identity"]
+        assert transfers[0].encoding == "identity"
+        assert transfers[0].wire_bytes == transfers[0].decoded_bytes
+
+    def test_compressed_requests(self, server):
+        compression = Compression(["gzip"], request_min_size=1024)
+        api = make_client(server, compression=compression)
+
+        # large bodies are compressed, and signed before compression
+        rules = [{"method": "GET", "path": "/domain/zone/example-%d.com/*" % i} for i in range(100)]
+        result = api.post("/me/api/credential", accessRules=rules)
+        assert result["encoding"] == "gzip"
+        assert result["body"] == {"accessRules": rules}
+        assert result["signed"] is True
+        assert result["size"] * 5 < len(json.dumps(result["body"]))
+        assert compression.stats["compressed_requests"] == 1
+        assert compression.stats["request_wire_bytes"] == result["size"]
+
+        # small ones are not
+        result = api.post("/me/api/credential", accessRules=rules[:1])
+        assert result["encoding"] is None
+        assert result["signed"] is True
+        assert compression.stats["compressed_requests"] == 1
+
+        # prepared calls compress their body once
+        prepared = api.prepare("POST", "/me/api/credential", {"accessRules": rules})
+        for _ in range(2):
+            result = prepared()
+            assert result["encoding"] == "gzip"
+            assert result["signed"] is True
+        assert compression.stats["compressed_requests"] == 2
+
+    def test_disabled(self, server):
+        api = make_client(server)
+        assert api.get("/domain/zone/example.com/record") == RECORDS
+        # left to requests
+        assert "gzip" in server.accept_encodings[0]
+        assert api._compression is None
+        assert make_client(server, compression=True)._compression.encodings == supported_encodings()
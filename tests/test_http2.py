@@ -0,0 +1,245 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import pickle
+import subprocess
+import sys
+import threading
+from unittest import mock
+
+import httpx
+import pytest
+import requests
+
+from ovh.client import Client
+from ovh.http2 import HTTP2Adapter
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+
+class MockAdapter(HTTP2Adapter):
+    """HTTP2Adapter sending its requests to ``handler`` rather than over the network"""
+
+    def __init__(self, handler, http_version=b"HTTP/2", **kwargs):
+        super().__init__(**kwargs)
+        self.handler = handler
+        self.http_version = http_version
+
+    def _new_client(self):
+        def handle(request):
+            response = self.handler(request)
+            response.extensions["http_version"] = self.http_version
+            return response
+
+        client = httpx.Client(transport=httpx.MockTransport(handle))
+        # only send the headers of the requests
+        client.headers.clear()
+        return client
+
+
+def echo(request):
+    return httpx.Response(
+        200,
+        json={"method": request.method, "url": str(request.url), "headers": dict(request.headers)},
+        headers={"X-Request-Id": "42"},
+    )
+
+
+class TestHTTP2Adapter:
+    def test_send(self):
+        adapter = MockAdapter(echo)
+        session = requests.Session()
+        session.mount("https://", adapter)
+
+        response = session.get("https://eu.api.ovh.com/1.0/me", headers={"Connection": "keep-alive"})
+        assert response.status_code == 200
+        assert response.headers["x-request-id"] == "42"
+        body = response.json()
+        assert body["method"] == "GET"
+        assert body["url"] == "https://eu.api.ovh.com/1.0/me"
+        # connection-specific headers are not sent over HTTP/2
+        assert "connection" not in body["headers"]
+
+        # the stream is released once the body is read
+        session.get("https://eu.api.ovh.com/1.0/me")
+        assert adapter.stats == {"connections": 1, "requests": 2}
+        assert [connection.streams for connection in adapter._connections["https", "eu.api.ovh.com", None]] == [0]
+
+    def test_client(self):
+        def handler(request):
+            assert request.headers["X-Ovh-Consumer"] == MockConsumerKey
+            if request.url.path == "/1.0/me/bill":
+                return httpx.Response(200, json=["0001", "0002"])
+            return httpx.Response(200, json={"path": request.url.path})
+
+        adapter = MockAdapter(handler)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, adapter=adapter)
+        api._time_delta = 0
+        assert api.get("/me") == {"path": "/1.0/me"}
+        assert list(api.iter_get("/me/bill")) == ["0001", "0002"]
+        assert adapter.stats["requests"] == 2
+
+    def test_http2_option(self):
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, http2=True)
+        assert isinstance(api._session.get_adapter("https://eu.api.ovh.com/1.0/me"), HTTP2Adapter)
+        api = pickle.loads(pickle.dumps(api))
+        assert isinstance(api._session.get_adapter("https://eu.api.ovh.com/1.0/me"), HTTP2Adapter)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret)
+        assert not isinstance(api._session.get_adapter("https://eu.api.ovh.com/1.0/me"), HTTP2Adapter)
+
+    def test_lazy_import(self):
+        # httpx is only imported by the clients using HTTP/2
+        code = (
+            "import sys, ovh; ovh.Client('ovh-eu', 'key', 'secret'); assert 'httpx' not in sys.modules;"
+            " ovh.Client('ovh-eu', 'key', 'secret', http2=True); assert 'httpx' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_streams(self):
+        started = threading.Barrier(4)
+        done = threading.Event()
+
+        def handler(request):
+            if request.url.path != "/wait":
+                started.wait()
+                done.wait()
+            return httpx.Response(200, json=True)
+
+        adapter = MockAdapter(handler, max_connections=2, max_streams=2)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        threads = [threading.Thread(target=session.get, args=("https://example.com/",)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+
+        # new connections are opened only once the others are full
+        connections = adapter._connections["https", "example.com", None]
+        assert adapter.stats["connections"] == 2
+        assert sorted(connection.streams for connection in connections) == [1, 2]
+
+        # then requests go to the least busy connection
+        waiter = threading.Thread(target=session.get, args=("https://example.com/wait",))
+        waiter.start()
+        waiter.join()
+        assert adapter.stats["waits"] == 0
+
+        done.set()
+        for thread in threads:
+            thread.join()
+        assert adapter.stats["connections"] == 2
+        assert sorted(connection.streams for connection in connections) == [0, 0]
+
+    def test_wait(self):
+        release = threading.Event()
+
+        def handler(request):
+            release.wait()
+            return httpx.Response(200, json=True)
+
+        adapter = MockAdapter(handler, max_connections=1, max_streams=1)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        threads = [threading.Thread(target=session.get, args=("https://example.com/",)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while not adapter.stats["waits"]:
+            threads[0].join(0.01)
+
+        # the second request waits for a free stream rather than opening a connection
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert adapter.stats == {"connections": 1, "requests": 2, "waits": 1}
+
+    @mock.patch("requests.adapters.HTTPAdapter.send")
+    def test_fallback(self, m_send):
+        m_send.return_value = http1_response = requests.Response()
+        http1_response.status_code = 200
+        adapter = MockAdapter(echo, http_version=b"HTTP/1.1")
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # the first response tells the host does not speak HTTP/2
+        assert session.get("https://example.com/").status_code == 200
+        assert adapter.stats["fallbacks"] == 1
+        assert m_send.call_count == 0
+        assert session.get("https://example.com/") is http1_response
+        assert m_send.call_count == 1
+
+        # plain http is only spoken over HTTP/2 with prior knowledge
+        assert session.get("http://example.net/") is http1_response
+        assert m_send.call_count == 2
+        adapter.prior_knowledge = True
+        adapter.http_version = b"HTTP/2"
+        assert session.get("http://example.net/").status_code == 200
+        assert m_send.call_count == 2
+
+    def test_errors(self):
+        def handler(request):
+            raise {
+                "/connect": httpx.ConnectTimeout("connect"),
+                "/read": httpx.ReadTimeout("read"),
+                "/reset": httpx.RemoteProtocolError("reset"),
+                "/bug": RuntimeError("bug"),
+            }[request.url.path]
+
+        adapter = MockAdapter(handler)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            session.get("https://example.com/connect")
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            session.get("https://example.com/read")
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get("https://example.com/reset")
+        with pytest.raises(RuntimeError):
+            session.get("https://example.com/bug")
+
+        # the streams are released on errors
+        assert [connection.streams for connection in adapter._connections["https", "example.com", None]] == [0]
+
+    def test_timeout(self):
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, content=json.dumps(True).encode())
+
+        adapter = MockAdapter(handler)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.get("https://example.com/", timeout=(1, 2))
+        session.get("https://example.com/", timeout=3)
+        assert timeouts == [
+            {"connect": 1, "read": 2, "write": 2, "pool": 2},
+            {"connect": 3, "read": 3, "write": 3, "pool": 3},
+        ]
@@ -0,0 +1,167 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import email.utils
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from ovh import config
+from ovh.cache import ResponseCache
+from ovh.exceptions import InvalidRegion
+from ovh.http2 import HTTP2Adapter
+from ovh.pool import ClientPool
+from ovh.timesync import TimeDeltaCache
+
+from tests import make_response
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockServerTime = 1457018875
+
+
+def response(url, **kwargs):
+    return make_response(body=MockServerTime if url.endswith("/auth/time") else {"url": url})
+
+
+class TestClientPool:
+    @mock.patch("ovh.client.Session.request", side_effect=lambda method, url, **kwargs: response(url))
+    def test_clients(self, m_req):
+        with mock.patch.object(config, "ConfigurationManager", wraps=config.ConfigurationManager) as m_config:
+            pool = ClientPool("ovh-eu", MockApplicationKey, MockApplicationSecret, pool_maxsize=4)
+            clients = [pool.client("consumer_key_%d" % i) for i in range(100)]
+
+            # the configuration is read once
+            assert m_config.call_count == 1
+
+        # the time delta is queried once per endpoint
+        assert m_req.call_count == 1
+        assert {client._time_delta for client in clients} == {pool._time_deltas.get("https://eu.api.ovh.com/1.0")}
+        ca_clients = [pool.client("consumer_key", endpoint="ovh-ca") for _ in range(3)]
+        assert m_req.call_count == 2
+        assert m_req.call_args[0][1] == "https://ca.api.ovh.com/1.0/auth/time"
+
+        # the clients share a bounded pool of connections
+        for client in clients + ca_clients:
+            assert client._session.get_adapter("https://eu.api.ovh.com/1.0/me") is pool.adapter
+        assert pool.adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+        assert pool.adapter.poolmanager.connection_pool_kw["block"] is True
+
+        # each client signs its requests with its own credentials
+        assert clients[7].get("/me") == {"url": "https://eu.api.ovh.com/1.0/me"}
+        headers = m_req.call_args[1]["headers"]
+        assert headers["X-Ovh-Application"] == MockApplicationKey
+        assert headers["X-Ovh-Consumer"] == "consumer_key_7"
+        assert m_req.call_count == 3
+
+        with pytest.raises(InvalidRegion):
+            pool.client("consumer_key", endpoint="ovh-mars")
+
+    @mock.patch("ovh.client.Session.request")
+    def test_options(self, m_req):
+        cache = ResponseCache()
+        pool = ClientPool("ovh-eu", cache=cache, timeout=(1, 2))
+
+        # OAuth2 clients do not need the time delta
+        client = pool.client(client_id="oauth2_id", client_secret="oauth2_secret")
+        assert m_req.call_count == 0
+        assert client._cache is cache
+        assert client._timeout == (1, 2)
+        assert client._application_key is None
+        client._oauth2._token = {"access_token": "MTQ0NjJkZmQ5OTM2NDE1ZTZjNGZmZjI3", "token_type": "Bearer"}
+        assert client._oauth2.session.get_adapter("https://eu.api.ovh.com/1.0/me") is pool.adapter
+
+        # parameters default to those of the pool, then to the configuration
+        with mock.patch.dict(os.environ, {"OVH_APPLICATION_KEY": "env_key", "OVH_APPLICATION_SECRET": "env_secret"}):
+            pool = ClientPool("ovh-eu", application_secret="secret")
+            pool._time_deltas.set("https://eu.api.ovh.com/1.0", 0)
+            client = pool.client("consumer_key")
+            assert (client._application_key, client._application_secret) == ("env_key", "secret")
+            client = pool.client("consumer_key", application_key="key")
+            assert client._application_key == "key"
+
+    @mock.patch("ovh.client.Session.request")
+    def test_time_delta_resync(self, m_req, tmp_path):
+        drift = 0
+
+        def request(method, url, headers, **kwargs):
+            server_time = time.time() + drift
+            date = {"Date": email.utils.formatdate(server_time, usegmt=True)}
+            if url.endswith("/auth/time"):
+                return make_response(body=int(server_time), headers=date)
+            if abs(int(headers["X-Ovh-Timestamp"]) - server_time) > 5:
+                return make_response(400, {"errorCode": "QUERY_TIME_OUT", "message": "Query out of time"}, date)
+            return make_response(body={"url": url}, headers=date)
+
+        m_req.side_effect = request
+        cache = TimeDeltaCache(str(tmp_path))
+        pool = ClientPool("ovh-eu", MockApplicationKey, MockApplicationSecret, time_delta_cache=cache)
+        client = pool.client("consumer_key_1")
+        assert abs(client._time_delta) <= 1
+
+        # the clock drifts, the first client syncs its time delta again
+        drift = 1000
+        assert client.get("/me") == {"url": "https://eu.api.ovh.com/1.0/me"}
+        assert abs(client._time_delta - drift) <= 1
+
+        # and the clients built next sign their calls with the new one
+        calls = m_req.call_count
+        other = pool.client("consumer_key_2")
+        assert other._time_delta == client._time_delta
+        assert other.get("/me") == {"url": "https://eu.api.ovh.com/1.0/me"}
+        assert m_req.call_count == calls + 1
+        assert cache.get("https://eu.api.ovh.com/1.0") == client._time_delta
+
+    def test_http2(self):
+        pool = ClientPool("ovh-eu", MockApplicationKey, MockApplicationSecret, http2=True)
+        pool._time_deltas.set("https://eu.api.ovh.com/1.0", 0)
+        assert isinstance(pool.adapter, HTTP2Adapter)
+
+        # the clients multiplex their requests over the connections of the pool
+        for client in [pool.client("consumer_key_%d" % i) for i in range(3)]:
+            assert client._session.get_adapter("https://eu.api.ovh.com/1.0/me") is pool.adapter
+        pool._after_fork()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        pool = ClientPool("ovh-eu", MockApplicationKey, MockApplicationSecret)
+        poolmanager = pool.adapter.poolmanager
+
+        # the child process must not reuse the connections of the parent
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.write(write, bytes([pool.adapter.poolmanager is not poolmanager]))
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert os.read(read, 1) == bytes([True])
+        os.close(read)
+        os.close(write)
+        assert pool.adapter.poolmanager is poolmanager
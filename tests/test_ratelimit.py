@@ -0,0 +1,228 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import multiprocessing
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from ovh.client import Client
+from ovh.exceptions import APIError
+from ovh.ratelimit import (
+    PER_CONSUMER,
+    MemoryBucketStore,
+    RateLimiter,
+    RemoteBucketStore,
+    SQLiteBucketStore,
+)
+
+from tests import FakeRedis, locks_held, make_response, run_in_child
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+
+def make_store(kind, tmp_path):
+    if kind == "memory":
+        return MemoryBucketStore()
+    if kind == "sqlite":
+        return SQLiteBucketStore(str(tmp_path / "ratelimit.sqlite"))
+    if kind == "remote":
+        return RemoteBucketStore(FakeRedis())
+    raise ValueError(kind)
+
+
+def _worker(path):
+    """Concurrently share a SQLite bucket between processes"""
+    limiter = RateLimiter(rate=0.001, burst=20, store=SQLiteBucketStore(path))
+    return sum(1 for _ in range(10) if not limiter.try_acquire("key"))
+
+
+class FakeClock:
+    """time.time and time.sleep stand-ins, sleeping moves the clock forward"""
+
+    def __init__(self, now=1000):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class TestRateLimiter:
+    def test_init(self):
+        limiter = RateLimiter(10)
+        assert limiter.burst == 10
+        assert isinstance(limiter.store, MemoryBucketStore)
+
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+        with pytest.raises(ValueError):
+            RateLimiter(10, per="ip")
+
+    @mock.patch("time.time")
+    def test_token_bucket(self, m_time):
+        m_time.return_value = 1000
+        limiter = RateLimiter(rate=2, burst=3)
+
+        # the bucket starts full
+        assert [limiter.try_acquire("key") for _ in range(4)] == [0, 0, 0, 0.5]
+        assert limiter.try_acquire("other") == 0
+
+        # tokens are added at the given rate, up to the burst size
+        m_time.return_value = 1000.25
+        assert limiter.try_acquire("key") == 0.25
+        m_time.return_value = 1000.5
+        assert limiter.try_acquire("key") == 0
+        m_time.return_value = 1100
+        assert [limiter.try_acquire("key") for _ in range(4)] == [0, 0, 0, 0.5]
+
+        assert limiter.stats == {"acquired": 8, "waits": 3}
+
+    def test_acquire(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=4, burst=1)
+        with mock.patch("time.time", clock.time), mock.patch("time.sleep", clock.sleep):
+            for _ in range(3):
+                limiter.acquire("key")
+        assert clock.sleeps == [0.25, 0.25]
+        assert clock.now == 1000.5
+
+    @mock.patch("time.time")
+    def test_throttled(self, m_time):
+        m_time.return_value = 1000
+        limiter = RateLimiter(rate=10, pause=2)
+
+        limiter.throttled("key", make_response(429, headers={"Retry-After": "30"}))
+        assert limiter.try_acquire("key") == 30
+        assert limiter.try_acquire("other") == 0
+
+        # a shorter pause does not shorten the current one
+        m_time.return_value = 1010
+        limiter.throttled("key", make_response(429))
+        assert limiter.try_acquire("key") == 20
+
+        # the bucket is empty at the end of the pause
+        m_time.return_value = 1030
+        assert limiter.try_acquire("key") == 0.1
+        m_time.return_value = 1031
+        assert limiter.try_acquire("key") == 0
+        assert limiter.stats["throttled"] == 2
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite", "remote"])
+    @mock.patch("time.time", return_value=1000)
+    def test_stores(self, m_time, kind, tmp_path):
+        store = make_store(kind, tmp_path)
+        limiter = RateLimiter(rate=1, burst=50, store=store)
+        other = RateLimiter(rate=1, burst=50, store=store)
+
+        # limiters sharing a store share the buckets, from any thread
+        acquired = []
+
+        def worker(limiter):
+            acquired.extend(delay for delay in map(limiter.try_acquire, ["key"] * 20) if not delay)
+
+        threads = [threading.Thread(target=worker, args=(lim,)) for lim in [limiter, other] * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(acquired) == 50
+
+        other.throttled("key", make_response(429, headers={"Retry-After": "5"}))
+        m_time.return_value = 1002
+        assert limiter.try_acquire("key") == 3
+
+        if kind == "remote":
+            assert store.client.lock_calls == 82
+            assert list(store.client.data) == ["ovh:ratelimit:key"]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        limiter = RateLimiter(rate=10)
+
+        # the locks held in the parent are released in the child
+        with locks_held(limiter._lock, limiter.store._lock):
+            assert run_in_child(lambda: limiter.try_acquire("key") == 0)
+
+    def test_sqlite_processes(self, tmp_path):
+        path = str(tmp_path / "ratelimit.sqlite")
+        with multiprocessing.Pool(4) as pool:
+            assert sum(pool.map(_worker, [path] * 4)) == 20
+
+
+class TestClientRateLimiter:
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_rate_limit(self, m_time_delta, m_req):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1, burst=2)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, rate_limiter=limiter)
+        other = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, "other", rate_limiter=limiter)
+
+        m_req.return_value = make_response(200)
+        with mock.patch("time.time", clock.time), mock.patch("time.sleep", clock.sleep):
+            # clients using the same application key share a bucket
+            api.get("/me")
+            other.get("/me")
+            api.get("/me")
+            assert clock.sleeps == [1]
+
+            # when a client is throttled, all of them pause
+            m_req.return_value = make_response(429, headers={"Retry-After": "10"})
+            with pytest.raises(APIError):
+                other.get("/me")
+            m_req.return_value = make_response(200)
+            api.get("/me")
+            assert clock.sleeps == [1, 1, 10, 1]
+
+        # the bucket is empty after the pause, and requests are signed once a
+        # token is acquired
+        assert m_req.call_args[1]["headers"]["X-Ovh-Timestamp"] == "1013"
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_per_consumer(self, m_time_delta, m_req):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1, burst=1, per=PER_CONSUMER)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, rate_limiter=limiter)
+        other = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, "other", rate_limiter=limiter)
+
+        m_req.return_value = make_response(200)
+        with mock.patch("time.time", clock.time), mock.patch("time.sleep", clock.sleep):
+            api.get("/me")
+            other.get("/me")
+            assert clock.sleeps == []
+            api.get("/me")
+            assert clock.sleeps == [1]
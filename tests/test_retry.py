@@ -0,0 +1,175 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import itertools
+import os
+from unittest import mock
+
+import pytest
+import requests
+
+from ovh.client import Client
+from ovh.exceptions import APIError, HTTPError
+from ovh.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+from tests import locks_held, make_response, run_in_child
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("1.5") == 1.5
+        assert parse_retry_after("-1") == 0
+        assert parse_retry_after("garbage") is None
+        with mock.patch("time.time", return_value=1445412480):
+            assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT") == 10
+            assert parse_retry_after("Wed, 21 Oct 2015 07:27:00 GMT") == 0
+
+    @mock.patch("random.uniform", side_effect=lambda low, high: high)
+    def test_delay(self, m_uniform):
+        policy = RetryPolicy(max_attempts=5, backoff=1, max_backoff=5)
+
+        # exponential backoff, capped
+        assert [policy.delay("GET", attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, None]
+        assert policy.delay("get", 1, make_response(503)) == 1
+
+        # only idempotent methods, and retryable statuses
+        assert policy.delay("POST", 1) is None
+        assert policy.delay("GET", 1, make_response(404)) is None
+        assert RetryPolicy(methods=["POST"]).delay("POST", 1) == 0.5
+
+        # Retry-After is honored, unless too long
+        assert policy.delay("GET", 1, make_response(429, headers={"Retry-After": "3"})) == 3
+        assert policy.delay("GET", 1, make_response(429, headers={"Retry-After": "0"})) == 1
+        assert policy.delay("GET", 1, make_response(429, headers={"Retry-After": "3600"})) is None
+        assert policy.stats["retries"] == 7
+
+    @mock.patch("random.uniform", side_effect=lambda low, high: low)
+    def test_full_jitter(self, m_uniform):
+        assert RetryPolicy().delay("GET", 2) == 0
+        m_uniform.assert_called_once_with(0, 1.0)
+
+    @mock.patch("time.time", return_value=1000)
+    def test_budget(self, m_time):
+        budget = RetryBudget(ratio=0.1, min_per_second=0.2, window=10)
+
+        # 2 retries allowed without any call
+        assert [budget.try_withdraw() for _ in range(3)] == [True, True, False]
+
+        # each call deposits 0.1 retry
+        for _ in range(20):
+            budget.record_call()
+        assert [budget.try_withdraw() for _ in range(3)] == [True, True, False]
+
+        # deposits and withdrawals expire with the window
+        m_time.return_value = 1010
+        assert [budget.try_withdraw() for _ in range(3)] == [True, True, False]
+
+        policy = RetryPolicy(budget=budget)
+        assert policy.delay("GET", 1) is None
+        assert policy.stats == {"budget_exhausted": 1}
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        policy = RetryPolicy()
+
+        # the locks held in the parent are released in the child
+        with locks_held(policy._lock, policy.budget._lock):
+            assert run_in_child(lambda: policy.delay("GET", 1) is not None)
+
+
+class TestClientRetry:
+    @mock.patch("time.sleep")
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_retry(self, m_time_delta, m_req, m_sleep):
+        m_req.side_effect = [
+            requests.ConnectionError(),
+            make_response(503),
+            make_response(429, headers={"Retry-After": "2"}),
+            make_response(200, body={"name": "me"}),
+        ]
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, retry=RetryPolicy(4))
+
+        timestamps = itertools.count(1457018875)
+        with mock.patch("time.time", side_effect=lambda: next(timestamps)):
+            assert api.get("/me", param="value") == {"name": "me"}
+
+        assert m_req.call_count == 4
+        assert m_sleep.call_count == 3
+        assert m_sleep.call_args_list[2][0][0] >= 2
+
+        # each attempt is signed with a fresh timestamp
+        headers = [call[1]["headers"] for call in m_req.call_args_list]
+        assert len(set(h["X-Ovh-Timestamp"] for h in headers)) == 4
+        assert len(set(h["X-Ovh-Signature"] for h in headers)) == 4
+        assert all(call[0][1] == "https://eu.api.ovh.com/1.0/me?param=value" for call in m_req.call_args_list)
+
+    @mock.patch("time.sleep")
+    @mock.patch("ovh.client.Session.request")
+    def test_give_up(self, m_req, m_sleep):
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, retry=True)
+
+        # too many attempts: the last error is raised
+        m_req.return_value = make_response(503)
+        with pytest.raises(APIError):
+            api.get("/auth/time", _need_auth=False)
+        assert m_req.call_count == 3
+
+        m_req.reset_mock()
+        m_req.side_effect = requests.ConnectionError()
+        with pytest.raises(HTTPError):
+            api.get("/auth/time", _need_auth=False)
+        assert m_req.call_count == 3
+
+        # POST is not idempotent
+        m_req.reset_mock()
+        with pytest.raises(HTTPError):
+            api.post("/auth/credential", _need_auth=False)
+        assert m_req.call_count == 1
+
+        # nor are errors such as 404
+        m_req.reset_mock()
+        m_req.side_effect = None
+        m_req.return_value = make_response(404)
+        with pytest.raises(APIError):
+            api.get("/auth/time", _need_auth=False)
+        assert m_req.call_count == 1
+
+    @mock.patch("ovh.client.Session.request")
+    def test_no_retry(self, m_req):
+        m_req.return_value = make_response(503)
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret)
+        with pytest.raises(APIError):
+            api.get("/auth/time", _need_auth=False)
+        assert m_req.call_count == 1
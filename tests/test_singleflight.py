@@ -0,0 +1,168 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from ovh.client import Client
+from ovh.exceptions import ResourceNotFoundError
+from ovh.singleflight import SingleFlight
+
+from tests import make_response, run_in_child
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+
+
+def run_threads(functions):
+    """Run each of ``functions`` from its own thread, all at once, and collect results or exceptions"""
+    barrier = threading.Barrier(len(functions))
+    results = [None] * len(functions)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = functions[i]()
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(functions))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class TestSingleFlight:
+    def test_do(self):
+        flights = SingleFlight()
+        calls = []
+
+        def slow(value):
+            calls.append(value)
+            time.sleep(0.1)
+            return value
+
+        results = run_threads([lambda: flights.do("key", slow, {"name": "me"})] * 20)
+        assert calls == [{"name": "me"}]
+        assert all(result is results[0] for result in results)
+        assert flights.stats == {"calls": 1, "coalesced": 19}
+
+        # calls landed: next one is sent again
+        assert flights.do("key", slow, "again") == "again"
+        assert flights.stats["calls"] == 2
+
+    def test_errors(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ResourceNotFoundError("not found")
+
+        results = run_threads([lambda: flights.do("key", fail)] * 10)
+        assert all(isinstance(result, ResourceNotFoundError) for result in results)
+        assert len(set(map(id, results))) == 10
+        assert flights.stats == {"calls": 1, "coalesced": 9}
+        assert flights._flights == {}
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        flights = SingleFlight()
+        landed = threading.Event()
+        thread = threading.Thread(target=flights.do, args=("key", landed.wait))
+        thread.start()
+        while not flights._flights:
+            time.sleep(0.01)
+
+        # the call in flight in the parent never lands in the child
+        try:
+            assert run_in_child(lambda: flights.do("key", lambda: "child") == "child")
+        finally:
+            landed.set()
+            thread.join()
+        assert flights.stats == {"calls": 1}
+
+
+class TestClientCoalescing:
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_coalesce(self, m_time_delta, m_req):
+        def request(method, url, headers, data, timeout):
+            time.sleep(0.1)
+            return make_response(body={"url": url, "consumer": headers.get("X-Ovh-Consumer")})
+
+        m_req.side_effect = request
+        flights = SingleFlight()
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, coalesce=flights)
+        other = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, "other", coalesce=flights)
+
+        results = run_threads([lambda: api.get("/me")] * 16)
+        assert m_req.call_count == 1
+        assert results == [{"url": "https://eu.api.ovh.com/1.0/me", "consumer": MockConsumerKey}] * 16
+
+        # only identical method, target and credentials are merged
+        m_req.reset_mock()
+        run_threads(
+            [
+                lambda: api.get("/me"),
+                lambda: api.get("/me", param="value"),
+                lambda: other.get("/me"),
+                lambda: api.get("/me", _need_auth=False),
+                lambda: api.delete("/me"),
+                lambda: api.delete("/me"),
+            ]
+        )
+        assert m_req.call_count == 6
+        assert flights.stats["coalesced"] == 15
+
+    @mock.patch("ovh.client.Session.request")
+    def test_coalesce_disabled(self, m_req):
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret)
+        assert api._single_flight is None
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, coalesce=True)
+        assert isinstance(api._single_flight, SingleFlight)
+
+    @mock.patch("ovh.client.Session.request")
+    @mock.patch("ovh.client.Client.time_delta", new_callable=mock.PropertyMock, return_value=0)
+    def test_coalesce_errors(self, m_time_delta, m_req):
+        def request(method, url, headers, data, timeout):
+            time.sleep(0.1)
+            return make_response(404, {"message": "not found"})
+
+        m_req.side_effect = request
+        api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, coalesce=True)
+        results = run_threads([lambda: api.get("/dedicated/server/gone")] * 8)
+        assert m_req.call_count == 1
+        assert all(isinstance(result, ResourceNotFoundError) for result in results)
+        with pytest.raises(ResourceNotFoundError):
+            api.get("/dedicated/server/gone")
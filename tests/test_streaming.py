@@ -0,0 +1,75 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+import pytest
+
+from ovh.exceptions import InvalidResponse
+from ovh.streaming import iter_json_array
+
+
+def chunked(body, size):
+    return [body[i:][:size] for i in range(0, len(body), size)]
+
+
+class TestIterJsonArray:
+    def test_chunk_boundaries(self):
+        items = [{"id": i, "name": "zoné-%d" % i, "tags": [1.5, None, True]} for i in range(20)]
+        items += [12345, "text", [], {}]
+        body = json.dumps(items, indent=2, ensure_ascii=False).encode()
+
+        # whatever the boundaries, including in the middle of UTF-8 sequences
+        for size in (1, 2, 3, 7, 64, len(body)):
+            assert list(iter_json_array(chunked(body, size))) == items
+
+        # a number cut by a boundary is not mistaken for a shorter one
+        assert list(iter_json_array([b"[12", b"34,", b"5", b"6]"])) == [1234, 56]
+
+    def test_empty(self):
+        assert list(iter_json_array([b" [", b" ] \n"])) == []
+
+    def test_lazy(self):
+        def chunks():
+            yield b'[{"id": 1},'
+            raise AssertionError("read too far")
+
+        assert next(iter_json_array(chunks())) == {"id": 1}
+
+    @pytest.mark.parametrize(
+        "body",
+        [b"", b'{"id": 1}', b"[1, 2", b"[1,]", b"[1 2]", b"[1] [2]", b"[\xff]"],
+    )
+    def test_invalid(self, body):
+        with pytest.raises(InvalidResponse):
+            list(iter_json_array(chunked(body, 2)))
+
+    def test_max_size(self):
+        assert list(iter_json_array([b"[1, ", b"2]"], max_size=6)) == [1, 2]
+        items = iter_json_array([b"[1, ", b"2]"], max_size=5)
+        assert next(items) == 1
+        with pytest.raises(InvalidResponse, match="exceeds 5 bytes"):
+            next(items)
@@ -0,0 +1,152 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+
+import pytest
+
+from ovh.compression import Compression
+from ovh.exceptions import (
+    APIError,
+    BadParametersError,
+    InvalidCredential,
+    InvalidKey,
+    ResourceNotFoundError,
+)
+from ovh.retry import RetryBudget, RetryPolicy
+from ovh.testing import DEMO_FIXTURES, APIServer
+
+
+@pytest.fixture
+def server():
+    with APIServer() as server:
+        yield server
+
+
+class TestAPIServer:
+    def test_routes(self, server):
+        server.add_route("GET", "/me", {"nichandle": "xx1234-ovh"})
+        server.add_route("POST", "/domain/zone/{}/record", lambda params, body, request: dict(body, zone=params[0]))
+        server.add_route("GET", "/v1/status", "ok", headers={"X-Status": "green"})
+        api = server.client()
+
+        assert api.get("/me") == {"nichandle": "xx1234-ovh"}
+        assert api.post("/domain/zone/example.com/record", fieldType="A", target="10.0.0.1") == {
+            "fieldType": "A",
+            "target": "10.0.0.1",
+            "zone": "example.com",
+        }
+        result, response = api._call("GET", "/v1/status")
+        assert (result, response.headers["X-Status"]) == ("ok", "green")
+        with pytest.raises(ResourceNotFoundError):
+            api.get("/me/bill")
+        assert server.stats == {"requests": 5}
+
+    def test_compressed_body(self, server):
+        server.add_route("POST", "/domain/zone/{}/record", lambda params, body, request: body)
+        api = server.client(compression=Compression(request_min_size=1))
+
+        # the signature is checked against the uncompressed body
+        assert api.post("/domain/zone/example.com/record", fieldType="A", target="10.0.0.1") == {
+            "fieldType": "A",
+            "target": "10.0.0.1",
+        }
+        assert api._compression.stats["compressed_requests"] == 1
+        assert "rejected" not in server.stats
+
+    def test_authentication(self, server):
+        server.add_route("GET", "/me", {})
+
+        # the time delta is read from the clock of the server
+        server.time_offset = 3600
+        api = server.client()
+        assert api.time_delta == 3600
+        assert api.get("/me") == {}
+
+        # a drifting client is rejected once, then syncs its time delta again
+        api._time_delta = 0
+        assert api.get("/me") == {}
+        assert api._time_delta == 3600
+        assert server.stats["rejected"] == 1
+
+        with pytest.raises(BadParametersError) as e:
+            server.client(application_secret="wrong").get("/me")
+        assert e.value.response.json()["errorCode"] == "INVALID_SIGNATURE"
+        with pytest.raises(InvalidKey):
+            server.client(application_key="unknown", application_secret="secret").get("/me")
+        server.consumer_keys = {"known"}
+        with pytest.raises(InvalidCredential):
+            server.client().get("/me")
+        with pytest.raises(APIError) as e:
+            api.get("/me", _need_auth=False)
+        assert e.value.response.status_code == 401
+
+    def test_collections(self, server):
+        server.load_fixtures(DEMO_FIXTURES)
+        api = server.client()
+
+        servers = api.get("/dedicated/server")
+        assert len(servers) == 200
+        assert api.get("/dedicated/server/%s" % servers[0])["name"] == servers[0]
+
+        # batch mode
+        results = api.get_batch("/dedicated/server/{}", servers[:150] + ["unknown"], batch_size=100)
+        assert [results[name]["name"] for name in servers[:150]] == servers[:150]
+        assert server.stats["requests"] == 5
+
+        # a missing object fails the way a single call does
+        with pytest.raises(ResourceNotFoundError) as e:
+            api.get("/dedicated/server/unknown")
+        assert type(results["unknown"]) is ResourceNotFoundError
+        assert str(results["unknown"]) == str(e.value)
+        assert server.stats["requests"] == 6
+
+        # paginated /v2 routes
+        resources = list(api.iter_pages("/v2/iam/resource", page_size=300))
+        assert [resource["urn"] for resource in resources] == list(DEMO_FIXTURES["collections"]["/v2/iam/resource"])
+        assert server.stats["requests"] == 10
+
+    def test_injection(self):
+        with APIServer(latency=0.05, errors={503: 0.5}, seed=42) as server:
+            server.add_route("GET", "/me", {})
+            api = server.client()
+            api._time_delta = 0
+
+            start = time.monotonic()
+            outcomes = []
+            for _ in range(10):
+                try:
+                    outcomes.append(api.get("/me"))
+                except APIError as error:
+                    outcomes.append(error.response.status_code)
+            assert time.monotonic() - start >= 10 * 0.05
+            assert 0 < outcomes.count(503) < 10
+            assert server.stats["injected"] == outcomes.count(503)
+
+            # injected errors are retried
+            api = server.client(retry=RetryPolicy(max_attempts=10, backoff=0.01, budget=RetryBudget(ratio=10)))
+            api._time_delta = 0
+            assert [api.get("/me") for _ in range(5)] == [{}] * 5
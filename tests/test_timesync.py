@@ -0,0 +1,149 @@
+# Copyright (c) 2013-2025, OVH SAS.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#  * Neither the name of OVH SAS nor the
+#    names of its contributors may be used to endorse or promote products
+#    derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY OVH SAS AND CONTRIBUTORS ``AS IS'' AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL OVH SAS AND CONTRIBUTORS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import multiprocessing
+import os
+from unittest import mock
+
+from ovh.client import Client
+from ovh.timesync import TimeDeltaCache, default_directory
+
+from tests import make_response
+
+# Mock values
+MockApplicationKey = "TDPKJdwZwAQPwKX2"
+MockApplicationSecret = "9ufkBmLaTQ9nz5yMUlg79taH0GNnzDjk"
+MockConsumerKey = "5mBuy6SUQcRw2ZUxg0cG68BoDKpED4KY"
+URL = "https://eu.api.ovh.com/1.0"
+
+
+def _worker(directory, worker):
+    """Concurrently read and write cache files from many processes"""
+    cache = TimeDeltaCache(directory)
+    for i in range(50):
+        cache.set("endpoint-%d" % worker, i)
+        assert cache.get("endpoint-%d" % worker) == i
+
+        # readers never see a partially written file
+        cache.set("shared", worker)
+        assert cache.get("shared") in range(4)
+
+
+class TestTimeDeltaCache:
+    @mock.patch("time.time", return_value=1000)
+    def test_cache(self, m_time, tmp_path):
+        directory = str(tmp_path / "sub")
+        cache = TimeDeltaCache(directory, ttl=60)
+        assert cache.get(URL) is None
+
+        assert cache.set(URL, 42) is True
+        assert cache.set("other", -3) is True
+        assert TimeDeltaCache(directory).get(URL) == 42
+        assert cache.get("other") == -3
+        assert sorted(os.listdir(directory)) == sorted(
+            [os.path.basename(cache.path(URL)), os.path.basename(cache.path("other"))]
+        )
+
+        # entries expire
+        m_time.return_value = 1061
+        assert cache.get(URL) is None
+
+        # entries from the future are not trusted either
+        m_time.return_value = 999
+        assert cache.get(URL) is None
+
+        m_time.return_value = 1000
+        cache.clear(URL)
+        cache.clear(URL)
+        assert not os.path.exists(cache.path(URL))
+        assert cache.get("other") == -3
+
+    def test_errors(self, tmp_path):
+        cache = TimeDeltaCache(str(tmp_path))
+
+        # invalid files are ignored, and replaced
+        for content in ["{", "[]", "42", '{"time_delta": 1}']:
+            with open(cache.path(URL), "w") as cache_file:
+                cache_file.write(content)
+            assert cache.get(URL) is None
+        assert cache.set(URL, 42) is True
+        assert cache.get(URL) == 42
+
+        # so are unwritable locations
+        path = tmp_path / "file"
+        path.write_text("")
+        assert TimeDeltaCache(str(path / "time-delta")).set(URL, 42) is False
+
+    def test_default_directory(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/cache"}):
+            assert default_directory() == "/cache/ovh/time-delta"
+            assert TimeDeltaCache().directory == "/cache/ovh/time-delta"
+
+    def test_processes(self, tmp_path):
+        directory = str(tmp_path)
+        processes = [multiprocessing.Process(target=_worker, args=(directory, worker)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert [process.exitcode for process in processes] == [0] * 4
+
+        # no temporary file is left behind
+        assert len(os.listdir(directory)) == 5
+
+
+class TestClientTimeDeltaCache:
+    @mock.patch("ovh.client.Session.request")
+    def test_client(self, m_req, tmp_path):
+        cache = TimeDeltaCache(str(tmp_path))
+
+        # the first process queries the time delta, and saves it
+        m_req.side_effect = [make_response(200, 1457018875), make_response(200, {})]
+        with mock.patch("time.time", return_value=1457018865):
+            api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, time_delta_cache=cache)
+            api.get("/me")
+            assert cache.get(URL) == 10
+        assert m_req.call_args_list[0][0][1] == URL + "/auth/time"
+
+        # the next ones sign their first request right away
+        m_req.reset_mock()
+        m_req.side_effect = [make_response(200, {})]
+        with mock.patch("time.time", return_value=1457018965):
+            api = Client("ovh-eu", MockApplicationKey, MockApplicationSecret, MockConsumerKey, time_delta_cache=cache)
+            api.get("/me")
+        assert m_req.call_count == 1
+        assert m_req.call_args[1]["headers"]["X-Ovh-Timestamp"] == "1457018975"
+
+        # a resync updates the cache
+        m_req.reset_mock()
+        m_req.side_effect = [
+            make_response(400, {"errorCode": "QUERY_TIME_OUT", "message": "Query out of time"}),
+            make_response(200, 1457018995),
+            make_response(200, {}),
+        ]
+        with mock.patch("time.time", return_value=1457018965):
+            api.get("/me")
+            assert cache.get(URL) == 30